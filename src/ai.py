@@ -15,12 +15,13 @@ NOTE: All code in the file was authored by 1 or more of the authors. No outside
 
 # Import random and the context for the difficulties from settings
 import random
-from settings import EASY, MEDIUM, HARD
+from solver import FrontierSolver
+from settings import EASY, MEDIUM, HARD, MINE
 
 # Creates the ai_solver class, which each instance is a able to solve minesweeper games on 3 different "difficulty" settings.
 class ai_solver():
 
-    def __init__(self, difficulty, grid, counts, revealed, flagged):
+    def __init__(self, difficulty, grid, counts, revealed, flagged, rng=random):
         # When an ai_solver object is created, it stores all the info about the current game state.
 
         # The difficulty the user has selected (EASY, MEDIUM, HARD)
@@ -33,13 +34,30 @@ class ai_solver():
         self.revealed = revealed
         # 2D list of the board showing which squares currently have flags on them, and which ones do not.
         self.flagged = flagged
+        # Board dimensions, taken from the grid so the solver works on any board size.
+        self.rows = len(grid)
+        self.cols = len(grid[0]) if grid else 0
+        # Where the random reveals come from (the shared random module unless a seeded random.Random is passed in)
+        self.rng = rng
+        # Whether the last move was a guess (a reveal the AI could not prove safe)
+        self.guessed = False
+        # The medium AI's view of the visible board (a solver.FrontierSolver), built on its first move. It follows the
+        # board through the tiles passed to note_move() and the AI's own moves, so a move never rescans the board for
+        # steps 2 and 3.
+        self.frontier = None
+        # Tiles moved on since the medium AI's last move
+        self.changed = []
 
     def make_move(self):
         # Takes the current board state, and calls the respective ai_move function corresponding to the player selected difficulty.
+        self.guessed = False
         if self.difficulty == EASY:
             return self.easy_ai_move()
         elif self.difficulty == MEDIUM:
-            return self.medium_ai_move()
+            move = self.medium_ai_move()
+            # The AI's own move is caught up with at the start of its next one, like everyone else's
+            self.note_move(move[0], move[1])
+            return move
         elif self.difficulty == HARD:
             return self.hard_ai_move()
         
@@ -48,6 +66,30 @@ class ai_solver():
         else:
             return None, None, None
 
+    def note_move(self, i, j):
+        # Tell the AI the square at (i, j) was revealed, flagged or unflagged since its last move (by the player, or a
+        # reveal that is only applied later). Only the medium AI keeps a view of the board that needs this.
+        if self.frontier is not None and i is not None:
+            self.changed.append((i, j))
+
+    def follow_board(self):
+        # Bring the medium AI's FrontierSolver up to date: built from the whole board the first time, after that only
+        # the squares noted since the last move (a reveal brings in every square it flooded open).
+        if self.frontier is None:
+            # The mine counter is on screen, so this is the only thing read from the grid
+            mines = sum(row.count(MINE) for row in self.grid)
+            self.frontier = FrontierSolver(self.rows, self.cols, mines)
+            self.frontier.sync(self.revealed, self.flagged, self.counts)
+        for i, j in self.changed:
+            tile = i * self.cols + j
+            if self.revealed[i][j]:
+                self.frontier.sync_reveal(tile, self.revealed, self.counts)
+            elif self.flagged[i][j]:
+                self.frontier.flag(tile)
+            else:
+                self.frontier.unflag(tile)
+        self.changed.clear()
+
     def easy_ai_move(self):
         """
         Easy AI purely makes random moves.
@@ -86,21 +128,27 @@ class ai_solver():
             So for stuff like "flag all adjacent cells" it must systematically check all and pick first occurance (so next run gets others).
         """
 
+        # Catch up with the moves since the last one (no board scan after the first move)
+        self.follow_board()
+
         # Step 1: If no squares are revealed, that means the ai must make the first move. It makes the first move randomly.
 
-        is_new_board = self.is_first_move()
-        if is_new_board:
-            self.rand_reveal()
+        if self.frontier.hidden + self.frontier.flags == self.rows * self.cols:
+            return self.rand_reveal()
+
+        # Only revealed squares that still have hidden neighbors can give a move, and the FrontierSolver keeps that set
+        # (the "frontier") up to date. Sorted, they are checked in the same order as a scan of the whole board.
+        frontier = sorted(self.frontier.frontier)
 
         # Step 2: Check if adj_eq_flags returns anything, if so return that square and action.
 
-        to_reveal = self.adj_eq_flags()
+        to_reveal = self.adj_eq_flags(frontier)
         if (to_reveal != (None, None, None)):
             return to_reveal
 
         # Step 3: Check if hidden_hidden_neighbor_eq_num returns anything, if so return that square and action.
 
-        to_flag = self.hidden_neighbor_eq_num()
+        to_flag = self.hidden_neighbor_eq_num(frontier)
         if (to_flag != (None, None, None)):
             return to_flag
 
@@ -109,19 +157,17 @@ class ai_solver():
         random_reveal = self.rand_reveal()
         if (random_reveal != (None, None, None)):
             return random_reveal
-        
+
         # "Step 5": Should never occur, but if it does, return None, None, None to show no move is made.
         return None, None, None
 
     def hard_ai_move(self):
         # Hard AI cheats by iterating through all the squares on the board, revealing the first found square that is not revealed and does not have a mine.
-        for i in range(10):
-            for j in range(10):
+        for i in range(self.rows):
+            for j in range(self.cols):
                 # If the next cell that is not revealed does not have a mine on it, reveal it.
+                # If this cell happens to be flagged (even though it has no mine), the game removes the flag before revealing it.
                 if self.grid[i][j] == 0 and self.revealed[i][j] == False:
-                    # If this cell happens to be flagged (even though it has no mine), remove the flag before revealing it.
-                    if self.flagged[i][j] == True:
-                        self.flagged[i][j] = False
                     # Returns the coordinates the cell and reveal indicating it should be revealed.
                     return i, j, "reveal"
     
@@ -143,22 +189,21 @@ class ai_solver():
         When the one in the middle is checked, it knows 1 adjacent square must have a mine, but all the squares around it except for the bottom right have been revealed and do not have mines
         So, it determines that the hidden square on the bottom right must have a mine and flags it.
     """
-    def hidden_neighbor_eq_num(self):
-        # Iterates through all the squares on the board.
-        for i in range(10):
-            for j in range(10):
-                # Only checks squares that have already been revealed.
-                if self.revealed[i][j] == True:
-                    # Retrieves the amount of squares to the current square are hidden (and not flagged), how many are flagged, and how many adjacent squares have mines.
-                    hidden_adj_count = self.adj_hidden_squares(i, j)
-                    flagged_adj_count = self.adj_flagged_squares(i, j)
-                    count = self.counts[i][j]
-                    # If the number of mines in the adjacent squares is equal to the amount that are unrevealed and not flagged, that means all the others should be safe to flag.
-                    if (hidden_adj_count > 0) and (hidden_adj_count + flagged_adj_count) == count:
-                        # Finds one of the squares that is adjacent and hidden, but not flagged and returns its coordinates with the action "flag", indicating the square should be flagged.
-                        action_i, action_j = self.find_next_adj_hidden(i, j)
-                        if action_i is not None:
-                            return action_i, action_j, "flag"
+    def hidden_neighbor_eq_num(self, tiles=None):
+        # Iterates through the given squares (see board_squares), or all the squares on the board.
+        for i, j in self.board_squares(tiles):
+            # Only checks squares that have already been revealed.
+            if self.revealed[i][j] == True:
+                # Retrieves the amount of squares to the current square are hidden (and not flagged), how many are flagged, and how many adjacent squares have mines.
+                hidden_adj_count = self.adj_hidden_squares(i, j)
+                flagged_adj_count = self.adj_flagged_squares(i, j)
+                count = self.counts[i][j]
+                # If the number of mines in the adjacent squares is equal to the amount that are unrevealed and not flagged, that means all the others should be safe to flag.
+                if (hidden_adj_count > 0) and (hidden_adj_count + flagged_adj_count) == count:
+                    # Finds one of the squares that is adjacent and hidden, but not flagged and returns its coordinates with the action "flag", indicating the square should be flagged.
+                    action_i, action_j = self.find_next_adj_hidden(i, j)
+                    if action_i is not None:
+                        return action_i, action_j, "flag"
         # If the entire board has no squares that are guaranteed safe to be flagged, it returns None, None, None, telling the solver to advance to the next step.
         return None, None, None
 
@@ -174,22 +219,21 @@ class ai_solver():
         This means both those squares are safe to be flagged.
         So it will then find and return the coordinates for one of these squares with the action "flag" indicating the square can be safely flagged.
     """
-    def adj_eq_flags(self):
-        # Iterates through all the squares on the board.
-        for i in range(10):
-            for j in range(10):
-                # Only checks squares that have already been revealed.
-                if self.revealed[i][j] == True:
-                    # Retrieves the amount of squares to the current square are hidden (and not flagged), how many are flagged, and how many adjacent squares have mines.
-                    hidden_adj_count = self.adj_hidden_squares(i, j)
-                    flagged_adj_count = self.adj_flagged_squares(i, j)
-                    count = self.counts[i][j]
-                    # If there is at least 1 unrevealed and unflagged square, and the # of adjacent squares with mines equals the # of adjacent squares that are flagged, all the hidden squares can be safely revealed.
-                    if hidden_adj_count > 0 and flagged_adj_count == count:
-                        # Finds an adjacent square that is hidden and not flagged, and returns its coordinates with the action reveal, indicating the square can be revealed.
-                        action_i, action_j = self.find_next_adj_hidden(i, j)
-                        if action_i is not None:
-                            return action_i, action_j, "reveal"
+    def adj_eq_flags(self, tiles=None):
+        # Iterates through the given squares (see board_squares), or all the squares on the board.
+        for i, j in self.board_squares(tiles):
+            # Only checks squares that have already been revealed.
+            if self.revealed[i][j] == True:
+                # Retrieves the amount of squares to the current square are hidden (and not flagged), how many are flagged, and how many adjacent squares have mines.
+                hidden_adj_count = self.adj_hidden_squares(i, j)
+                flagged_adj_count = self.adj_flagged_squares(i, j)
+                count = self.counts[i][j]
+                # If there is at least 1 unrevealed and unflagged square, and the # of adjacent squares with mines equals the # of adjacent squares that are flagged, all the hidden squares can be safely revealed.
+                if hidden_adj_count > 0 and flagged_adj_count == count:
+                    # Finds an adjacent square that is hidden and not flagged, and returns its coordinates with the action reveal, indicating the square can be revealed.
+                    action_i, action_j = self.find_next_adj_hidden(i, j)
+                    if action_i is not None:
+                        return action_i, action_j, "reveal"
         # If the entire board has no squares that are guaranteed safe to be revealed, it returns None, None, None, telling the solver to advance to the next step.
         return None, None, None
 
@@ -197,23 +241,40 @@ class ai_solver():
     def rand_reveal(self):
         # Add all unrevealed and unflagged squares on the board into a "candidate list".
         candidate_squares = []
-        for i in range(10):
-            for j in range(10):
+        for i in range(self.rows):
+            for j in range(self.cols):
                 if self.revealed[i][j] == False and self.flagged[i][j] == False:
                     candidate_squares.append((i, j))
         
+        # Every square is revealed or flagged, so there is nothing left to reveal.
+        if not candidate_squares:
+            return None, None, None
+
         # Randomly selects a square from the candidate list and reveals it.
             # Subtract 1 from length since randint includes the upper endpoint.
         options = len(candidate_squares) - 1
-        rand_option = random.randint(0, options)
+        rand_option = self.rng.randint(0, options)
         # Extracts the i and j positions from the randomly selected option.
         rand_i, rand_j = candidate_squares[rand_option]
+        # A random square is always a guess.
+        self.guessed = True
         # Returns the coordinates of the chosen square and the action to reveal it.
         return rand_i, rand_j, "reveal"   
 
     """
     Some helper functions for the helper functions
     """
+    # Helper function that yields the (i, j) coordinates of the squares with the given tile numbers (i * cols + j, in order), or of every square on the
+    # board row by row if no tiles are given.
+    def board_squares(self, tiles=None):
+        if tiles is None:
+            for i in range(self.rows):
+                for j in range(self.cols):
+                    yield i, j
+        else:
+            for tile in tiles:
+                yield divmod(tile, self.cols)
+
     # Helper function that takes in the coordinates of a particular square, and returns the number of adjacent squares to itself that are both hidden and not flagged. 
     def adj_hidden_squares(self, i, j):
         # Initializes the adjacent flag count wtih 0.
@@ -227,7 +288,7 @@ class ai_solver():
                     temp_j = j + adj_j
                     # Check if temp_row and temp_col are valid grid coordinates.
                     # If it is a valid square that is both hidden and not flagged, increase the current count by 1.
-                    if ((0 <= temp_i < 10) and (0 <= temp_j < 10)):
+                    if ((0 <= temp_i < self.rows) and (0 <= temp_j < self.cols)):
                         if self.revealed[temp_i][temp_j] == False and self.flagged[temp_i][temp_j] == False:
                             count += 1
         # After checking all the adjacent squares, returns the final count of adjacent squares that are both hidden and not flagged.
@@ -246,7 +307,7 @@ class ai_solver():
                     temp_j = j + adj_j
                     # Check if temp_row and temp_col are valid grid coordinates.
                     # If it is a valid square and is flagged, increase the current count by 1.
-                    if ((0 <= temp_i < 10) and (0 <= temp_j < 10)):
+                    if ((0 <= temp_i < self.rows) and (0 <= temp_j < self.cols)):
                         if self.flagged[temp_i][temp_j] == True:
                             count += 1
         # After checking all the adjacent squares, returns the final count of adjacent squares that are flagged.
@@ -264,7 +325,7 @@ class ai_solver():
                     temp_j = j + adj_j
                     # Check if temp_row and temp_col are valid grid coordinates.
                     # If it is a valid square and is not flagged and not revealed, return the coordinates of the square.
-                    if 0 <= temp_i < 10 and 0 <= temp_j < 10:
+                    if 0 <= temp_i < self.rows and 0 <= temp_j < self.cols:
                         if (self.revealed[temp_i][temp_j] == False) and (self.flagged[temp_i][temp_j] == False):
                             return temp_i, temp_j
         # If the current square has no adjacent squares that are not revealed and not flagged, return None, None.
@@ -284,7 +345,7 @@ class ai_solver():
                     temp_j = j + adj_j
                     # Check if temp_row and temp_col are valid grid coordinates.
                     # If it is a valid square and is flagged, return the coordinates of the square.
-                    if ((0 <= temp_i < 10) and (0 <= temp_j < 10)):
+                    if ((0 <= temp_i < self.rows) and (0 <= temp_j < self.cols)):
                         if self.flagged[temp_i][temp_j] == True:
                             return temp_i, temp_j
         # If none of the current squares adjacent square are flagged, return None, None.
@@ -293,8 +354,8 @@ class ai_solver():
     # Checks if the board if completely unrevealed so the AI would be making the first move of the game.
     # Returns a boolean corresponding to whether its making the first move or not.
     def is_first_move(self):
-        for i in range(10):
-            for j in range(10):
+        for i in range(self.rows):
+            for j in range(self.cols):
                 if self.revealed[i][j] == True:
                     return False
         return True
\ No newline at end of file
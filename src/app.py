@@ -0,0 +1,76 @@
+"""
+File Name: app.py
+Module: src
+Function: Explicit application bootstrap. Starts pygame, creates the window, clock, fonts and the sound system the first
+    time each is asked for, so that importing game modules (settings, the board engine, the AI) has no side effects.
+Inputs: Settings constants for the window, fonts and mixer format.
+Outputs: The shared screen, clock, fonts and SFX objects.
+Authors:
+    Minesweeper project contributors (see the git history of this file)
+Creation Date: 10/19/2026
+"""
+
+import pygame
+from settings import (
+    WIDTH, HEIGHT, WINDOW_TITLE, SOUND_DIR,
+    MIXER_FREQUENCY, MIXER_SIZE, MIXER_CHANNELS, MIXER_BUFFER,
+    FONT_SIZE, SMALL_FONT_SIZE, TINY_FONT_SIZE,
+)
+
+# Lazily created singletons (None until first use)
+_screen = None
+_clock = None
+_fonts = None
+_sfx = None
+
+
+def init_display():
+    """Start pygame and create the game window. Safe to call more than once; returns the screen surface."""
+    global _screen, _clock
+    if _screen is None:
+        # The mixer format has to be set before pygame.init() starts the mixer
+        try:
+            pygame.mixer.pre_init(frequency=MIXER_FREQUENCY, size=MIXER_SIZE, channels=MIXER_CHANNELS, buffer=MIXER_BUFFER)
+        except Exception:
+            pass
+        pygame.init()  # start pygame
+        _screen = pygame.display.set_mode((WIDTH, HEIGHT))  # create the screen
+        pygame.display.set_caption(WINDOW_TITLE)  # title the program
+        _clock = pygame.time.Clock()  # for smooth animation
+    return _screen
+
+
+def get_screen():
+    """Return the game window, creating it on first use."""
+    return init_display()
+
+
+def get_clock():
+    """Return the frame clock, starting pygame on first use."""
+    init_display()
+    return _clock
+
+
+def get_fonts():
+    """Return (font, small_font, tiny_font), creating them on first use."""
+    global _fonts
+    if _fonts is None:
+        init_display()
+        _fonts = (pygame.font.Font(None, FONT_SIZE),  # Bigger font for titles
+                  pygame.font.Font(None, SMALL_FONT_SIZE),  # Smaller font for buttons/text
+                  pygame.font.Font(None, TINY_FONT_SIZE))  # Tiny font for sfx info
+    return _fonts
+
+
+def get_sfx(load_sounds=True):
+    """Return the sound system, creating it on first use (after the window is already up).
+
+    With load_sounds=False only the mixer is started and the sounds are expected to come from the asset loader.
+    """
+    global _sfx
+    if _sfx is None:
+        # Imported here so that tools which never play sound never import the mixer code
+        from sfx import SFX
+        init_display()
+        _sfx = SFX(SOUND_DIR, load_sounds=load_sounds)
+    return _sfx
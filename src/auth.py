@@ -11,11 +11,10 @@ Creation Date: 9/26/2025
 NOTE: All code in the file was authored by 1 or more of the authors. No outside sources were used for code
 """
 
-import os  # used to build file paths
-import json  # used to read and write small local data files
 import uuid  # used to make a simple random token
 from typing import Optional, Dict, Any  # type hints for clarity
-from settings import ASSETS_DIR  # base assets directory from settings
+from settings import USER_FILE_PATH, USER_STORE_BACKEND, USER_DB_PATH  # account file locations and store choice
+from user_store import JsonUserStore, SqliteUserStore  # in-memory records with write-behind saves
 
 
 class AuthContext:
@@ -29,170 +28,105 @@ class AuthContext:
         "bob": {"token": "...", "pfp_path": "...", "high_score": 100, "theme": "dark"}
       }
     }
+
+    Records are read from memory; changes are written to disk in the background by the store, so none of these
+    methods wait on file I/O. With USER_STORE_BACKEND = "sqlite" the same data lives in an SQLite database instead
+    (users.db), which also keeps every score in a history table.
     """
 
-    def __init__(self):
+    def __init__(self, backend: str = USER_STORE_BACKEND):
         # path to json file holding all users and the active user
-        self.user_file_path = os.path.join(ASSETS_DIR, "user.json")
-        # in-memory model matching the schema above
-        self._store: Dict[str, Any] = {"current_user": "", "users": {}}
-        # load existing user info if present
-        self._load_user()
-
-    def _load_user(self) -> None:
-        # Read user.json if it exists; otherwise initialize an empty store
-        if os.path.exists(self.user_file_path):
-            try:
-                with open(self.user_file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                # Get the current user
-                cu = data.get("current_user", "")
-                # Get the users dictionary
-                users = data.get("users", {})
-                # If the users dictionary is not a dictionary, set it to an empty dictionary
-                if not isinstance(users, dict):
-                    users = {}
-                # Set the store to the current user and users dictionary
-                self._store = {"current_user": cu if isinstance(cu, str) else "", "users": users}
-            except Exception:
-                # If the user.json file is not valid, set the store to an empty dictionary
-                self._store = {"current_user": "", "users": {}}
+        self.user_file_path = USER_FILE_PATH
+        # loads existing user info if present
+        if backend == "sqlite":
+            # user.json is copied into the database the first time
+            self._store = SqliteUserStore(USER_DB_PATH, json_path=self.user_file_path)
         else:
-            self._store = {"current_user": "", "users": {}}
+            self._store = JsonUserStore(self.user_file_path)
+
+    def _current_record(self) -> Dict[str, Any]:
+        # Record of the active user, or an empty dict when no one is signed in
+        cu = self._store.get_current_user()
+        if cu:
+            return self._store.get_user(cu) or {}
+        return {}
 
-    def _save_user(self) -> None:
-        # write current store to user.json (creates/overwrites)
-        try:
-            with open(self.user_file_path, "w", encoding="utf-8") as f:
-                json.dump(self._store, f)
-        except Exception:
-            pass
+    def flush(self) -> None:
+        # Write any pending changes to disk now (they are also written automatically at exit)
+        self._store.flush()
 
     def is_logged_in(self) -> bool:
         # user is logged in if current_user exists and has a non-empty token
-        cu = self._store.get("current_user") or ""
-        users = self._store.get("users", {})
-        if cu and isinstance(users, dict):
-            rec = users.get(cu) or {}
-            return bool(rec.get("token"))
-        return False
+        return bool(self._current_record().get("token"))
 
     def get_username(self) -> Optional[str]:
-        cu = self._store.get("current_user") or ""
+        cu = self._store.get_current_user()
         return cu or None
 
     def get_token(self) -> Optional[str]:
-        cu = self._store.get("current_user") or ""
-        users = self._store.get("users", {})
-        if cu and isinstance(users, dict):
-            rec = users.get(cu) or {}
-            tok = rec.get("token")
-            return tok if tok else None
-        return None
+        tok = self._current_record().get("token")
+        return tok if tok else None
 
     def get_pfp_path(self) -> Optional[str]:
-        cu = self._store.get("current_user") or ""
-        users = self._store.get("users", {})
-        if cu and isinstance(users, dict):
-            rec = users.get(cu) or {}
-            p = rec.get("pfp_path") or ""
-            return p if p else None
-        return None
+        p = self._current_record().get("pfp_path") or ""
+        return p if p else None
 
     def set_pfp_path(self, path: str) -> None:
-        cu = self._store.get("current_user") or ""
+        cu = self._store.get_current_user()
         if not cu:
             return
-        users = self._store.setdefault("users", {})
-        rec = users.setdefault(cu, {"token": "", "pfp_path": "", "high_score": 0})
-        rec["pfp_path"] = path
-        self._save_user()
+        self._store.update_user(cu, pfp_path=path)
 
     def get_high_score(self):
-        # Get the current user's high score from the store
-        cu = self._store.get("current_user") or ""
-        # Get the users dictionary
-        users = self._store.get("users", {})
-        # If the current user exists and the users dictionary is a dictionary, get the record for the current user
-        if cu and isinstance(users, dict):
-            # Get the record for the current user
-            rec = users.get(cu) or {}
-            # Get the high score from the record
-            score = rec.get("high_score", 0)
-            # If the high score is an integer, return it, otherwise return 0
-            return score if isinstance(score, int) else 0
-        return 0
+        # Get the high score from the current user's record (0 for guests)
+        score = self._current_record().get("high_score", 0)
+        # If the high score is an integer, return it, otherwise return 0
+        return score if isinstance(score, int) else 0
 
     def set_high_score(self, score: int) -> bool:
         # Update high score if new score is better, returns True if it's a new high score
-        cu = self._store.get("current_user") or ""
+        cu = self._store.get_current_user()
         # If the current user does not exist, return False
         if not cu:
             return False
-        users = self._store.setdefault("users", {})
-        # Get the record for the current user
-        rec = users.setdefault(cu, {"token": "", "pfp_path": "", "high_score": 0})
+        # Keep every score in the history (SQLite store only)
+        self._store.add_score(cu, score)
         # Get the current high score from the record
-        current_high = rec.get("high_score", 0)
+        current_high = self.get_high_score()
         # If the new score is greater than the current high score, update the high score and return True
         if score > current_high:
-            # Update the high score in the record
-            rec["high_score"] = score
-            # Save the user to the store
-            self._save_user()
+            # Update the high score in the record (saved in the background)
+            self._store.update_user(cu, high_score=score)
             return True
         return False
 
     def issue_token(self, username: str) -> str:
         # create or refresh the user record, set as current, and store a token
         token = uuid.uuid4().hex
-        users = self._store.setdefault("users", {})
-        # Create a record for the new user
-        rec = users.setdefault(username, {"token": "", "pfp_path": "", "high_score": 0})
-        # Set the token for the new user
-        rec["token"] = token
+        # Create a record for the new user if needed and set its token
+        self._store.update_user(username, token=token)
         # Set the current user to the new user
-        self._store["current_user"] = username
-        # Save the user to the store
-        self._save_user()
+        self._store.set_current_user(username)
         return token
 
     def logout(self) -> None:
         # Clear token for the active user and unset current_user
-        cu = self._store.get("current_user") or ""
-        users = self._store.get("users", {})
-        if cu and isinstance(users, dict):
-            rec = users.get(cu) or {}
-            rec["token"] = ""
-        self._store["current_user"] = ""
-        self._save_user()
+        cu = self._store.get_current_user()
+        if cu and self._store.get_user(cu) is not None:
+            self._store.update_user(cu, token="")
+        self._store.set_current_user("")
 
     def get_theme_preference(self) -> str:
-        # Get the current user
-        cu = self._store.get("current_user") or ""
-        # Get the users dictionary
-        users = self._store.get("users", {})
-        # If the current user exists and the users dictionary is a dictionary, get the record for the current user
-        if cu and isinstance(users, dict):
-            # Get the record for the current user
-            rec = users.get(cu) or {}
-            # Get the theme preference from the record
-            theme = rec.get("theme", "dark")
-            # If the theme preference is in the list of allowed themes, return it, otherwise return dark
-            return theme if theme in ["dark", "light"] else "dark"
-        # If the current user does not exist or the users dictionary is not a dictionary, return dark
-        return "dark"  # Guest users get dark mode
+        # Get the theme preference from the current user's record
+        theme = self._current_record().get("theme", "dark")
+        # If the theme preference is in the list of allowed themes, return it, otherwise return dark
+        # (guest users get dark mode)
+        return theme if theme in ["dark", "light"] else "dark"
 
     def set_theme_preference(self, theme: str) -> None:
         # Set the current user's theme preference
-        cu = self._store.get("current_user") or ""
+        cu = self._store.get_current_user()
         if not cu:
             return  # Guest users can't save preferences
-        # Get the users dictionary
-        users = self._store.setdefault("users", {})
-        # Get the record for the current user
-        rec = users.setdefault(cu, {"token": "", "pfp_path": "", "high_score": 0, "theme": "dark"})
-        # Set the theme preference in the record
-        rec["theme"] = theme if theme in ["dark", "light"] else "dark"
-        # Save the user to the store
-        self._save_user()
+        # Set the theme preference in the record (saved in the background)
+        self._store.update_user(cu, theme=theme if theme in ["dark", "light"] else "dark")
@@ -0,0 +1,179 @@
+"""
+File Name: board.py
+Module: src
+Function: The Minesweeper board engine: mine placement, adjacent-mine counts, flood reveal, batch reveals
+    and chords, and win/loss checks.
+    Boards are plain 2D lists (grid, counts, revealed, flagged) of any size. This file does not import pygame, so the
+    engine can be used by tools and tests without a display.
+Inputs: None.
+Outputs: None.
+Authors:
+    The authors of minesweeper.py, where this engine code used to live; later changes: see the git history of
+    this file
+Creation Date: 10/19/2026
+"""
+
+import random  # import random to randomly pick mine locations
+from collections import deque  # Queue for flood-fill
+from settings import MINE, DIRS8
+
+
+# Build an empty rows x cols board: (grid, revealed, flagged, counts)
+def new_board(rows, cols):
+    grid = [[0] * cols for _ in range(rows)]  # Set value to 0
+    revealed = [[False] * cols for _ in range(rows)]  # Set it to not revealed
+    flagged = [[False] * cols for _ in range(rows)]  # Set it to not flagged
+    counts = [[0] * cols for _ in range(rows)]
+    return grid, revealed, flagged, counts
+
+
+# Place mine_count mines on distinct random tiles (pass a seeded random.Random as rng to get a repeatable board)
+def place_mines(grid, mine_count, rng=random):
+    rows, cols = len(grid), len(grid[0])
+    # sample without replacement so no tile gets picked twice
+    for index in rng.sample(range(rows * cols), mine_count):
+        grid[index // cols][index % cols] = MINE
+
+
+# True while cell is inside a rows x cols grid
+def in_bounds(r, c, rows, cols):
+    return 0 <= r < rows and 0 <= c < cols
+
+
+# Use a matrix of adjacent-mine counts for each cell to show numbers and decide how far to auto-reveal
+def compute_counts(grid):
+    rows, cols = len(grid), len(grid[0])
+    counts = [[0] * cols for _ in range(rows)]  # check for nerby 0s
+    # walk the mines and bump each neighbor, which is far cheaper than checking 8 neighbors of every tile on big boards
+    for r in range(rows):
+        grid_row = grid[r]
+        for c in range(cols):
+            if grid_row[c] != MINE:
+                continue
+            for dr, dc in DIRS8:
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < rows and 0 <= nc < cols:
+                    counts[nr][nc] += 1
+    # mines themselves are marked -1
+    for r in range(rows):
+        grid_row, counts_row = grid[r], counts[r]
+        for c in range(cols):
+            if grid_row[c] == MINE:
+                counts_row[c] = -1
+    return counts
+
+
+# Ensures the player clicks on a blank space, and if not, regenerates the board until that space is blank.
+# Returns the (possibly new) adjacent-mine counts for the board.
+def ensure_first_click_safe(fr, fc, grid, counts, mine_count, rng=random):
+    # while the grid the player clicks on does not contain a mine and is not bordering any mines
+    while not ((grid[fr][fc] != MINE) and (counts[fr][fc] == 0)):
+        # reset the grid
+        for grid_row in grid:
+            grid_row[:] = [0] * len(grid_row)
+
+        # code from the main loop for board generation, just done again
+        place_mines(grid, mine_count, rng)
+
+        # Compute numbers for drawing/reveal logic
+        counts = compute_counts(grid)
+
+    return counts
+
+
+# Reveal the starting cell if its count is 0, breadth-first reveal adjacent zeros and border numbers.
+# Returns how many tiles were newly revealed.
+def flood_reveal(sr, sc, grid, counts, revealed, flagged):
+    # exit if the tile is already revealed or flagged
+    if revealed[sr][sc] or flagged[sr][sc]:
+        return 0
+    # note that the tile should be counted as discoved
+    revealed[sr][sc] = True
+    # if the the tile isn't a 0, do not reveal more tiles
+    if counts[sr][sc] != 0:
+        return 1
+    opened = 1
+    rows, cols = len(grid), len(grid[0])
+    # create a queque of surrounding tiles
+    q = deque([(sr, sc)])
+    while q:
+        # iterate until the queue is empty
+        r, c = q.popleft()
+        # Check all possible neighboring row/col locations for possible tiles
+        for dr, dc in DIRS8:
+            nr, nc = r + dr, c + dc
+            if not in_bounds(nr, nc, rows, cols):  # Check location is on grid, unflagged, not a mine
+                continue
+            if flagged[nr][nc] or grid[nr][nc] == MINE:
+                continue
+            if not revealed[nr][nc]:
+                revealed[nr][nc] = True
+                opened += 1
+                if counts[nr][nc] == 0:  # add found zero tiles to queue
+                    q.append((nr, nc))
+    return opened
+
+
+# The cells a chord on (r, c) reveals: every hidden, unflagged neighbor of a revealed number once as many flags as
+# the number are around it. Returns an empty list if the chord doesn't apply.
+def chord_cells(r, c, counts, revealed, flagged):
+    if not revealed[r][c] or counts[r][c] <= 0:
+        return []
+    rows, cols = len(counts), len(counts[0])
+    hidden = []
+    flags = 0
+    for dr, dc in DIRS8:
+        nr, nc = r + dr, c + dc
+        if not in_bounds(nr, nc, rows, cols):
+            continue
+        if flagged[nr][nc]:
+            flags += 1
+        elif not revealed[nr][nc]:
+            hidden.append((nr, nc))
+    return hidden if flags == counts[r][c] else []
+
+
+# Reveal a batch of cells in one call (a click, a chord, or several AI moves). Flagged and already revealed cells are
+# skipped and zeros flood as usual. Win and loss are checked once, after the whole batch: if any mine was hit every
+# mine is revealed. hidden_safe is how many safe tiles were still hidden before the batch (rows * cols - mines right
+# after the first click); callers keep it up to date by subtracting opened, so the win check never scans the board.
+# Returns (opened, exploded, won): the number of tiles newly revealed, the mine cells hit, and whether the board is
+# now won.
+def reveal_cells(cells, grid, counts, revealed, flagged, hidden_safe):
+    opened = 0
+    exploded = []
+    for r, c in cells:
+        if revealed[r][c] or flagged[r][c]:
+            continue
+        if grid[r][c] == MINE:
+            revealed[r][c] = True
+            exploded.append((r, c))
+        else:
+            opened += flood_reveal(r, c, grid, counts, revealed, flagged)
+    if exploded:
+        reveal_all_mines(grid, revealed)
+        return opened, exploded, False
+    return opened, exploded, opened > 0 and opened >= hidden_safe
+
+
+# Reveal every mine cell upon loss
+def reveal_all_mines(grid, revealed):
+    # iterate through all rows and columns
+    for r in range(len(grid)):
+        for c in range(len(grid[r])):
+            # check if its a mine
+            if grid[r][c] == MINE:
+                # reveal the mine if the user failed
+                revealed[r][c] = True
+
+
+# Number of non-mine tiles still hidden (the game is won when it reaches 0). Scans the board, so it is only used
+# when a board is loaded; during play reveal_cells keeps the count.
+def count_hidden_safe(grid, revealed):
+    hidden = 0
+    for grid_row, revealed_row in zip(grid, revealed):
+        for value, shown in zip(grid_row, revealed_row):
+            # count the non-mines that aren't revealed yet
+            if value != MINE and not shown:
+                hidden += 1
+    return hidden
@@ -0,0 +1,288 @@
+"""
+File Name: board_pool.py
+Module: src
+Function: Define the BoardPool class, which keeps a few boards ready for the configuration the player is about to
+    start (board size, mine count and generation mode), built on a background thread while the menu is open, so
+    neither Start nor the first click has to wait for mine placement or no-guess generation.
+    A board depends on the first click, so each pooled board is built for an anchor tile and remembers every tile a
+    first click could land on and get the same game (zeros for random boards, zeros the board can be solved from
+    for no-guess boards). The board can also be mirrored or rotated, so one pooled board serves up to 8 click regions.
+    A board is rebuilt exactly from (seed, anchor, symmetry), which the game log records.
+Inputs: The configuration to keep ready and the first click.
+Outputs: None.
+Authors:
+    Minesweeper project contributors (see the git history of this file)
+Creation Date: 10/19/2026
+"""
+
+import time  # how long the wanted configuration has stayed the same
+import random  # seeds and anchors
+import threading  # build boards in the background
+from collections import OrderedDict, deque  # configurations in least recently wanted order, boards per configuration
+from board import new_board, place_mines, compute_counts, ensure_first_click_safe
+from solver import ensure_first_click_no_guess, is_solvable
+from settings import GEN_NO_GUESS, BOARD_POOL_DEPTH, BOARD_POOL_TILES, BOARD_POOL_CONFIGS, BOARD_POOL_SETTLE, DIRS8
+
+# Symmetries are numbered 0-7: bit 0 flips the rows, bit 1 flips the columns, bit 2 transposes (square boards only).
+# The transpose is applied first.
+SYMMETRIES = range(8)
+# Zero groups of a no-guess board checked as extra first clicks, besides the one it was built for
+NO_GUESS_START_CHECKS = 8
+
+
+def symmetries(rows, cols):
+    """The symmetries that keep a rows x cols board the same shape."""
+    return SYMMETRIES if rows == cols else range(4)
+
+
+def transform_cell(row, col, rows, cols, symmetry):
+    """Where (row, col) of the original board ends up after symmetry."""
+    if symmetry & 4:
+        row, col = col, row
+    if symmetry & 1:
+        row = rows - 1 - row
+    if symmetry & 2:
+        col = cols - 1 - col
+    return row, col
+
+
+def original_cell(row, col, rows, cols, symmetry):
+    """Inverse of transform_cell: the tile of the original board that symmetry moves to (row, col)."""
+    if symmetry & 1:
+        row = rows - 1 - row
+    if symmetry & 2:
+        col = cols - 1 - col
+    if symmetry & 4:
+        row, col = col, row
+    return row, col
+
+
+def transform_rows(rows_2d, symmetry):
+    """A new 2D list with symmetry applied (mine grids and counts move the same way)."""
+    if symmetry & 4:
+        rows_2d = [list(column) for column in zip(*rows_2d)]
+    if symmetry & 1:
+        rows_2d = rows_2d[::-1]
+    if symmetry & 2:
+        return [row[::-1] for row in rows_2d]
+    return [row[:] for row in rows_2d]
+
+
+def build_board(rows, cols, mines, generation, seed, anchor_row, anchor_col):
+    """The board a game with this seed gets when its first click is on the anchor: the same generator calls the game
+    makes (mines placed from the seed, then the first click regeneration). Returns (grid, counts)."""
+    rng = random.Random(seed)
+    grid, _, _, counts = new_board(rows, cols)
+    place_mines(grid, mines, rng)
+    counts = compute_counts(grid)
+    first_click = ensure_first_click_no_guess if generation == GEN_NO_GUESS else ensure_first_click_safe
+    counts = first_click(anchor_row, anchor_col, grid, counts, mines, rng)
+    return grid, counts
+
+
+class BoardBuild:
+    """build_board for one first click on its own thread, for when the pool has no board that fits the click
+    (a no-guess board or a big random board can take a second or more). grid and counts are set once done()."""
+
+    def __init__(self, rows, cols, mines, generation, seed, row, col):
+        self.grid = self.counts = None
+        self._thread = threading.Thread(target=self._run, args=(rows, cols, mines, generation, seed, row, col),
+                                        name="board-build", daemon=True)
+        self._thread.start()
+
+    def _run(self, *args):
+        self.grid, self.counts = build_board(*args)
+
+    def wait(self, timeout=0.0):
+        """Wait up to timeout seconds for the board; returns True once it is built."""
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+
+class PreparedBoard:
+    """A board built ahead of the first click. starts has one byte per tile (row-major): 1 where a first click
+    gets exactly this game."""
+
+    def __init__(self, seed, anchor_row, anchor_col, grid, counts, starts):
+        self.seed = seed
+        self.anchor_row = anchor_row
+        self.anchor_col = anchor_col
+        self.symmetry = 0
+        self.grid = grid
+        self.counts = counts
+        self.starts = starts
+
+    def symmetry_for(self, row, col):
+        """A symmetry that makes (row, col) a good first click, or None."""
+        rows, cols = len(self.grid), len(self.grid[0])
+        for symmetry in symmetries(rows, cols):
+            r, c = original_cell(row, col, rows, cols, symmetry)
+            if self.starts[r * cols + c]:
+                return symmetry
+        return None
+
+    def apply_symmetry(self, symmetry):
+        """Mirror/rotate the board in place of the original (done once, on the main thread)."""
+        if symmetry:
+            self.grid = transform_rows(self.grid, symmetry)
+            self.counts = transform_rows(self.counts, symmetry)
+        self.symmetry = symmetry
+
+
+def zero_regions(counts):
+    """The connected groups of zero tiles (a click on any tile of a group opens the same area), as lists of flat
+    tile indexes, largest first."""
+    rows, cols = len(counts), len(counts[0])
+    seen = bytearray(rows * cols)
+    regions = []
+    for r in range(rows):
+        for c in range(cols):
+            if counts[r][c] != 0 or seen[r * cols + c]:
+                continue
+            seen[r * cols + c] = 1
+            region = [r * cols + c]
+            stack = [(r, c)]
+            while stack:
+                tr, tc = stack.pop()
+                for dr, dc in DIRS8:
+                    nr, nc = tr + dr, tc + dc
+                    if 0 <= nr < rows and 0 <= nc < cols and counts[nr][nc] == 0 and not seen[nr * cols + nc]:
+                        seen[nr * cols + nc] = 1
+                        region.append(nr * cols + nc)
+                        stack.append((nr, nc))
+            regions.append(region)
+    regions.sort(key=len, reverse=True)
+    return regions
+
+
+def no_guess_starts(grid, counts, anchor_row, anchor_col):
+    """First clicks a no-guess board works for: the anchor's zero group (solvable by construction) and any other
+    zero group the solver can finish from (only the NO_GUESS_START_CHECKS largest are tried, as each is a solve)."""
+    rows, cols = len(grid), len(grid[0])
+    starts = bytearray(rows * cols)
+    anchor = anchor_row * cols + anchor_col
+    checks = 0
+    for region in zero_regions(counts):
+        if anchor in region:
+            solvable = True
+        elif checks < NO_GUESS_START_CHECKS:
+            checks += 1
+            solvable = is_solvable(grid, region[0] // cols, region[0] % cols)
+        else:
+            continue
+        if solvable:
+            for tile in region:
+                starts[tile] = 1
+    return starts
+
+
+def prepare_board(rows, cols, mines, generation, rng=random):
+    """Build a PreparedBoard for a new seed and anchor."""
+    seed = rng.getrandbits(32)
+    # Players mostly open near the middle, so anchor there; the symmetries spread the start region around the board
+    anchor_row = rows // 2 + rng.randint(-(rows // 4), rows // 4)
+    anchor_col = cols // 2 + rng.randint(-(cols // 4), cols // 4)
+    grid, counts = build_board(rows, cols, mines, generation, seed, anchor_row, anchor_col)
+    if generation == GEN_NO_GUESS:
+        starts = no_guess_starts(grid, counts, anchor_row, anchor_col)
+    else:
+        # ensure_first_click_safe keeps the board as it is for a click on any zero
+        starts = bytearray(1 if value == 0 else 0 for counts_row in counts for value in counts_row)
+    return PreparedBoard(seed, anchor_row, anchor_col, grid, counts, starts)
+
+
+class BoardPool:
+    """Boards built ahead of time on one worker thread.
+
+    Call want() with the configuration the next game will use (or None to let the worker rest) and take() on the
+    first click. A configuration is only built for once it has been wanted for BOARD_POOL_SETTLE seconds, so
+    stepping the mine count or the board size through values on the way to the one the player wants doesn't start a
+    build for each of them. Each configuration keeps up to BOARD_POOL_DEPTH boards (fewer for big boards, at most
+    BOARD_POOL_TILES tiles), and only the BOARD_POOL_CONFIGS most recently wanted configurations are kept.
+    """
+
+    def __init__(self, settle=BOARD_POOL_SETTLE):
+        self.settle = settle
+        self._boards = OrderedDict()  # (rows, cols, mines, generation) -> deque of PreparedBoard
+        self._requested = None  # the configuration want() was last called with, and since when
+        self._requested_at = 0.0
+        self._wanted = None  # the configuration the worker builds for
+        self._closed = False
+        self._rng = random.Random()
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._thread = threading.Thread(target=self._run, name="board-pool", daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def depth(key):
+        """How many boards are kept for a configuration."""
+        rows, cols = key[0], key[1]
+        return max(1, min(BOARD_POOL_DEPTH, BOARD_POOL_TILES // (rows * cols)))
+
+    def want(self, rows=None, cols=None, mines=None, generation=None):
+        """Keep boards ready for this configuration (no arguments: stop building). Meant to be called every frame: the
+        worker starts on a configuration once it has been asked for, unchanged, for self.settle seconds."""
+        key = (rows, cols, mines, generation) if rows is not None else None
+        if key != self._requested:
+            self._requested = key
+            self._requested_at = time.monotonic()
+        if key is not None and key != self._wanted and time.monotonic() - self._requested_at < self.settle:
+            # Still changing: rest until it settles
+            key = None
+        if key == self._wanted:
+            return
+        with self._lock:
+            self._wanted = key
+            if key is not None:
+                boards = self._boards.setdefault(key, deque())
+                self._boards.move_to_end(key)
+                while len(self._boards) > BOARD_POOL_CONFIGS:
+                    self._boards.popitem(last=False)
+                if len(boards) < self.depth(key):
+                    self._wake.notify()
+
+    def ready(self, rows, cols, mines, generation):
+        """Number of boards ready for a configuration."""
+        with self._lock:
+            return len(self._boards.get((rows, cols, mines, generation), ()))
+
+    def take(self, rows, cols, mines, generation, row, col):
+        """A ready board for a first click on (row, col), already mirrored/rotated to fit it, or None. The board leaves
+        the pool and the worker builds a replacement."""
+        key = (rows, cols, mines, generation)
+        with self._lock:
+            boards = self._boards.get(key)
+            if not boards:
+                return None
+            for board in boards:
+                symmetry = board.symmetry_for(row, col)
+                if symmetry is not None:
+                    boards.remove(board)
+                    self._wake.notify()
+                    break
+            else:
+                return None
+        board.apply_symmetry(symmetry)
+        return board
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._closed and (self._wanted is None or
+                                            len(self._boards[self._wanted]) >= self.depth(self._wanted)):
+                    self._wake.wait()
+                if self._closed:
+                    return
+                key = self._wanted
+            board = prepare_board(*key, self._rng)
+            with self._lock:
+                # The configuration may have been dropped while the board was being built
+                if key in self._boards and len(self._boards[key]) < self.depth(key):
+                    self._boards[key].append(board)
+
+    def close(self):
+        """Stop the worker thread once it finishes the board it is building (without waiting for it)."""
+        with self._lock:
+            self._closed = True
+            self._wake.notify()
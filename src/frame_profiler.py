@@ -0,0 +1,142 @@
+"""
+File Name: frame_profiler.py
+Module: src
+Function: Define the FrameProfiler class, which times each phase of the main loop (AI, events, draw_grid,
+    draw_sfx_info, the rest of the drawing, display.flip, ...) every frame into fixed-size ring buffers. It can draw
+    an overlay with the p50/p95/p99 of each phase and export the buffers to CSV. Recording is a clock read and an
+    add per phase, so it is always on; the percentiles are only computed while the overlay is shown.
+Inputs: Phase marks from the main loop.
+Outputs: The overlay and CSV files.
+Authors:
+    Minesweeper project contributors (see the git history of this file)
+Creation Date: 10/19/2026
+"""
+
+import csv  # export the buffers
+import os  # create the export folder
+from array import array  # compact ring buffers
+from time import perf_counter  # high resolution clock
+
+# Phases of the main loop, in the order the overlay lists them. "tick" is the time clock.tick() waits for the frame
+# rate cap and "ai_delay" the pause before each AI move; both are waits on purpose, so "frame" (recorded for every
+# frame) is all the other phases together.
+PHASES = ("ai", "ai_delay", "events", "draw_grid", "draw_sfx_info", "draw", "overlay", "flip", "other", "tick")
+WAIT_PHASES = ("tick", "ai_delay")
+OVERLAY_REFRESH = 0.25  # seconds between overlay updates
+NOTICE_DURATION = 4.0  # seconds a notice (e.g. where a CSV was saved) stays in the overlay
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted sequence (0 if it is empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+class FrameProfiler:
+    """Per-phase frame timings for the last `size` frames.
+
+    Call begin_frame() at the top of the loop and mark(phase) at the end of each phase; the time since the previous
+    mark is added to that phase (so a phase can be marked several times in one frame).
+    """
+
+    def __init__(self, size):
+        self.size = size
+        # Milliseconds per frame for each phase, plus the whole frame
+        self.rings = {name: array("d", bytes(8 * size)) for name in PHASES + ("frame",)}
+        self.frames = 0  # frames recorded so far (the newest is at (frames - 1) % size)
+        self.overlay = False
+        self._acc = dict.fromkeys(PHASES, 0.0)
+        self._frame_start = None
+        self._last = 0.0
+        self._overlay_lines = []
+        self._overlay_footer = None
+        self._overlay_at = 0.0
+        self._notice = None
+        self._notice_until = 0.0
+
+    def begin_frame(self):
+        now = perf_counter()
+        if self._frame_start is not None:
+            self._store(now)
+        self._frame_start = self._last = now
+
+    def mark(self, phase):
+        now = perf_counter()
+        self._acc[phase] += now - self._last
+        self._last = now
+
+    def _store(self, now):
+        # Time not covered by a mark counts as "other"
+        acc = self._acc
+        acc["other"] += now - self._last
+        i = self.frames % self.size
+        for name in PHASES:
+            self.rings[name][i] = acc[name] * 1000
+            acc[name] = 0.0
+        self.rings["frame"][i] = ((now - self._frame_start) * 1000) - sum(self.rings[name][i] for name in WAIT_PHASES)
+        self.frames += 1
+
+    def samples(self, name):
+        """The recorded milliseconds for a phase (or "frame"), oldest first."""
+        ring = self.rings[name]
+        if self.frames <= self.size:
+            return list(ring[:self.frames])
+        start = self.frames % self.size
+        return list(ring[start:]) + list(ring[:start])
+
+    def stats(self, name):
+        """(p50, p95, p99) in milliseconds for a phase (or "frame")."""
+        values = sorted(self.samples(name))
+        return percentile(values, 50), percentile(values, 95), percentile(values, 99)
+
+    def export_csv(self, path):
+        """Write the buffers to a CSV file, one row per frame, oldest first. Returns the path."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        columns = ("frame",) + PHASES
+        data = [self.samples(name) for name in columns]
+        first = max(0, self.frames - self.size)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(("frame_number",) + tuple(f"{name}_ms" for name in columns))
+            for offset, row in enumerate(zip(*data)):
+                writer.writerow((first + offset,) + tuple(f"{value:.3f}" for value in row))
+        return path
+
+    def notify(self, text):
+        """Show text in the overlay's footer for NOTICE_DURATION seconds (and show the overlay if it is hidden)."""
+        self.overlay = True
+        self._notice = text
+        self._notice_until = perf_counter() + NOTICE_DURATION
+        self._overlay_at = 0.0  # redraw the text on the next frame
+
+    def draw_overlay(self, surface, font, color, background):
+        """Draw the percentile table in the bottom-left corner. The text is rebuilt a few times a second."""
+        now = perf_counter()
+        if now - self._overlay_at >= OVERLAY_REFRESH:
+            self._overlay_at = now
+            rows = [("ms", "p50", "p95", "p99")]
+            for name in ("frame",) + PHASES:
+                rows.append((name,) + tuple(f"{value:.2f}" for value in self.stats(name)))
+            self._overlay_lines = [[font.render(cell, True, color) for cell in row] for row in rows]
+            if self._notice is not None and now >= self._notice_until:
+                self._notice = None
+            footer = self._notice or f"last {min(self.frames, self.size)} frames  F3 hide  F4 CSV"
+            self._overlay_footer = font.render(footer, True, color)
+        if not self._overlay_lines:
+            return
+        # Name column, then three right-aligned number columns
+        name_width = max(row[0].get_width() for row in self._overlay_lines) + 10
+        column_width = max(cell.get_width() for row in self._overlay_lines for cell in row[1:]) + 10
+        line_height = self._overlay_lines[0][0].get_height() + 2
+        width = max(name_width + 3 * column_width, self._overlay_footer.get_width()) + 12
+        height = line_height * (len(self._overlay_lines) + 1) + 8
+        left, top = 4, surface.get_height() - height - 70
+        surface.fill(background, (left, top, width, height))
+        for i, row in enumerate(self._overlay_lines):
+            y = top + 4 + i * line_height
+            surface.blit(row[0], (left + 6, y))
+            for j, cell in enumerate(row[1:], start=1):
+                surface.blit(cell, (left + 6 + name_width + j * column_width - cell.get_width(), y))
+        surface.blit(self._overlay_footer, (left + 6, top + 4 + len(self._overlay_lines) * line_height))
@@ -3,7 +3,7 @@ File Name: game_assets.py
 Module: src
 Function: Define functions to load a standard image and a profile image. Provides a reference to the sprites for flags, mines, and numbers.
 Inputs: The flag, mine, and numbers sprite images.
-Outputs: A reference to the flag, mine, and numbers sprites.
+Outputs: A reference to the flag, mine, and numbers sprites (loaded the first time get_sprites is called).
 Authors:
     Blake Carlson
     Nifemi Lawal
@@ -14,27 +14,76 @@ NOTE: All code in the file was authored by 1 or more of the authors. No outside
 """
 
 import os
-import random
 import pygame
-from settings import ASSETS_DIR, NUM_DIR, SOUND_DIR 
-from PIL import Image, ImageDraw
+from settings import ASSETS_DIR, NUM_DIR
+from profile_cache import read_cached, write_cached  # finished profile pictures on disk
 
 
 def load_image(path):
     image = pygame.image.load(path).convert_alpha()
     return image
 
-# Convert visual assets to pygame surface
 
-# Sprites
-flag_sprite = load_image(os.path.join(ASSETS_DIR, "images", "flag.png")) # load in the flag visual
-mines_sprite = load_image(os.path.join(ASSETS_DIR, "images", "mines.png")) # load in the mines visual
-# load in the mines visual # load each number visual for possibly 1-8 neighboring mines and build a list
-numbers_sprites = {n: load_image(os.path.join(NUM_DIR, f"{n}.png")) for n in range(1, 9)}
+# Sprite files: "flag", "mines", and 1-8 for the number visuals
+SPRITE_FILES = {"flag": os.path.join(ASSETS_DIR, "images", "flag.png"),
+                "mines": os.path.join(ASSETS_DIR, "images", "mines.png")}
+SPRITE_FILES.update({n: os.path.join(NUM_DIR, f"{n}.png") for n in range(1, 9)})
+
+# Sprites, loaded on first use (or installed by the asset loader) since convert_alpha needs the window to exist
+_sprites = None
+
+
+def decode_sprites():
+    """Read and decode every sprite file. Does not need the window, so it can run on a worker thread."""
+    return {key: pygame.image.load(path) for key, path in SPRITE_FILES.items()}
+
+
+def install_sprites(decoded):
+    """Convert sprites from decode_sprites for fast drawing and make them what get_sprites returns (main thread)."""
+    global _sprites
+    converted = {key: image.convert_alpha() for key, image in decoded.items()}
+    flag_sprite = converted["flag"] # the flag visual
+    mines_sprite = converted["mines"] # the mines visual
+    # each number visual for possibly 1-8 neighboring mines
+    numbers_sprites = {n: converted[n] for n in range(1, 9)}
+    _sprites = (flag_sprite, mines_sprite, numbers_sprites)
+
+
+def get_sprites():
+    """Return (flag_sprite, mines_sprite, numbers_sprites), loading them the first time this is called."""
+    if _sprites is None:
+        install_sprites(decode_sprites())
+    return _sprites
 
 
 def load_circular_profile(image_path, diameter):
     """Load an image w/ Pillow, resize, apply a circular alpha mask, and return a pygame Surface."""
+    return profile_to_surface(prepare_circular_profile(image_path, diameter))
+
+
+def profile_to_surface(prepared):
+    """Turn the output of prepare_circular_profile into a pygame Surface (main thread). Returns None on failure."""
+    if prepared is None:
+        return None
+    try:
+        data, size, mode = prepared
+        # Wrap the pixels without copying them; convert_alpha then makes the Surface the game draws
+        return pygame.image.frombuffer(data, size, mode).convert_alpha()
+    except Exception:
+        return None
+
+
+def prepare_circular_profile(image_path, diameter):
+    """Do the Pillow half of load_circular_profile and return (data, size, mode), or None if the image is unusable.
+
+    Finished pictures are cached on disk, so after the first time this is just one file read. Does not touch
+    pygame, so it can run on a worker thread.
+    """
+    cached = read_cached(image_path, diameter)
+    if cached is not None:
+        return cached
+    # Pillow is only needed when a picture isn't cached yet, so import it here
+    from PIL import Image, ImageDraw
     try:
         # Open the image file and make sure it has an alpha channel
         img = Image.open(image_path).convert("RGBA")
@@ -61,10 +110,10 @@ def load_circular_profile(image_path, diameter):
         size = img.size
         # Get the raw bytes of the image
         data = img.tobytes()
-        # Turn the image data into a pygame Surface with alpha
-        surface = pygame.image.fromstring(data, size, mode).convert_alpha()
-        # Return the finished surface
-        return surface
+        # Keep the finished pixels for next time
+        write_cached(image_path, diameter, (data, size, mode))
+        # Return the finished pixels
+        return data, size, mode
     except Exception:
         # If anything goes wrong, return None
         return None
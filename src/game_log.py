@@ -0,0 +1,310 @@
+"""
+File Name: game_log.py
+Module: src
+Function: Record every game to a compact append-only binary log: the seed and settings a game was started with,
+    then each player and AI move (reveal, flag, unflag) with its time, then the result. Numbers are stored as
+    varints, so a move usually takes 5-7 bytes and no board snapshots are ever written; the board is rebuilt from
+    the seed. Records are encoded on the caller's thread and appended to the file by a background writer.
+Inputs: The path of the log file.
+Outputs: The log file. read_games() turns a log back into LoggedGame objects.
+Authors:
+    Minesweeper project contributors (see the git history of this file)
+Creation Date: 10/19/2026
+"""
+
+import os  # create the log folder
+import time  # move timestamps and the game start time
+import queue  # hand encoded records to the writer thread
+import atexit  # write pending records when the program exits
+import threading  # append on a background thread
+from settings import EASY, MEDIUM, HARD, AI_INTERACTIVE, AI_AUTOMATIC, AI_MANUAL, GEN_RANDOM, GEN_NO_GUESS
+
+# File layout: MAGIC, VERSION byte, then records. Each record is a type byte, the payload length as a varint, and
+# the payload (a run of varints, plus the UTF-8 username in GAME records). The length prefix lets a reader skip
+# record types it doesn't know and stop cleanly at a half written record at the end of the file (the writer cuts such
+# a record off before it appends anything, so later games don't end up behind it).
+MAGIC = b"MSLOG"
+VERSION = 1
+HEADER = MAGIC + bytes([VERSION])
+
+REC_GAME = 1  # seed, rows, cols, mines, mode, difficulty, start time (unix seconds), username, generation
+REC_MOVE = 2  # milliseconds since the previous move (or the game start), actor/action code, row, col
+REC_END = 3   # result, elapsed milliseconds on the game timer
+REC_BOARD = 4  # the game's board came from the board pool: seed, anchor row, anchor col, symmetry (see board_pool.py)
+
+ACTOR_PLAYER = 0
+ACTOR_AI = 1
+
+ACTION_REVEAL = 0
+ACTION_FLAG = 1
+ACTION_UNFLAG = 2
+# Names used by the AI (ai_solver.make_move) for the same actions
+ACTION_NAMES = {ACTION_REVEAL: "reveal", ACTION_FLAG: "flag", ACTION_UNFLAG: "unflag"}
+
+RESULT_LOSS = 0
+RESULT_WIN = 1
+RESULT_ABANDONED = 2
+
+# Settings are stored as their index in these tuples
+MODES = (AI_INTERACTIVE, AI_AUTOMATIC, AI_MANUAL)
+DIFFICULTIES = (EASY, MEDIUM, HARD)
+# Added after the username, so older readers skip it and older logs (without it) read as GEN_RANDOM
+GENERATIONS = (GEN_RANDOM, GEN_NO_GUESS)
+
+
+def encode_varint(n, out):
+    """Append non-negative int n to bytearray out, 7 bits per byte, low bits first."""
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def decode_varint(buf, pos):
+    """Read a varint from buf at pos; return (value, position after it). Raises IndexError if buf ends first."""
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _record(kind, payload):
+    out = bytearray([kind])
+    encode_varint(len(payload), out)
+    out += payload
+    return bytes(out)
+
+
+def _read_varint(f):
+    """Read a varint from file f; returns None if the file ends first."""
+    result = 0
+    shift = 0
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return None
+        result |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return result
+        shift += 7
+
+
+def _records(f):
+    """Yield (type, payload) for each record from f's position on, stopping at the end of the file or at a half
+    written record."""
+    while True:
+        kind = f.read(1)
+        length = _read_varint(f) if kind else None
+        if length is None:
+            return
+        payload = f.read(length)
+        if len(payload) < length:
+            return
+        yield kind[0], payload
+
+
+def _complete_length(f, size):
+    """The length of the log in f up to the end of its last complete record (f is positioned after the header). Skips
+    over payloads instead of reading them."""
+    end = f.tell()
+    while True:
+        kind = f.read(1)
+        length = _read_varint(f) if kind else None
+        if length is None or f.tell() + length > size:
+            return end
+        end = f.seek(length, os.SEEK_CUR)
+
+
+class GameLog:
+    """Appends games to the log file. Call start_game, then move for each move, then end_game."""
+
+    def __init__(self, path):
+        self.path = path
+        self.in_game = False
+        self._last_move = 0.0  # monotonic time of the previous move (or the game start)
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._writer, name="game-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def start_game(self, seed, rows, cols, mines, mode, difficulty, username="", generation=GEN_RANDOM):
+        """Begin a game. seed must be what the board's mines were generated from, with the generation used."""
+        payload = bytearray()
+        for value in (seed, rows, cols, mines, MODES.index(mode), DIFFICULTIES.index(difficulty), int(time.time())):
+            encode_varint(value, payload)
+        name = (username or "").encode("utf-8")
+        encode_varint(len(name), payload)
+        payload += name
+        encode_varint(GENERATIONS.index(generation), payload)
+        self._last_move = time.monotonic()
+        self.in_game = True
+        self._queue.put(_record(REC_GAME, payload))
+
+    def move(self, actor, action, row, col):
+        """Log one move by ACTOR_PLAYER or ACTOR_AI."""
+        if not self.in_game:
+            return
+        now = time.monotonic()
+        delta_ms = int((now - self._last_move) * 1000)
+        self._last_move = now
+        payload = bytearray()
+        for value in (delta_ms, actor * 4 + action, row, col):
+            encode_varint(value, payload)
+        self._queue.put(_record(REC_MOVE, payload))
+
+    def pooled_board(self, seed, anchor_row, anchor_col, symmetry):
+        """Record that the first click was served a pooled board. Replays build it with board_pool.build_board
+        instead of regenerating from the game's seed."""
+        if not self.in_game:
+            return
+        payload = bytearray()
+        for value in (seed, anchor_row, anchor_col, symmetry):
+            encode_varint(value, payload)
+        self._queue.put(_record(REC_BOARD, payload))
+
+    def end_game(self, result, elapsed_ms):
+        """Finish the current game with RESULT_WIN, RESULT_LOSS or RESULT_ABANDONED."""
+        if not self.in_game:
+            return
+        self.in_game = False
+        payload = bytearray()
+        encode_varint(result, payload)
+        encode_varint(max(0, elapsed_ms), payload)
+        self._queue.put(_record(REC_END, payload))
+
+    # --- persistence (background) ---
+
+    def _writer(self):
+        f = None
+        while True:
+            item = self._queue.get()
+            # Append everything queued behind this record in one write
+            batch = [item]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            records = b"".join(r for r in batch if r is not None)
+            if records:
+                try:
+                    if f is None:
+                        f = self._open()
+                    f.write(records)
+                    f.flush()
+                except OSError:
+                    # Don't crash the game over a failed log write
+                    pass
+            for _ in batch:
+                self._queue.task_done()
+            if None in batch:
+                if f is not None:
+                    f.close()
+                return
+
+    def _open(self):
+        # Open the log for appending, starting a new file or cutting off a record torn by a crash first
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        try:
+            with open(self.path, "r+b") as f:
+                size = os.fstat(f.fileno()).st_size
+                if f.read(len(HEADER)) == HEADER:
+                    end = _complete_length(f, size)
+                    if end < size:
+                        f.truncate(end)
+                elif size:
+                    # Not a log this version can append to: keep it for inspection and start a new one
+                    f.close()
+                    os.replace(self.path, f"{self.path}.corrupt")
+        except FileNotFoundError:
+            pass
+        f = open(self.path, "ab")
+        if f.tell() == 0:
+            f.write(HEADER)
+        return f
+
+    def flush(self):
+        """Block until every logged record has been written."""
+        if not self._closed:
+            self._queue.join()
+
+    def close(self):
+        """Write pending records and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+
+class LoggedGame:
+    """One game read back from a log. moves holds (ms since game start, actor, action, row, col) tuples."""
+
+    def __init__(self, seed, rows, cols, mines, mode, difficulty, started_at, username, generation=GEN_RANDOM):
+        self.seed = seed
+        self.rows = rows
+        self.cols = cols
+        self.mines = mines
+        self.mode = mode
+        self.difficulty = difficulty
+        self.started_at = started_at
+        self.username = username
+        self.generation = generation
+        self.pooled = None  # (seed, anchor row, anchor col, symmetry) if the board came from the board pool
+        self.moves = []
+        self.result = None  # None if the log ends before the game does
+        self.elapsed_ms = None
+
+
+def read_games(path):
+    """Yield every game in the log file at path, in the order they were played. The file is read one record at a
+    time, so a long log never has to fit in memory."""
+    with open(path, "rb") as f:
+        if f.read(len(HEADER)) != HEADER:
+            raise ValueError(f"{path} is not a version {VERSION} game log")
+        game = None
+        clock = 0
+        for kind, data in _records(f):
+            values = []
+            p = 0
+            if kind == REC_GAME:
+                for _ in range(8):
+                    value, p = decode_varint(data, p)
+                    values.append(value)
+                if game is not None:
+                    yield game
+                seed, rows, cols, mines, mode, difficulty, started_at, name_len = values
+                game = LoggedGame(seed, rows, cols, mines, MODES[mode], DIFFICULTIES[difficulty], started_at,
+                                  data[p:p + name_len].decode("utf-8"))
+                p += name_len
+                if p < len(data):
+                    generation, p = decode_varint(data, p)
+                    game.generation = GENERATIONS[generation]
+                clock = 0
+            elif kind == REC_MOVE and game is not None:
+                for _ in range(4):
+                    value, p = decode_varint(data, p)
+                    values.append(value)
+                delta_ms, code, row, col = values
+                clock += delta_ms
+                game.moves.append((clock, code // 4, code % 4, row, col))
+            elif kind == REC_BOARD and game is not None:
+                for _ in range(4):
+                    value, p = decode_varint(data, p)
+                    values.append(value)
+                game.pooled = tuple(values)
+            elif kind == REC_END and game is not None:
+                game.result, p = decode_varint(data, p)
+                game.elapsed_ms, p = decode_varint(data, p)
+                yield game
+                game = None
+        if game is not None:
+            yield game
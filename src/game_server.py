@@ -0,0 +1,300 @@
+"""
+File Name: game_server.py
+Module: src
+Function: A local game server for bots and lab tournaments. One asyncio process hosts many independent games, one
+    per connection, over loopback TCP or a Unix socket, using the same board engine and ai_solver as the game (a
+    seed gives the same board as in the game). Clients speak a line-delimited text protocol. Boards are stored as
+    bytearray / signed byte array rows instead of lists of Python ints so each session stays small. Commands that
+    can take a while (new games, and every command on big boards) run on a worker thread, so one slow board never
+    stalls the other connections.
+Inputs: Commands from clients (see below).
+Outputs: One response line per command.
+Authors:
+    Minesweeper project contributors (see the git history of this file)
+Creation Date: 10/19/2026
+
+Usage (from the src folder):
+    python game_server.py                       listen on 127.0.0.1:8765
+    python game_server.py --port 9000
+    python game_server.py --unix /tmp/minesweeper.sock
+Try it with: nc 127.0.0.1 8765
+
+Commands (one per line, rows and columns are 0-based):
+  new [rows cols mines [seed]]  start a new game (default 10 10 10, random seed); at most 1 mine per 5 tiles
+                                -> ok new <rows> <cols> <mines> <seed>
+  reveal <row> <col>            -> ok <status> <tiles opened>
+  chord <row> <col>             reveal the neighbors of a number whose flags are all placed
+                                -> ok <status> <tiles opened>
+  flag <row> <col>              toggle a flag -> ok flag <0|1> <flags placed>
+  ai [easy|medium|hard]         let the AI make one move -> ok ai <reveal|flag> <row> <col> <status>
+  state                         -> ok state <status> <rows> <cols> <tiles>
+                                   tiles: one character per tile, row by row:
+                                   . hidden  F flagged  0-8 revealed number  * revealed mine
+  help                          list the commands
+  quit                          close the connection
+Status is playing, win or lose. Errors are answered with: err <message>
+"""
+
+import sys  # exit codes
+import random  # seeded boards
+import asyncio  # the server
+import argparse  # command line options
+from array import array  # signed byte rows for the counts
+from ai import ai_solver
+from board import place_mines, compute_counts, ensure_first_click_safe, reveal_cells, chord_cells
+from settings import MINE, PLAYING, WIN, LOSE, EASY, MEDIUM, HARD, GRID_SIZE, MIN_MINES
+
+DEFAULT_PORT = 8765
+MAX_TILES = 250_000  # largest board a session may ask for
+INLINE_TILES = 4096  # commands on boards up to this size are cheap enough to run on the event loop itself
+MAX_LINE = 1024  # longest command line accepted
+TILE_CHARS = "012345678"
+
+
+def max_mines(rows, cols):
+    """Most mines a rows x cols game may have: 20% of the tiles, the game's own limit. Denser boards make the first
+    click regenerate the board many times before it lands on a zero (or never, with fewer than 9 free tiles)."""
+    return rows * cols // 5
+
+
+class GameSession:
+    """One game played over one connection. handle(line) runs a command and returns the response line."""
+
+    def __init__(self):
+        self.rows = self.cols = self.mines = self.seed = 0
+        self.grid = self.counts = self.revealed = self.flagged = None
+        self.rng = None
+        self.ai = None  # the ai_solver of the last ai command, kept so it follows the board instead of rescanning it
+        self.first_click_done = False
+        self.hidden_safe = 0  # safe tiles not revealed yet; the game is won when it reaches 0
+        self.flags_placed = 0
+        self.status = None  # None until the first game, then PLAYING / WIN / LOSE
+
+    def new_game(self, rows, cols, mines, seed):
+        if rows < 1 or cols < 1 or not 10 <= rows * cols <= MAX_TILES:
+            raise ValueError(f"board must have 10 to {MAX_TILES} tiles")
+        if not 1 <= mines <= max_mines(rows, cols):
+            raise ValueError(f"mines must be between 1 and {max_mines(rows, cols)}")
+        self.rows, self.cols, self.mines, self.seed = rows, cols, mines, seed
+        # Same generator calls as the game: the mines are placed now and moved by the first reveal
+        self.rng = random.Random(seed)
+        self.grid = [bytearray(cols) for _ in range(rows)]
+        place_mines(self.grid, mines, self.rng)
+        self.counts = self._compact_counts(compute_counts(self.grid))
+        self.revealed = [bytearray(cols) for _ in range(rows)]
+        self.flagged = [bytearray(cols) for _ in range(rows)]
+        self.ai = None
+        self.first_click_done = False
+        self.hidden_safe = rows * cols - mines
+        self.flags_placed = 0
+        self.status = PLAYING
+
+    @staticmethod
+    def _compact_counts(counts):
+        # The engine builds counts as lists; keep one signed byte per tile instead (mines are -1)
+        return [array("b", row) for row in counts]
+
+    def _cell(self, args):
+        if self.status is None:
+            raise ValueError("start a game with new first")
+        if len(args) != 2:
+            raise ValueError("expected <row> <col>")
+        row, col = int(args[0]), int(args[1])
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise ValueError("tile is not on the board")
+        return row, col
+
+    def reveal(self, cells):
+        # Reveal a batch of tiles (one tile, or a chord) and update the status once
+        if self.status != PLAYING:
+            raise ValueError(f"the game is over ({self.status})")
+        cells = [(r, c) for r, c in cells if not self.revealed[r][c] and not self.flagged[r][c]]
+        if cells and not self.first_click_done:
+            counts = ensure_first_click_safe(cells[0][0], cells[0][1], self.grid, self.counts, self.mines, self.rng)
+            if counts is not self.counts:
+                self.counts = self._compact_counts(counts)
+            self.first_click_done = True
+            # The mines never move again, so the generator (a few KiB of state) can go
+            self.rng = None
+            # The AI was following the board before the mines moved
+            self.ai = None
+        if self.ai is not None:
+            for row, col in cells:
+                self.ai.note_move(row, col)
+        opened, exploded, won = reveal_cells(cells, self.grid, self.counts, self.revealed, self.flagged,
+                                             self.hidden_safe)
+        self.hidden_safe -= opened
+        if exploded:
+            self.status = LOSE
+        elif won:
+            self.status = WIN
+        return opened
+
+    def toggle_flag(self, row, col):
+        if self.status != PLAYING:
+            raise ValueError(f"the game is over ({self.status})")
+        if self.revealed[row][col]:
+            raise ValueError("tile is already revealed")
+        if self.flagged[row][col]:
+            self.flagged[row][col] = 0
+            self.flags_placed -= 1
+        elif self.flags_placed < self.mines:
+            self.flagged[row][col] = 1
+            self.flags_placed += 1
+        else:
+            raise ValueError("no flags left")
+        if self.ai is not None:
+            self.ai.note_move(row, col)
+        return self.flagged[row][col]
+
+    def ai_move(self, difficulty):
+        if self.status != PLAYING:
+            raise ValueError(f"the game is over ({self.status})")
+        if self.ai is None or self.ai.difficulty != difficulty:
+            self.ai = ai_solver(difficulty, self.grid, self.counts, self.revealed, self.flagged)
+        row, col, action = self.ai.make_move()
+        if row is None or col is None:
+            raise ValueError("the AI has no move")
+        if action == "reveal":
+            if self.flagged[row][col]:
+                # Like the game, lift the flag before an AI reveal
+                self.toggle_flag(row, col)
+            self.reveal([(row, col)])
+        else:
+            self.toggle_flag(row, col)
+        return row, col, action
+
+    def tiles(self):
+        # One character per tile, row by row
+        out = []
+        for r in range(self.rows):
+            grid_row, counts_row, revealed_row, flagged_row = self.grid[r], self.counts[r], self.revealed[r], self.flagged[r]
+            for c in range(self.cols):
+                if revealed_row[c]:
+                    out.append("*" if grid_row[c] == MINE else TILE_CHARS[counts_row[c]])
+                else:
+                    out.append("F" if flagged_row[c] else ".")
+        return "".join(out)
+
+    def runs_inline(self, line):
+        """True if the command is cheap enough to run on the event loop: anything but new on a small board."""
+        return self.rows * self.cols <= INLINE_TILES and not line.lower().startswith("new")
+
+    def handle(self, line):
+        """Run one command line and return the response (without the newline)."""
+        parts = line.split()
+        if not parts:
+            return "err empty command"
+        command, args = parts[0].lower(), parts[1:]
+        try:
+            if command == "new":
+                if args and len(args) not in (3, 4):
+                    raise ValueError("expected new [rows cols mines [seed]]")
+                rows, cols, mines = (int(a) for a in args[:3]) if args else (GRID_SIZE, GRID_SIZE, MIN_MINES)
+                seed = int(args[3]) if len(args) == 4 else random.getrandbits(32)
+                self.new_game(rows, cols, mines, seed)
+                return f"ok new {rows} {cols} {mines} {seed}"
+            if command == "reveal":
+                opened = self.reveal([self._cell(args)])
+                return f"ok {self.status} {opened}"
+            if command == "chord":
+                row, col = self._cell(args)
+                opened = self.reveal(chord_cells(row, col, self.counts, self.revealed, self.flagged))
+                return f"ok {self.status} {opened}"
+            if command == "flag":
+                flagged = self.toggle_flag(*self._cell(args))
+                return f"ok flag {flagged} {self.flags_placed}"
+            if command == "ai":
+                difficulty = args[0].lower() if args else HARD
+                if difficulty not in (EASY, MEDIUM, HARD):
+                    raise ValueError("difficulty must be easy, medium or hard")
+                if self.status is None:
+                    raise ValueError("start a game with new first")
+                row, col, action = self.ai_move(difficulty)
+                return f"ok ai {action} {row} {col} {self.status}"
+            if command == "state":
+                if self.status is None:
+                    raise ValueError("start a game with new first")
+                return f"ok state {self.status} {self.rows} {self.cols} {self.tiles()}"
+            if command == "help":
+                return "ok commands: new reveal chord flag ai state help quit"
+            return f"err unknown command {command!r} (try help)"
+        except ValueError as error:
+            if str(error).startswith("invalid literal"):
+                return "err expected whole numbers"
+            return f"err {error}"
+
+
+async def handle_client(reader, writer, stats):
+    """Serve one connection until it sends quit or closes."""
+    session = GameSession()
+    loop = asyncio.get_running_loop()
+    stats["open"] += 1
+    stats["total"] += 1
+    try:
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                # Longer than MAX_LINE: not a command from this protocol
+                writer.write(b"err line too long\n")
+                break
+            if not line:
+                break
+            text = line.decode("ascii", "replace").strip()
+            if text.lower() == "quit":
+                writer.write(b"ok bye\n")
+                break
+            if session.runs_inline(text):
+                response = session.handle(text)
+            else:
+                # Placing mines, first click regeneration, the AI and state all grow with the board; one command
+                # at a time per connection, so the session is never used by two threads at once
+                response = await loop.run_in_executor(None, session.handle, text)
+            writer.write(response.encode("ascii") + b"\n")
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        stats["open"] -= 1
+        writer.close()
+
+
+async def serve(host="127.0.0.1", port=DEFAULT_PORT, unix_path=None, ready=None):
+    """Run the server until cancelled. ready, if given, is called with the listening server."""
+    stats = {"open": 0, "total": 0}
+
+    async def client(reader, writer):
+        await handle_client(reader, writer, stats)
+
+    if unix_path:
+        server = await asyncio.start_unix_server(client, path=unix_path, limit=MAX_LINE)
+    else:
+        server = await asyncio.start_server(client, host, port, limit=MAX_LINE, backlog=1024)
+    server.stats = stats
+    if ready is not None:
+        ready(server)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Host many Minesweeper games over a line protocol.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port (default %(default)s)")
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    args = parser.parse_args(argv)
+
+    def ready(server):
+        where = args.unix or f"{args.host}:{args.port}"
+        print(f"Minesweeper server listening on {where}")
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, ready))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
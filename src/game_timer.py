@@ -2,6 +2,8 @@
 File Name: game_timer.py
 Module: src
 Function: Define the GameTimer class used to start, stop, and manage the timer during gameplay. This is what is used to determine player scores.
+    The time comes from a clock object: real monotonic time in the game, or a VirtualClock / FrameClock that
+    simulations move forward themselves, so simulated games get realistic times without waiting for them.
 Inputs: None
 Outputs: None
 Authors:
@@ -11,22 +13,61 @@ Creation Date: 9/29/2025
 NOTE: All code in the file was authored by 1 or more of the authors. No outside sources were used for code
 """
 
-import pygame
+from time import monotonic_ns  # default clock
+
+
+class MonotonicClock:
+    """Real time in milliseconds from the system's monotonic clock (never jumps when the wall clock changes)."""
+
+    def now_ms(self):
+        return monotonic_ns() // 1_000_000
+
+
+class VirtualClock:
+    """A clock that only moves when told to, so simulations can run faster than real time with realistic times."""
+
+    def __init__(self, start_ms=0):
+        self.time_ms = start_ms
+
+    def now_ms(self):
+        return self.time_ms
+
+    def advance(self, ms):
+        # Move the clock forward by ms milliseconds
+        self.time_ms += ms
+
+
+class FrameClock(VirtualClock):
+    """A virtual clock that moves forward a fixed amount every frame, e.g. 1000 // FPS for a game running at FPS."""
+
+    def __init__(self, frame_ms, start_ms=0):
+        super().__init__(start_ms)
+        self.frame_ms = frame_ms
+
+    def tick(self, frames=1):
+        # Call once per frame (or with the number of frames that passed)
+        self.time_ms += self.frame_ms * frames
+
 
 class GameTimer:
-    def __init__(self):
+    def __init__(self, clock=None):
+        # Where the time comes from (real time unless a virtual clock is passed in)
+        self.clock = clock if clock is not None else MonotonicClock()
         # Set the start time to 0
         self.start_time = 0
         # Set the running flag to False
         self.running = False
+        # Clock time when the timer was paused (None when not paused)
+        self.paused_at = None
         # Set the final time to 0
         self.final_time = 0
 
-    def start(self):
-        # Get the current time and set it as the start time
-        self.start_time = pygame.time.get_ticks()
+    def start(self, elapsed_ms=0):
+        # Get the current time and set it as the start time (moved back by elapsed_ms when resuming a saved game)
+        self.start_time = self.clock.now_ms() - elapsed_ms
         # Set the running flag to True 
         self.running = True
+        self.paused_at = None
         # Reset the final time to 0 when starting
         self.final_time = 0
     
@@ -34,9 +75,24 @@ class GameTimer:
         # Only stop the timer if it is running
         if self.running:
             # Set the final time using the current time
-            self.final_time = pygame.time.get_ticks() - self.start_time
+            self.final_time = self.get_elapsed_time_ms()
         # Set the running flag to False
         self.running = False
+        self.paused_at = None
+
+    def pause(self):
+        # Stop counting without ending the game (only while running)
+        if self.running and self.paused_at is None:
+            self.paused_at = self.clock.now_ms()
+
+    def resume(self):
+        # Continue counting; the paused stretch is left out by moving the start time forward
+        if self.paused_at is not None:
+            self.start_time += self.clock.now_ms() - self.paused_at
+            self.paused_at = None
+
+    def is_paused(self):
+        return self.paused_at is not None
 
     def format_time(self, raw_time):
         # Format the time into minutes and seconds
@@ -53,31 +109,29 @@ class GameTimer:
         return f"{minutes:02d}:{seconds:02d}"
         
     def get_elapsed_time(self):
-        if self.running:
-            # Calculate the elapsed time
-            elapsed_time = pygame.time.get_ticks() - self.start_time
-        else:
-            # Use the final time
-            elapsed_time = self.final_time
         # Format the time
-        formatted_time = self.format_time(elapsed_time)
+        formatted_time = self.format_time(self.get_elapsed_time_ms())
         # Return the formatted time
         return formatted_time
 
     def get_elapsed_time_seconds(self):
-        # Get elapsed time in seconds as an integer for score calculation
+        # Get elapsed time in whole seconds
+        return self.get_elapsed_time_ms() // 1000  # Convert milliseconds to seconds
+
+    def get_elapsed_time_ms(self):
+        # Get elapsed time in milliseconds (used for scores and when recording finished games)
         if self.running:
-            # Get the elapsed time in milliseconds
-            elapsed_time = pygame.time.get_ticks() - self.start_time
-        else:
-            # Use the final time
-            elapsed_time = self.final_time
-        return elapsed_time // 1000  # Convert milliseconds to seconds
+            # While paused the time stands still at the moment of the pause
+            now = self.paused_at if self.paused_at is not None else self.clock.now_ms()
+            return now - self.start_time
+        # Use the final time
+        return self.final_time
 
     def reset(self):
         # Reset the start time
         self.start_time = 0
         # Reset the running flag
         self.running = False
+        self.paused_at = None
         # Reset the final time
-        self.final_time = 0
\ No newline at end of file
+        self.final_time = 0
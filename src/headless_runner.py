@@ -0,0 +1,303 @@
+"""
+File Name: headless_runner.py
+Module: src
+Function: Drive the real game without a person or a screen. The game is started with SDL's dummy video and audio
+    drivers and a script of inputs (button clicks, clicks on board cells, right-click flags, typing) is posted as
+    pygame events one frame at a time, so it goes through the game's own event handling. At the end the runner
+    reports frames per second, frame times, input latency and the final state, so whole UI paths such as
+    menu -> play -> win -> menu can be timed automatically.
+Inputs: A script file or the name of a built-in scenario (see SCENARIOS).
+Outputs: A report printed to the console.
+Authors:
+    Minesweeper project contributors (see the git history of this file)
+Creation Date: 10/19/2026
+
+Usage (from the src folder):
+    python headless_runner.py win              built-in scenario
+    python headless_runner.py my_script.txt    script file
+    python headless_runner.py win --fps 60     cap the frame rate like the real game (default: uncapped)
+Player data (accounts, leaderboard, game log, saves) goes to a temporary folder unless --data-dir is given.
+
+Script commands (one per line, # starts a comment):
+    click <button text>       left click a button, e.g. "click Start Game"
+    click-at <x> <y>          left click a screen position
+    cell <row> <col>          left click a board cell (0-based, must be on screen)
+    flag <row> <col>          right click a board cell
+    chord <row> <col>         middle click a board cell
+    reveal-safe               left click a hidden cell without a mine
+    reveal-mine               left click a mine (after the first click)
+    play-to-win               reveal safe cells, one per frame, until the game is won
+    type <text>               type text
+    key <NAME>                press a key by its pygame name, e.g. "key RETURN"
+    wait <frames>             do nothing for a number of frames
+    until <state>[,<state>] [max frames]   wait until the game is in one of the states (default 600 frames)
+    quit                      close the window
+"""
+
+import os  # SDL drivers and the data folder
+import sys  # exit codes
+import argparse  # command line options
+import tempfile  # throwaway data folder
+from time import perf_counter  # frame timing
+from frame_profiler import percentile  # same percentiles as the in-game overlay
+
+SCENARIOS = {
+    # Menu -> settings (player only) -> play -> win -> menu
+    "win": """
+        click Settings
+        click Manual
+        click Continue
+        click Start Game
+        until playing
+        play-to-win
+        until win
+        wait 30
+        click-at 10 10
+        until menu
+        quit
+    """,
+    # Menu -> settings (player only) -> play -> lose -> menu
+    "lose": """
+        click Settings
+        click Manual
+        click Continue
+        click Start Game
+        until playing
+        reveal-safe
+        reveal-mine
+        until lose
+        wait 30
+        click-at 10 10
+        until menu
+        quit
+    """,
+    # Let the AI play a whole game on its own
+    "ai": """
+        click Settings
+        click Automatic
+        click Hard
+        click Continue
+        click Start Game
+        until win,lose 5000
+        quit
+    """,
+    # Create an account from the menu
+    "signup": """
+        click Sign In / Create
+        until signup
+        type bench
+        key RETURN
+        until menu
+        quit
+    """,
+}
+
+
+def parse_script(text):
+    """Turn script text into a list of (command, argument string) steps."""
+    steps = []
+    for line in text.splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line:
+            command, _, argument = line.partition(" ")
+            steps.append((command.lower(), argument.strip()))
+    return steps
+
+
+class ScriptRunner:
+    """Feeds a script into the game one step per frame (waits take several frames) and times every frame.
+
+    Its step() method is passed to minesweeper.main as the frame hook.
+    """
+
+    def __init__(self, game, steps, max_frames=100000):
+        self.game = game  # the minesweeper module
+        self.steps = steps
+        self.max_frames = max_frames
+        self.index = 0
+        self.frame = 0
+        self.frame_times = []  # milliseconds between frame starts
+        self.latencies = []  # milliseconds from posting an input to the start of the next frame
+        self.error = None
+        self._last = None
+        self._posted_at = None
+        self._wait_frames = 0
+        self._until_frames = 0
+
+    # --- event helpers ---
+
+    def _post(self, event):
+        import pygame
+        pygame.event.post(event)
+        self._posted_at = perf_counter()
+
+    def _click(self, pos, button=1):
+        import pygame
+        self._post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=button, pos=pos))
+        self._post(pygame.event.Event(pygame.MOUSEBUTTONUP, button=button, pos=pos))
+
+    def _click_cell(self, row, col, button=1):
+        if not (0 <= row < self.game.board_rows and 0 <= col < self.game.board_cols):
+            raise ValueError(f"cell {row},{col} is not on the board")
+        viewport = self.game.viewport
+        x, y = viewport.cell_to_screen(row, col)
+        half = viewport.tile_size // 2
+        self._click((x + half, y + half), button)
+
+    def _find_button(self, text):
+        from button import Button
+        for value in vars(self.game).values():
+            if isinstance(value, Button) and value.text.lower() == text.lower():
+                return value
+        raise ValueError(f"no button labelled {text!r}")
+
+    def _safe_cell(self):
+        g = self.game
+        if not g.first_click_done:
+            # The first click is always made safe by the game
+            return g.board_rows // 2, g.board_cols // 2
+        for r in range(g.board_rows):
+            for c in range(g.board_cols):
+                if not g.revealed[r][c] and not g.flagged[r][c] and g.grid[r][c] != g.MINE:
+                    return r, c
+        return None
+
+    # --- frame hook ---
+
+    def step(self):
+        import pygame
+        now = perf_counter()
+        if self._last is not None:
+            self.frame_times.append((now - self._last) * 1000)
+        if self._posted_at is not None:
+            self.latencies.append((now - self._posted_at) * 1000)
+            self._posted_at = None
+        self._last = now
+        self.frame += 1
+        if self.frame > self.max_frames and self.error is None:
+            self.error = f"gave up after {self.max_frames} frames"
+            self._post(pygame.event.Event(pygame.QUIT))
+            return
+        try:
+            self._run_step()
+        except Exception as error:
+            # Stop the game and report which step failed
+            self.error = f"step {self.index + 1} {self.steps[self.index] if self.index < len(self.steps) else ''}: {error}"
+            self.index = len(self.steps)
+            self._post(pygame.event.Event(pygame.QUIT))
+
+    def _run_step(self):
+        import pygame
+        g = self.game
+        if self.index >= len(self.steps):
+            return
+        command, argument = self.steps[self.index]
+        done = True
+        if command == "wait":
+            if self._wait_frames == 0:
+                self._wait_frames = int(argument)
+            self._wait_frames -= 1
+            done = self._wait_frames <= 0
+        elif command == "until":
+            states, _, limit = argument.partition(" ")
+            if g.state in states.split(","):
+                self._until_frames = 0
+            else:
+                self._until_frames += 1
+                if self._until_frames > int(limit or 600):
+                    raise ValueError(f"still in state {g.state!r}")
+                done = False
+        elif command == "click":
+            self._click(self._find_button(argument).rect.center)
+        elif command == "click-at":
+            x, y = (int(v) for v in argument.split())
+            self._click((x, y))
+        elif command in ("cell", "flag", "chord"):
+            row, col = (int(v) for v in argument.split())
+            self._click_cell(row, col, {"cell": 1, "flag": 3, "chord": 2}[command])
+        elif command in ("reveal-safe", "play-to-win"):
+            # play-to-win stays on this step until the game has left the playing state
+            if command == "reveal-safe" or g.state == g.PLAYING:
+                cell = self._safe_cell()
+                if cell is None:
+                    raise ValueError("no safe cell left")
+                self._click_cell(*cell)
+                done = command == "reveal-safe"
+        elif command == "reveal-mine":
+            mines = [(r, c) for r in range(g.board_rows) for c in range(g.board_cols)
+                     if g.grid[r][c] == g.MINE and not g.flagged[r][c]]
+            if not g.first_click_done or not mines:
+                raise ValueError("no mine to click yet")
+            self._click_cell(*mines[0])
+        elif command == "type":
+            for char in argument:
+                self._post(pygame.event.Event(pygame.KEYDOWN, key=ord(char.lower()), unicode=char, mod=0))
+        elif command == "key":
+            self._post(pygame.event.Event(pygame.KEYDOWN, key=getattr(pygame, "K_" + argument), unicode="", mod=0))
+        elif command == "quit":
+            self._post(pygame.event.Event(pygame.QUIT))
+        else:
+            raise ValueError(f"unknown command {command!r}")
+        if done:
+            self.index += 1
+
+    # --- results ---
+
+    def report(self, started, first_frame_at):
+        g = self.game
+        frames = sorted(self.frame_times)
+        latencies = sorted(self.latencies)
+        total = sum(self.frame_times) / 1000
+        print(f"Startup to first frame: {(first_frame_at - started) * 1000:.1f} ms")
+        print(f"Frames: {self.frame}, {self.frame / total if total else 0:.1f} fps over {total:.2f} s")
+        print("Frame time ms:    p50 {:.2f}  p95 {:.2f}  p99 {:.2f}  max {:.2f}".format(
+            percentile(frames, 50), percentile(frames, 95), percentile(frames, 99), frames[-1] if frames else 0))
+        print("Input latency ms: p50 {:.2f}  p95 {:.2f}  max {:.2f}  ({} inputs)".format(
+            percentile(latencies, 50), percentile(latencies, 95), latencies[-1] if latencies else 0, len(latencies)))
+        revealed = sum(map(sum, g.revealed))
+        print(f"Final state: {g.state}, board {g.board_rows}x{g.board_cols}, {g.counter_value} mines, "
+              f"{revealed} tiles revealed, {g.flags_placed} flags, time {g.game_time.get_elapsed_time()}")
+        print(f"Steps completed: {self.index}/{len(self.steps)}")
+        if self.error:
+            print(f"Error: {self.error}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the game headless from a script of inputs.")
+    parser.add_argument("script", help="built-in scenario (" + ", ".join(SCENARIOS) + ") or a script file")
+    parser.add_argument("--fps", type=int, default=0, help="frame rate cap (default 0 = uncapped)")
+    parser.add_argument("--ai-delay", type=float, default=0.0, help="seconds before each AI move (default 0)")
+    parser.add_argument("--data-dir", help="folder for player data (default: a new temporary folder)")
+    parser.add_argument("--max-frames", type=int, default=100000, help="stop after this many frames")
+    args = parser.parse_args(argv)
+
+    if args.script in SCENARIOS:
+        text = SCENARIOS[args.script]
+    else:
+        with open(args.script, "r", encoding="utf-8") as f:
+            text = f.read()
+    steps = parse_script(text)
+
+    # All of this has to be set before pygame and the settings are imported
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ["MINESWEEPER_DATA_DIR"] = args.data_dir or tempfile.mkdtemp(prefix="minesweeper-run-")
+    print(f"Player data in {os.environ['MINESWEEPER_DATA_DIR']}")
+
+    started = perf_counter()
+    import minesweeper
+    runner = ScriptRunner(minesweeper, steps, args.max_frames)
+    first_frame = []
+
+    def hook():
+        if not first_frame:
+            first_frame.append(perf_counter())
+        runner.step()
+
+    minesweeper.main(frame_hook=hook, fps=args.fps, ai_delay=args.ai_delay)
+    runner.report(started, first_frame[0] if first_frame else perf_counter())
+    return 0 if runner.error is None and runner.index >= len(steps) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
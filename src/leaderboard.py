@@ -0,0 +1,254 @@
+"""
+File Name: leaderboard.py
+Module: src
+Function: Define the Leaderboard class, which records every finished game keyed by its configuration (board size, mine
+    count, mode, difficulty and board generation) and answers top-N and per-user rank queries from a ranking kept sorted as games come
+    in. Games are appended to leaderboard.jsonl on a background thread. The standings are also saved as a snapshot
+    (with how far into leaderboard.jsonl they go) when the leaderboard is closed, so startup only replays the games
+    added after the snapshot instead of the whole history.
+Inputs: The path of the leaderboard file.
+Outputs: The leaderboard file and its snapshot.
+Authors:
+    Minesweeper project contributors (see the git history of this file)
+Creation Date: 10/19/2026
+"""
+
+import os  # check for the leaderboard file
+import json  # one JSON object per line
+import time  # timestamp each game
+import queue  # hand appends to the writer thread
+import atexit  # write pending games when the program exits
+import bisect  # keep each ranking sorted
+import threading  # append on a background thread
+from typing import Dict, List, Optional, Tuple
+from settings import GEN_RANDOM
+from user_store import atomic_write  # temp file + rename
+
+# (rows, cols, mines, mode, difficulty, generation)
+Config = Tuple[int, int, int, str, str, str]
+
+# Bumped whenever the snapshot layout changes; a snapshot with another version is ignored (the jsonl is replayed)
+SNAPSHOT_VERSION = 1
+
+
+def config_key(rows: int, cols: int, mines: int, mode: str, difficulty: str, generation: str = GEN_RANDOM) -> Config:
+    """The key games are grouped under; only games with the same key are ranked against each other."""
+    return (rows, cols, mines, mode, difficulty, generation)
+
+
+def compute_score(mines: int, elapsed_ms: int) -> int:
+    """Score for a won game: more mines and less time is better. 0 if no time has passed.
+
+    Same scale as the old mines * 1000 // whole seconds, but measured to the millisecond so games that finish within
+    the same second no longer tie (and games under a second still score).
+    """
+    if elapsed_ms <= 0:
+        return 0
+    return (mines * 1_000_000) // elapsed_ms
+
+
+class _ConfigBoard:
+    """Standings for one configuration.
+
+    best maps each user to their best score; ranking holds one (-score, username) entry per user, kept sorted with
+    bisect, so the top N is a slice and a user's rank is one binary search.
+    """
+
+    def __init__(self):
+        self.best: Dict[str, int] = {}
+        self.ranking: List[Tuple[int, str]] = []
+        self.played = 0
+        self.won = 0
+
+    @classmethod
+    def from_snapshot(cls, entry) -> "_ConfigBoard":
+        board = cls()
+        board.played = int(entry["played"])
+        board.won = int(entry["won"])
+        board.best = {str(username): int(score) for username, score in entry["best"].items()}
+        board.ranking = sorted((-score, username) for username, score in board.best.items())
+        return board
+
+    def to_snapshot(self, key: Config):
+        return {"key": list(key), "played": self.played, "won": self.won, "best": self.best}
+
+    def add(self, username: Optional[str], won: bool, score: int) -> bool:
+        # Returns True if the ranking changed
+        self.played += 1
+        if not won:
+            return False
+        self.won += 1
+        if not username:
+            # Guests' games are counted but not ranked
+            return False
+        old = self.best.get(username)
+        if old is not None:
+            if score <= old:
+                return False
+            # Drop the user's old entry before inserting the better one
+            del self.ranking[bisect.bisect_left(self.ranking, (-old, username))]
+        self.best[username] = score
+        bisect.insort(self.ranking, (-score, username))
+        return True
+
+
+class Leaderboard:
+    """Every finished game, grouped by configuration, with standings kept up to date in memory.
+
+    The standings are loaded once here (from the snapshot plus the games appended after it); after that queries never
+    touch the disk and record() only queues the line for the writer thread. version goes up whenever any ranking
+    changes, so callers can cache what they draw.
+    """
+
+    def __init__(self, path: str, snapshot_path: Optional[str] = None):
+        self.path = path
+        self.snapshot_path = snapshot_path or f"{path}.snapshot"
+        self._boards: Dict[Config, _ConfigBoard] = {}
+        self.version = 0
+        self._offset = 0  # bytes of the jsonl the standings include (only the writer thread moves it after loading)
+        self._unsaved = 0  # games in the standings that the snapshot doesn't have yet
+        self._load()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._writer, name="leaderboard-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _load(self) -> None:
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        self._load_snapshot(size)
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # A half written last line after a crash: cut it off so the next game starts a fresh line
+                        break
+                    self._offset += len(line)
+                    self._unsaved += 1
+                    try:
+                        game = json.loads(line)
+                        key = config_key(game["rows"], game["cols"], game["mines"], game["mode"], game["difficulty"],
+                                         game.get("gen", GEN_RANDOM))
+                        self._board(key).add(game.get("user"), game["won"], game.get("score", 0))
+                    except (ValueError, KeyError, TypeError):
+                        # Skip a damaged line
+                        continue
+            if self._offset < size:
+                os.truncate(self.path, self._offset)
+        except OSError:
+            pass
+
+    def _load_snapshot(self, size: int) -> None:
+        # Start from the snapshot if it matches the jsonl (a jsonl shorter than the snapshot's offset was replaced or
+        # cut, so the whole file is replayed instead)
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            if snapshot["version"] != SNAPSHOT_VERSION or not 0 <= snapshot["offset"] <= size:
+                return
+            boards = {tuple(entry["key"]): _ConfigBoard.from_snapshot(entry) for entry in snapshot["boards"]}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return
+        self._boards = boards
+        self._offset = snapshot["offset"]
+
+    def save_snapshot(self) -> None:
+        """Write the standings and how far into the jsonl they go. Only call once the writer thread has stopped (close
+        does), so the offset and the standings describe the same games."""
+        if not self._unsaved:
+            return
+        snapshot = {"version": SNAPSHOT_VERSION, "offset": self._offset,
+                    "boards": [board.to_snapshot(key) for key, board in self._boards.items()]}
+        try:
+            atomic_write(self.snapshot_path, json.dumps(snapshot, separators=(",", ":")).encode("utf-8"))
+            self._unsaved = 0
+        except OSError:
+            # The next launch replays a longer tail, nothing is lost
+            pass
+
+    def _board(self, key: Config) -> _ConfigBoard:
+        board = self._boards.get(key)
+        if board is None:
+            board = self._boards[key] = _ConfigBoard()
+        return board
+
+    def record(self, key: Config, username: Optional[str], won: bool, elapsed_ms: int, score: int = 0) -> None:
+        """Record a finished game. username is None for guests."""
+        if self._board(key).add(username, won, score):
+            self.version += 1
+        self._unsaved += 1
+        rows, cols, mines, mode, difficulty, generation = key
+        game = {"rows": rows, "cols": cols, "mines": mines, "mode": mode, "difficulty": difficulty, "gen": generation,
+                "user": username, "won": won, "ms": elapsed_ms, "score": score, "at": time.time()}
+        self._queue.put(json.dumps(game, separators=(",", ":")))
+
+    def top(self, key: Config, n: int) -> List[Tuple[str, int]]:
+        """The n best (username, score) pairs for a configuration, best first."""
+        board = self._boards.get(key)
+        if board is None:
+            return []
+        return [(username, -neg_score) for neg_score, username in board.ranking[:n]]
+
+    def rank(self, key: Config, username: str) -> Optional[int]:
+        """A user's 1-based rank for a configuration (ties share a rank), or None if they haven't won it."""
+        board = self._boards.get(key)
+        if board is None or username not in board.best:
+            return None
+        return bisect.bisect_left(board.ranking, (-board.best[username],)) + 1
+
+    def best(self, key: Config, username: str) -> Optional[int]:
+        """A user's best score for a configuration, or None."""
+        board = self._boards.get(key)
+        return board.best.get(username) if board else None
+
+    def games_played(self, key: Config) -> Tuple[int, int]:
+        """(games played, games won) for a configuration."""
+        board = self._boards.get(key)
+        return (board.played, board.won) if board else (0, 0)
+
+    # --- persistence (background) ---
+
+    def _writer(self) -> None:
+        while True:
+            line = self._queue.get()
+            # Append everything queued behind this game in one write
+            batch = [line]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines = [item for item in batch if item is not None]
+            if lines:
+                try:
+                    directory = os.path.dirname(self.path)
+                    if directory:
+                        os.makedirs(directory, exist_ok=True)
+                    with open(self.path, "ab") as f:
+                        f.write(("\n".join(lines) + "\n").encode("utf-8"))
+                        self._offset = f.tell()
+                except OSError:
+                    # Don't crash the game over a failed save
+                    pass
+            for _ in batch:
+                self._queue.task_done()
+            if None in batch:
+                return
+
+    def flush(self) -> None:
+        """Block until every recorded game has been written."""
+        if not self._closed:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Write pending games, stop the writer thread and save the snapshot."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self.save_snapshot()
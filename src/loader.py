@@ -0,0 +1,93 @@
+"""
+File Name: loader.py
+Module: src
+Function: Define the AssetLoader class, which decodes game assets (sprites, profile picture, sounds, music) on a
+    background thread in priority order while the main loop keeps drawing frames.
+Inputs: A manifest of assets, each with a priority, a decode step (run on the worker thread) and an optional finish
+    step (run on the main thread, for work such as convert_alpha that needs the display).
+Outputs: None.
+Authors:
+    Minesweeper project contributors (see the git history of this file)
+Creation Date: 10/19/2026
+"""
+
+import threading
+
+# Priorities used by the game's manifest (lower loads first)
+PRIORITY_SPRITES = 0
+PRIORITY_PROFILE = 1
+PRIORITY_SOUND_EFFECTS = 2
+PRIORITY_MUSIC = 3
+
+
+class _Asset:
+    """One manifest entry."""
+
+    def __init__(self, name, priority, decode, finish, required):
+        self.name = name
+        self.priority = priority
+        self.decode = decode  # called on the worker thread, returns the decoded data
+        self.finish = finish  # called on the main thread with the decoded data (optional)
+        self.required = required  # the game waits for required assets before the first interactive frame
+        self.done = False
+
+
+class AssetLoader:
+    """Decode a manifest of assets on one worker thread, lowest priority number first.
+
+    The worker only runs the decode steps. Finished results wait in a queue until the main loop calls poll(), which
+    runs the finish steps on the main thread, so nothing touches the display from the worker.
+    """
+
+    def __init__(self):
+        self._assets = []
+        self._decoded = []  # (asset, result) pairs waiting for poll()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.loaded = 0  # number of assets fully finished
+
+    def add(self, name, priority, decode, finish=None, required=True):
+        """Add an asset to the manifest. Must be called before start()."""
+        self._assets.append(_Asset(name, priority, decode, finish, required))
+
+    def start(self):
+        """Start decoding on the worker thread."""
+        # sort is stable, so assets with the same priority keep the order they were added in
+        self._assets.sort(key=lambda asset: asset.priority)
+        self._thread = threading.Thread(target=self._run, name="asset-loader", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        for asset in self._assets:
+            try:
+                result = asset.decode()
+            except Exception:
+                # A broken asset shouldn't stop the rest from loading; its finish step is skipped
+                result = None
+            with self._lock:
+                self._decoded.append((asset, result))
+
+    def poll(self):
+        """Run the main-thread finish step of every asset decoded since the last call. Call once per frame."""
+        with self._lock:
+            decoded, self._decoded = self._decoded, []
+        for asset, result in decoded:
+            if asset.finish is not None and result is not None:
+                try:
+                    asset.finish(result)
+                except Exception:
+                    pass
+            asset.done = True
+            self.loaded += 1
+
+    @property
+    def total(self):
+        return len(self._assets)
+
+    def required_done(self):
+        """True once every required asset is finished."""
+        return all(asset.done for asset in self._assets if asset.required)
+
+    def done(self):
+        """True once every asset is finished."""
+        return self.loaded == len(self._assets)
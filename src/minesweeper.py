@@ -11,34 +11,63 @@
 # Created by Nevan Snider on Sept 3rd, with contributions from Evan Rogerson, Spencer Rodenberg, Kyle Whitmer, and Karsten Wolter
 # With additions and edits by: Blake Carlson, Nifemi Lawal, Logan Smith, Jack Bauer, Dellie Wright
 
+import profiling  # opt-in cProfile/tracemalloc sessions (--profile / MINESWEEPER_PROFILE)
+if __name__ == "__main__":
+    # Set up before the other imports so a startup session covers them too
+    profiling.configure()
+    profiling.mark("startup-begin")
+
 import pygame  # import pygame, the main GUI we used in order to create images and track mouse clicks.
-import random  # import random to randomly pick mine locations
+import random  # import random for the confetti particles
 import os # Access visual asset path
-from collections import deque  # Queue for flood-fill
+import app  # creates the window, clock, fonts and sound on first use
 from button import Button
-from game_assets import flag_sprite, mines_sprite, numbers_sprites, load_circular_profile
+from game_assets import get_sprites, decode_sprites, install_sprites, prepare_circular_profile, profile_to_surface
+from loader import AssetLoader, PRIORITY_SPRITES, PRIORITY_PROFILE, PRIORITY_SOUND_EFFECTS, PRIORITY_MUSIC
+from sound_cache import load_sound  # decoded sound effect cache
+from board import (  # board engine (no pygame needed)
+    new_board, compute_counts, reveal_cells, chord_cells, count_hidden_safe
+)
 from auth import AuthContext  # simple local auth (token/user.json)
-from pfp_helper import save_profile_image  # copy chosen image to assets
+from leaderboard import Leaderboard, config_key, compute_score  # per-configuration standings
+from game_log import (  # compact log of every game played
+    GameLog, ACTOR_PLAYER, ACTOR_AI, ACTION_REVEAL, ACTION_FLAG, ACTION_UNFLAG, RESULT_WIN, RESULT_LOSS, RESULT_ABANDONED
+)
+from savegame import GameSaver, SavedGame, snapshot_rows, load_game  # autosave and resume
+from pfp_helper import ProfileImport, ProfileLoad  # import or load profile pictures on a worker thread
 from game_timer import GameTimer # Track game time
 from ai import ai_solver
-from time import sleep
+from board_pool import BoardPool, BoardBuild  # boards built ahead of time, or on a worker thread on a miss
+from viewport import Viewport # Camera for panning/zooming the board
+from frame_profiler import FrameProfiler # Per-phase frame timings (F3 overlay, F4 CSV)
+from time import sleep, strftime
 
 from settings import (
-    clock, screen, WIDTH, HEIGHT, sfx, 
+    WIDTH, HEIGHT,
     WHITE, BLACK, GREEN, RED, LIGHT_RED, DARK_RED, PURPLE, GRAY, LIGHT_GRAY, CONFETTI_COLORS, BLUE,
-    font, small_font, tiny_font,
     MENU, PLAYING, WIN, LOSE,
-    GRID_SIZE, TILE_SIZE, GRID_START_X, GRID_START_Y,
-    MINE, DIRS8, CONFETTI_TARGET, ASSETS_DIR,
+    GRID_SIZE, TILE_SIZE, GRID_START_X, GRID_START_Y, PAN_SPEED, BOARD_SIZES, MIN_MINES, FPS, AI_MOVE_DELAY,
+    MINE, DIRS8, CONFETTI_TARGET, ASSETS_DIR, LEADERBOARD_PATH, LEADERBOARD_SIZE, GAME_LOG_PATH, SAVE_GAME_PATH,
+    FRAME_PROFILE_SIZE, FRAME_PROFILE_DIR,
     EASY, MEDIUM, HARD,
     AI_INTERACTIVE, AI_AUTOMATIC, AI_MANUAL,
+    GEN_RANDOM, GEN_NO_GUESS, NO_GUESS_MAX_TILES, BOARD_BUILD_WAIT,
     current_theme, switch_theme, get_current_theme
 )
 
+# Window, clock, fonts and sound; created by main() through the app bootstrap
+screen = None
+clock = None
+sfx = None
+font = small_font = tiny_font = None
+
 state = MENU  # start in the main menu
 counter_value = 10  # adjustable number in main menu
 difficulty = MEDIUM # default to medium
 mode = AI_INTERACTIVE # default to interactive mode
+board_size_index = 0 # index into BOARD_SIZES (default 10x10)
+board_rows, board_cols = GRID_SIZE, GRID_SIZE # current board dimensions
+generation = GEN_RANDOM # how boards are built (random or no-guess)
 
 # declare ai (defualt none)
 ai = None
@@ -46,6 +75,9 @@ ai = None
 # declare turn order
 player_turn = True
 
+# mouse buttons currently held down
+mouse_buttons_down = set()
+
 # global confetti list
 confetti = []
 
@@ -57,8 +89,36 @@ show_high_score_notification = False  # Flag to show the notification
 notification_start_time = 0  # When the notification started
 NOTIFICATION_DURATION = 3.0  # How long to show notification in seconds
 
-# Load the auth context to manage token/username/pfp
-auth = AuthContext()
+# Player data, opened by open_player_data() when main() starts (each one reads files and starts a writer or worker
+# thread, so importing this module does neither)
+# The auth context to manage token/username/pfp
+auth = None
+
+# Every finished game, ranked per board size / mines / mode / difficulty
+leaderboard = None
+# Rendered leaderboard lines for the menu, rebuilt only when what they show changes
+leaderboard_cache = {"key": None, "surfaces": []}
+
+# Every game's seed, settings and moves
+game_log = None
+# Mines of the current game come from this seed so the log can rebuild the board
+game_seed = 0
+# Boards for the next game, built on a worker thread so Start and the first click don't wait for generation
+board_pool = None
+# The first click's board when the pool had none that fit it, built on its own thread, and the tiles that click
+# reveals once the board is ready (None when no build is running)
+board_build = None
+pending_reveal = None
+
+# Timings of each phase of the main loop
+profiler = FrameProfiler(FRAME_PROFILE_SIZE)
+
+# Autosave of the game in progress, written in the background after every move
+game_saver = None
+saved_game_available = False  # show the Resume button
+save_pending = False  # a move happened since the last autosave
+# One byte per tile snapshots of the board for the save; a move clears the one it changed so only that is retaken
+save_tiles = {}
 
 PROFILE_DIAMETER = 56  # profile picture diameter
 PROFILE_MARGIN = 65    # margin from edge
@@ -75,8 +135,8 @@ def resolve_profile_path():  # Pick user pfp if logged in, else guest
     # If not logged in or no valid pfp, return the default profile image path
     return os.path.join(ASSETS_DIR, "images", "default_profile.jpg")
 
-# Load the initial avatar surface using the resolved profile path and the wanted diameter
-profile_surface = load_circular_profile(resolve_profile_path(), PROFILE_DIAMETER)  # Load initial avatar
+# Avatar surface, loaded by main() once the window exists
+profile_surface = None
 
 # Buffer to hold the username input during signup
 signup_input = ""  # Username buffer during signup
@@ -84,9 +144,12 @@ signup_input = ""  # Username buffer during signup
 # Buffer to hold the path input during set profile picture
 setpfp_input = ""  # path buffer during set pfp
 setpfp_error = ""  # Error message when set pfp path is invalid
+pfp_import = None  # ProfileImport while a chosen image is being imported
+profile_load = None  # ProfileLoad while the picture of the user who just signed in or out is being loaded
 
 # Buttons for the main menu (shown conditionally by login state)
 start_button = Button(WIDTH // 2 - 100, 170, 200, 60, "Start Game", GREEN, (0, 255, 0))  # Start
+resume_button = Button(WIDTH // 2 - 320, 170, 200, 60, "Resume Game", GREEN, (0, 255, 0))  # Resume the saved game
 settings_button = Button(WIDTH // 2 - 100, 240, 200, 60, "Settings", PURPLE, (255, 0, 255)) # Settings
 easy_button = Button(WIDTH // 2 - 100, 240, 200, 60, "Easy", GREEN, (0, 255, 0)) # Difficulty menu: easy
 medium_button = Button(WIDTH // 2 - 100, 310, 200, 60, "Medium", (160, 160, 0), (210, 210, 40)) # Difficulty menu: medium
@@ -108,6 +171,28 @@ skip_button = Button(WIDTH - 500, HEIGHT - 260 , 100, 40 , "Skip", GRAY, (150, 1
 dark_mode_button = Button(WIDTH // 2 - 110, 420, 100, 50, "Dark", GRAY, (150, 150, 150))  # Dark mode button
 light_mode_button = Button(WIDTH // 2 + 10, 420, 100, 50, "Light", GRAY, (150, 150, 150))  # Light mode button
 
+# Board size button (cycles through BOARD_SIZES)
+board_size_button = Button(WIDTH // 2 + 150, 420, 160, 50, f"{GRID_SIZE} x {GRID_SIZE}", GRAY, (150, 150, 150))
+
+# Board generation button (cycles between random and no-guess boards)
+generation_button = Button(WIDTH // 2 - 310, 420, 160, 50, GEN_RANDOM, GRAY, (150, 150, 150))
+
+def open_player_data():
+    """Open the accounts, leaderboard, game log, board pool and autosave the game runs on."""
+    global auth, leaderboard, game_log, board_pool, game_saver, saved_game_available
+    auth = AuthContext()
+    leaderboard = Leaderboard(LEADERBOARD_PATH)
+    game_log = GameLog(GAME_LOG_PATH)
+    board_pool = BoardPool()
+    game_saver = GameSaver(SAVE_GAME_PATH)
+    saved_game_available = game_saver.exists()
+
+def start_profile_load():
+    """Load the current user's picture on a worker thread (shown by the main loop once it is ready)."""
+    global profile_load
+    # A newer load replaces one still running; the older result is never shown
+    profile_load = ProfileLoad(resolve_profile_path(), lambda path: prepare_circular_profile(path, PROFILE_DIAMETER))
+
 def load_user_theme():
     """Load the user's theme preference and switch to it"""
     theme_pref = auth.get_theme_preference()
@@ -130,20 +215,29 @@ def update_theme_button_styles():
 
 
 # define the grid that the thing will be mapped to
-grid = [[0 for i in range(10)] for j in range(10)]
+grid = [[0 for i in range(board_cols)] for j in range(board_rows)]
 
 # track revealed tiles
-revealed = [[False for i in range(10)] for j in range(10)]
+revealed = [[False for i in range(board_cols)] for j in range(board_rows)]
 
 # track flagged tiles
-flagged = [[False for i in range(10)] for j in range(10)]
+flagged = [[False for i in range(board_cols)] for j in range(board_rows)]
 
-counts = [[0] * GRID_SIZE for _ in range(GRID_SIZE)]
+counts = [[0] * board_cols for _ in range(board_rows)]
 
-squarePickList = [0 for i in range(100)]  # allow the board to pick any item to have a mine on it
+flags_placed = 0  # number of flags on the board (kept up to date by set_flag so it is never recounted per frame)
 
 first_click_done = False
 
+hidden_safe = 0  # safe tiles not revealed yet (set on the first click); the game is won when it reaches 0
+
+# Camera over the board; it keeps the original 10x10 board area on screen and scrolls larger boards inside it
+viewport = Viewport((GRID_START_X, GRID_START_Y, GRID_SIZE * TILE_SIZE, GRID_SIZE * TILE_SIZE), board_rows, board_cols)
+
+# Sprites and labels scaled to the current tile size, rebuilt only when the zoom level changes
+scaled_sprite_cache = {}
+label_cache = {}
+
 def draw_sfx_info(surface):
     if not sfx.enabled:
         return
@@ -188,202 +282,152 @@ def draw_sfx_info(surface):
     skip_button.draw(surface, tiny_font)
 
 def setup_grid():
-    # reset the grid back to the original state
-    for i in range(10):  # iterate over rows
-        for j in range(10):  # iterate over colums
-            grid[i][j] = 0  # Set value to 0
-            revealed[i][j] = False  # Set it to not revealed
-            flagged[i][j] = False  # Set it to not flagged
+    # (re)build the board for the current board size with every tile empty, unrevealed and unflagged
+    global grid, revealed, flagged, counts, flags_placed
+    grid, revealed, flagged, counts = new_board(board_rows, board_cols)
+    flags_placed = 0
 
+    # point the camera at the new board
+    viewport.set_board_size(board_rows, board_cols)
 
-    # put 1 number for every 100 square
-    for i in range(100):
-        squarePickList[i] = i # Set the item to the index
 
+# Largest mine count the menu allows for the current board (20 on the classic 10x10 board)
+def get_max_mines():
+    return max(MIN_MINES, board_rows * board_cols // 5)
 
-# Converts mouse coordinates to grid positions
-def get_grid_pos(mouse_x, mouse_y):
-    # converts mouse coordinates to grid positions
-    # check if click was in grid area
-    if (GRID_START_X <= mouse_x <= GRID_START_X + GRID_SIZE * TILE_SIZE and
-            GRID_START_Y <= mouse_y <= GRID_START_Y + GRID_SIZE * TILE_SIZE):
 
-        # calculate which row and column was clicked
-        col = (mouse_x - GRID_START_X) // TILE_SIZE
-        row = (mouse_y - GRID_START_Y) // TILE_SIZE
+# How much the +/- buttons change the mine count by (1 on the classic board, more on big boards)
+def get_mine_step():
+    return max(1, get_max_mines() // 20)
+
 
-        # Make sure of valid grid position
-        if 0 <= row < GRID_SIZE and 0 <= col < GRID_SIZE:
-            return row, col
-    return None, None  # Result if click was out of grid
+# Converts mouse coordinates to grid positions
+def get_grid_pos(mouse_x, mouse_y):
+    # the viewport handles panning/zooming, so hit-testing uses the same transform as drawing
+    return viewport.screen_to_cell(mouse_x, mouse_y)
+
+
+# Spreadsheet style column names: A..Z, then AA, AB, ... for boards wider than 26 columns
+def column_label(col):
+    label = ""
+    col += 1
+    while col > 0:
+        col, rem = divmod(col - 1, 26)
+        label = chr(ord('A') + rem) + label
+    return label
+
+
+# Rendered row/column labels, cached since the same few labels are drawn every frame
+def get_label_surface(text):
+    key = (text, get_current_theme()['text'])
+    surf = label_cache.get(key)
+    if surf is None:
+        surf = small_font.render(text, True, key[1])
+        label_cache[key] = surf
+    return surf
+
+
+# Flag, mine and number sprites scaled to the current tile size (sprites are half a tile wide)
+def get_scaled_sprites(tile_size):
+    sprites = scaled_sprite_cache.get(tile_size)
+    if sprites is None:
+        flag_sprite, mines_sprite, numbers_sprites = get_sprites()
+        size = max(1, tile_size // 2)
+        scale = lambda sprite: sprite if sprite.get_width() == size else pygame.transform.smoothscale(sprite, (size, size))
+        sprites = {
+            "flag": scale(flag_sprite) if flag_sprite else None,
+            "mine": scale(mines_sprite),
+            "numbers": {n: scale(s) for n, s in numbers_sprites.items()},
+        }
+        scaled_sprite_cache[tile_size] = sprites
+    return sprites
 
 
 # Function to drawr the grid visuaully so the user can see it
 def draw_grid():
-    # draws column letters A-J
-    for col in range(GRID_SIZE):
-        x = GRID_START_X + col * TILE_SIZE  # get start pos
-        y = GRID_START_Y - 25
-        letter = chr(ord('A') + col)  # iterate through different numbers
-        col_letters = small_font.render(letter, True, get_current_theme()['text'])  # create the character
-        screen.blit(col_letters, (x + TILE_SIZE // 2 - col_letters.get_width() // 2,
-                                  y))  # draw onto another object (in this case the tile)
-
-    # draws row numbers 1-10
-    for row in range(GRID_SIZE):
-        x = GRID_START_X - 30  # get start pos
-        y = GRID_START_Y + row * TILE_SIZE
-        number = str(row + 1)  # iterate through numbers
-        row_numbers = small_font.render(number, True, get_current_theme()['text'])  # create the character
-        screen.blit(row_numbers, (x,
-                                  y + TILE_SIZE // 2 - row_numbers.get_height() // 2))  # draw onto another object (in this case the tile)
-
-    # draws the grid
-    for row in range(GRID_SIZE):
-        for col in range(GRID_SIZE):
-            x = GRID_START_X + col * TILE_SIZE  # create the tiles
-            y = GRID_START_Y + row * TILE_SIZE
+    theme = get_current_theme()
+    ts = viewport.tile_size
+    view = viewport.rect
+    first_row, last_row, first_col, last_col = viewport.visible_cells()  # only tiles on screen get drawn
+    board_x, board_y = viewport.cell_to_screen(0, 0)
+
+    # labels are only drawn while the tiles are big enough to line up with them
+    if ts >= 20:
+        # draws column letters along the top edge of the visible board
+        y = max(view.top, board_y) - 25
+        for col in range(first_col, last_col):
+            x, _ = viewport.cell_to_screen(0, col)  # get start pos
+            if not view.left <= x + ts // 2 <= view.right:
+                continue
+            col_letters = get_label_surface(column_label(col))  # create the character
+            screen.blit(col_letters, (x + ts // 2 - col_letters.get_width() // 2,
+                                      y))  # draw onto another object (in this case the tile)
+
+        # draws row numbers down the left edge of the visible board
+        x = max(view.left, board_x) - 30
+        for row in range(first_row, last_row):
+            _, y = viewport.cell_to_screen(row, 0)  # get start pos
+            if not view.top <= y + ts // 2 <= view.bottom:
+                continue
+            row_numbers = get_label_surface(str(row + 1))  # create the character
+            screen.blit(row_numbers, (x,
+                                      y + ts // 2 - row_numbers.get_height() // 2))  # draw onto another object (in this case the tile)
+
+    # draws the visible part of the grid, clipped to the viewport
+    sprites = get_scaled_sprites(ts)
+    sprite_offset = (ts - max(1, ts // 2)) // 2
+    border_width = max(1, ts // 20)
+    screen.set_clip(view)
+    for row in range(first_row, last_row):
+        grid_row, revealed_row, flagged_row, counts_row = grid[row], revealed[row], flagged[row], counts[row]
+        for col in range(first_col, last_col):
+            x, y = viewport.cell_to_screen(row, col)  # create the tiles
+            tile = (x, y, ts, ts)
 
             # draw tile background
-            if revealed[row][col]:
-                if grid[row][col] == MINE:  # tile turns red if revealed tile is a mine
-                    pygame.draw.rect(screen, DARK_RED, (x, y, TILE_SIZE, TILE_SIZE))
-                    screen.blit(mines_sprite, (x + 10, y + 10))
+            if revealed_row[col]:
+                if grid_row[col] == MINE:  # tile turns red if revealed tile is a mine
+                    screen.fill(DARK_RED, tile)
+                    screen.blit(sprites["mine"], (x + sprite_offset, y + sprite_offset))
                 else:  # otherwise the revealed tile turns light gray
-                    pygame.draw.rect(screen, get_current_theme()['grid_revealed'], (x, y, TILE_SIZE, TILE_SIZE))
-                    n = counts[row][col]  # Show numbers on revealed tiles
+                    screen.fill(theme['grid_revealed'], tile)
+                    n = counts_row[col]  # Show numbers on revealed tiles
                     if n > 0:  # Generate a number on tiles that have nearby mines
-                        screen.blit(numbers_sprites[n], (x + 10, y + 10))
+                        screen.blit(sprites["numbers"][n], (x + sprite_offset, y + sprite_offset))
             else:  # when not revealed tile is gray
-                pygame.draw.rect(screen, get_current_theme()['grid_tile'], (x, y, TILE_SIZE, TILE_SIZE))
+                screen.fill(theme['grid_tile'], tile)
 
             # draw tile border
-            pygame.draw.rect(screen, get_current_theme()['grid_border'], (x, y, TILE_SIZE, TILE_SIZE), 2)
+            pygame.draw.rect(screen, theme['grid_border'], tile, border_width)
 
-            if flagged[row][col] and not revealed[row][col]:
+            if flagged_row[col] and not revealed_row[col]:
                 # Load flag sprite when tile is flagged
-                if flag_sprite:
-                    screen.blit(flag_sprite, (x + 10, y + 10))
+                if sprites["flag"]:
+                    screen.blit(sprites["flag"], (x + sprite_offset, y + sprite_offset))
+    screen.set_clip(None)
 
 
-# returns remaining amount of flags (total mines on grid - tiles flags)
-def get_remaining_flags():
-    flags_used = sum(sum(1 for c in row if c) for row in
-                     flagged)  # calculate the number of flags used by counting the flags currently placed
-    return counter_value - flags_used  # subtract the flags used from the total flags set by the user at the beggining of the program.
+# Pan the board with the arrow keys / WASD (called once per frame while a board is shown)
+def update_viewport_pan(dt):
+    keys = pygame.key.get_pressed()
+    dx = (keys[pygame.K_RIGHT] or keys[pygame.K_d]) - (keys[pygame.K_LEFT] or keys[pygame.K_a])
+    dy = (keys[pygame.K_DOWN] or keys[pygame.K_s]) - (keys[pygame.K_UP] or keys[pygame.K_w])
+    if dx or dy:
+        viewport.pan(dx * PAN_SPEED * dt, dy * PAN_SPEED * dt)
 
 
-# True while cell is inside the 10x10 grid
-def in_bounds(r, c):
-    return 0 <= r < GRID_SIZE and 0 <= c < GRID_SIZE
+# Place or remove a flag, keeping the flag count in sync
+def set_flag(row, col, value):
+    global flags_placed
+    if flagged[row][col] != value:
+        flagged[row][col] = value
+        flags_placed += 1 if value else -1
 
 
-# Use a matrix of adjacent-mine counts for each cell to show numbers and decide how far to auto-reveal
-def compute_counts(grid):
-    counts = [[0] * GRID_SIZE for _ in range(GRID_SIZE)]  # check for nerby 0s
-    for r in range(GRID_SIZE):
-        for c in range(GRID_SIZE):
-            if grid[r][c] == MINE:  # check for nearby mines to know if its a 0
-                counts[r][c] = -1
-                continue
-            n = 0
-            for dr, dc in DIRS8:  # code that only runs if the num is a 0
-                nr, nc = r + dr, c + dc
-                if in_bounds(nr, nc) and grid[nr][nc] == MINE:
-                    n += 1
-            counts[r][c] = n
-    return counts
-
-
-# Ensures the player clicks on a blank space, and if not, regenerates the board until that space is blank
-def ensure_first_click_safe(fr, fc, grid):
-    # allows usage of global variables
-    global counts, squarePickList
-
-    # while the grid the player clicks on does not contain a mine and is not bordering any mines
-    while not ((grid[fr][fc] != MINE) and (counts[fr][fc] == 0)):
-        print("Generate board")
-
-        # reset the grid
-        for r in range(GRID_SIZE):
-            for c in range(GRID_SIZE):
-                grid[r][c] = 0
-
-        # resets pick list
-        squarePickList = [i for i in range(GRID_SIZE * GRID_SIZE)]
-
-        # code from the main loop for board generation, just done again
-        for i in range(counter_value):
-            # pick a random value
-            randomIndex = random.randrange(len(squarePickList))
-            # remove it so it doesn't get picked again
-            randomValue = squarePickList.pop(randomIndex)
-            # extract the row and column
-            row = randomValue % 10
-            column = randomValue // 10
-            # print("Row: " , row, " - Coloumn: ", column, " - Item: " , i+1, " - Deleted: " , randomValue, " - Deleted2: " , squarePickList[randomValue-i])
-            # mark the item as a mine
-            grid[row][column] = int(3)
-
-        # Compute numbers for drawing/reveal logic
-        counts = compute_counts(grid)
-
-        # print(grid)
-
-        print(grid)
-
-    return
-
-
-# Reveal the starting cell if its count is 0, breadth-first reveal adjacent zeros and border numbers.
-def flood_reveal(sr, sc, grid, counts, revealed, flagged):
-    # exit if the tile is already revealed or flagged
-    if revealed[sr][sc] or flagged[sr][sc]:
-        return
-    # note that the tile should be counted as discoved
-    revealed[sr][sc] = True
-    # if the the tile isn't a 0, do not reveal more tiles
-    if counts[sr][sc] != 0:
-        return
-    # create a queque of surrounding tiles
-    q = deque([(sr, sc)])
-    while q:
-        # iterate until the queue is empty
-        r, c = q.popleft()
-        # Check all possible neighboring row/col locations for possible tiles
-        for dr, dc in DIRS8:
-            nr, nc = r + dr, c + dc
-            if not in_bounds(nr, nc):  # Check location is on grid, unflagged, not a mine
-                continue
-            if flagged[nr][nc] or grid[nr][nc] == MINE:
-                continue
-            if not revealed[nr][nc]:
-                revealed[nr][nc] = True
-                if counts[nr][nc] == 0:  # add found zero tiles to queue
-                    q.append((nr, nc))
-
-
-# Reveal every mine cell upon loss
-def reveal_all_mines(grid, revealed):
-    # iterate through all rows and columns
-    for r in range(GRID_SIZE):
-        for c in range(GRID_SIZE):
-            # check if its a mine
-            if grid[r][c] == MINE:
-                # reveal the mine if the user failed
-                revealed[r][c] = True
-
-
-# All non-mine tiles are revealed - win condition.
-def check_win(grid, revealed):
-    # iterate through all rows and columns
-    for r in range(GRID_SIZE):
-        for c in range(GRID_SIZE):
-            # check to see if there are any non-mines that aren't revealed
-            if grid[r][c] != MINE and not revealed[r][c]:
-                return False
-    # if theere are no tiles still needing to be uncovered than the user has won.
-    return True
+# returns remaining amount of flags (total mines on grid - tiles flags)
+def get_remaining_flags():
+    return counter_value - flags_placed  # subtract the flags used from the total flags set by the user at the beggining of the program.
+
 
 # Create 140 confetti particles for win scenario scene
 def spawn_confetti():
@@ -473,6 +517,204 @@ def draw_profile_and_info(surface):
                 score_y = name_y + 30 # Set the y position of the high score
                 surface.blit(score_surf, (score_x, score_y))
 
+def effective_generation():
+    # The generation the next game really uses: boards larger than NO_GUESS_MAX_TILES are always random
+    return generation if board_rows * board_cols <= NO_GUESS_MAX_TILES else GEN_RANDOM
+
+def current_config():
+    # The leaderboard key for the game as it is set up now
+    return config_key(board_rows, board_cols, counter_value, mode, difficulty, effective_generation())
+
+def record_game_result(won):
+    # Record a finished game on the leaderboard (call after the timer stops) and return its score (0 for a loss)
+    score = compute_score(counter_value, game_time.get_elapsed_time_ms()) if won else 0
+    username = auth.get_username() if auth.is_logged_in() else None
+    leaderboard.record(current_config(), username, won, game_time.get_elapsed_time_ms(), score)
+    game_log.end_game(RESULT_WIN if won else RESULT_LOSS, game_time.get_elapsed_time_ms())
+    # A finished game can't be resumed
+    discard_saved_game()
+    profiling.mark("game-end")
+    return score
+
+def record_move(actor, action, row, col):
+    # Log a move, mark the part of the save it changes and tell the AI about it
+    global save_pending
+    game_log.move(actor, action, row, col)
+    save_tiles["revealed" if action == ACTION_REVEAL else "flagged"] = None
+    save_pending = True
+    # The AI catches up with the moves it didn't make itself instead of rescanning the board
+    if ai is not None:
+        ai.note_move(row, col)
+
+def place_first_click_board(row, col):
+    # Put the mines down for a first click on (row, col): a board from the pool if one fits the click, otherwise one
+    # built from the game's seed on a worker thread, since no-guess and big boards can take a second or more.
+    # Returns True if the board is in place; if not, finish_board_build puts it there once it is built.
+    global grid, counts, game_seed, board_build
+    pooled = board_pool.take(board_rows, board_cols, counter_value, effective_generation(), row, col)
+    if pooled is not None:
+        grid, counts, game_seed = pooled.grid, pooled.counts, pooled.seed
+        game_log.pooled_board(pooled.seed, pooled.anchor_row, pooled.anchor_col, pooled.symmetry)
+        return True
+    # Same generator calls the game log replays from the seed
+    board_build = BoardBuild(board_rows, board_cols, counter_value, effective_generation(), game_seed, row, col)
+    # Most boards are built well within a frame, so give it that long before showing the board as still being built
+    return finish_board_build(BOARD_BUILD_WAIT)
+
+def finish_board_build(timeout=0.0):
+    # Put the first click's board in place once its worker thread is done. Returns True if it was.
+    global grid, counts, board_build
+    if board_build is None or not board_build.wait(timeout):
+        return False
+    grid, counts = board_build.grid, board_build.counts
+    board_build = None
+    return True
+
+def start_played_game():
+    # The first click's board is in place: the game starts for real
+    global first_click_done, ai, hidden_safe
+    first_click_done = True
+    hidden_safe = board_rows * board_cols - counter_value
+    # Remake the ai object with the new board
+    ai = ai_solver(difficulty, grid, counts, revealed, flagged)
+    # Start the game timer
+    game_time.start()
+
+def reveal_tiles(cells, actor):
+    # Reveal one click's or one chord's tiles as a single batch: one sound, and win/loss checked once at the end.
+    # Returns True if anything was revealed (or will be, once the first click's board is built).
+    global pending_reveal
+    if pending_reveal is not None:  # the first click's board is still being built
+        return False
+    cells = [(row, col) for row, col in cells if not revealed[row][col] and not flagged[row][col]]
+    if not cells:
+        return False
+    for row, col in cells:
+        record_move(actor, ACTION_REVEAL, row, col)
+    if not first_click_done:  # Ensure a mine isn't initially clicked (and, for no-guess boards, that no guess is needed)
+        if not place_first_click_board(cells[0][0], cells[0][1]):
+            # The main loop finishes the click when the board is ready (see finish_pending_reveal)
+            pending_reveal = cells
+            return True
+        start_played_game()
+    apply_reveal(cells)
+    return True
+
+def finish_pending_reveal():
+    # Finish a first click whose board was being built on a worker thread, once it is ready
+    global pending_reveal
+    if pending_reveal is not None and finish_board_build():
+        cells, pending_reveal = pending_reveal, None
+        start_played_game()
+        apply_reveal(cells)
+
+def apply_reveal(cells):
+    # Reveal the tiles on the placed board and end the game if it was won or lost
+    global state, show_high_score_notification, notification_start_time, hidden_safe
+    opened, exploded, won = reveal_cells(cells, grid, counts, revealed, flagged, hidden_safe)
+    hidden_safe -= opened
+    if exploded:  # Check for loss (reveal_cells already revealed every mine)
+        sfx.play_loss()
+        state = LOSE
+        # Stop the game timer
+        game_time.stop()
+        record_game_result(False)
+        return
+    sfx.play_square_revealed()
+    if won:  # Check win condition
+        state = WIN
+        sfx.play_win()
+        start_confetti() # add confetti animation
+        # Stop the game timer
+        game_time.stop()
+        # Record the game on the leaderboard and get its score
+        score = record_game_result(True)
+        # Update the high score (only for logged-in users since they have a high score and guest doesn't)
+        if auth.is_logged_in() and score > 0:
+            # Check if the score is a new high score
+            if auth.set_high_score(score):
+                # Show notification if it's a new high score (for 3s)
+                show_high_score_notification = True # Global toggle
+                # Set the notification start time to the current time
+                notification_start_time = pygame.time.get_ticks()
+
+def autosave():
+    # Hand the current game to the background saver. Only the tile snapshots a move changed are retaken.
+    global save_pending, saved_game_available
+    save_pending = False
+    mines = save_tiles.get("mines")
+    if mines is None:
+        mines = snapshot_rows(grid)
+        if first_click_done:
+            save_tiles["mines"] = mines  # mines never move after the first click
+    for key, rows in (("revealed", revealed), ("flagged", flagged)):
+        if save_tiles.get(key) is None:
+            save_tiles[key] = snapshot_rows(rows)
+    game_saver.save(SavedGame(board_rows, board_cols, counter_value, mode, difficulty, first_click_done, player_turn,
+                              game_time.get_elapsed_time_ms(), game_seed, mines, save_tiles["revealed"],
+                              save_tiles["flagged"], effective_generation()))
+    saved_game_available = True
+
+def discard_saved_game():
+    global save_pending, saved_game_available
+    save_pending = False
+    saved_game_available = False
+    save_tiles.clear()
+    game_saver.delete()
+
+def resume_game():
+    # Put the saved game back on the board. Returns False if there is no usable save.
+    # (Resumed games are not written to the game log, since their moves so far aren't in it.)
+    global grid, revealed, flagged, counts, flags_placed, board_rows, board_cols, board_size_index, counter_value
+    global mode, difficulty, first_click_done, player_turn, ai, game_seed, generation, hidden_safe
+    saved = load_game(SAVE_GAME_PATH)
+    if saved is None:
+        return False
+    board_rows, board_cols, counter_value = saved.rows, saved.cols, saved.mines
+    mode, difficulty, generation = saved.mode, saved.difficulty, saved.generation
+    generation_button.text = generation
+    for index, (size, _) in enumerate(BOARD_SIZES):
+        if size == board_rows:
+            board_size_index = index
+    board_size_button.text = f"{board_rows} x {board_cols}"
+    grid, revealed, flagged = saved.grid(), saved.revealed(), saved.flagged()
+    counts = compute_counts(grid)
+    flags_placed = sum(map(sum, flagged))
+    hidden_safe = count_hidden_safe(grid, revealed)
+    viewport.set_board_size(board_rows, board_cols)
+    first_click_done = saved.first_click_done
+    player_turn = saved.player_turn
+    game_seed = saved.seed
+    ai = ai_solver(difficulty, grid, counts, revealed, flagged) if mode in (AI_AUTOMATIC, AI_INTERACTIVE) else None
+    game_time.reset()
+    if first_click_done:
+        game_time.start(saved.elapsed_ms)
+    save_tiles.clear()
+    return True
+
+def draw_leaderboard(surface, x, y):
+    # Draw the top scores for the selected configuration. The lines are rendered once and reused until the
+    # configuration, the standings, the user or the theme change, so the menu never queries per frame.
+    key = current_config()
+    username = auth.get_username() if auth.is_logged_in() else None
+    text_color = get_current_theme()['text']
+    cache_key = (key, leaderboard.version, username, text_color)
+    if leaderboard_cache["key"] != cache_key:
+        lines = [f"Top scores ({board_rows}x{board_cols}, {counter_value} mines)"]
+        top = leaderboard.top(key, LEADERBOARD_SIZE)
+        for place, (name, score) in enumerate(top, start=1):
+            lines.append(f"{place}. {name}  {score}")
+        if not top:
+            lines.append("No wins yet")
+        # Show the user's own rank if they aren't already on the list
+        rank = leaderboard.rank(key, username) if username else None
+        if rank is not None and rank > LEADERBOARD_SIZE:
+            lines.append(f"You: #{rank}  {leaderboard.best(key, username)}")
+        leaderboard_cache["key"] = cache_key
+        leaderboard_cache["surfaces"] = [tiny_font.render(line, True, text_color) for line in lines]
+    for i, line_surf in enumerate(leaderboard_cache["surfaces"]):
+        surface.blit(line_surf, (x, y + i * 20))
+
 def draw_high_score_notification(surface):
     # Draw a green notification box for new high score
     message = "New High Score!"
@@ -494,605 +736,730 @@ def draw_high_score_notification(surface):
         (WIDTH // 2 - message_surface.get_width() // 2, box_y + 20)
     )
 
-# Main Game Loop
-setup_grid() # Setup the grid
-sfx.start_bgmusic()
+# Build the startup manifest: sprites first, then the profile picture, then sound effects, then music
+def build_asset_loader():
+    loader = AssetLoader()
+    loader.add("sprites", PRIORITY_SPRITES, decode_sprites, install_sprites)
+
+    def set_profile(prepared):
+        global profile_surface
+        profile_surface = profile_to_surface(prepared)
+    profile_path = resolve_profile_path()
+    loader.add("profile", PRIORITY_PROFILE, lambda: prepare_circular_profile(profile_path, PROFILE_DIAMETER), set_profile)
+
+    # Sounds aren't needed for the menu, so they keep loading after it is up (required=False)
+    if sfx.enabled:
+        for name, path in sfx.effect_paths():
+            loader.add(name, PRIORITY_SOUND_EFFECTS, lambda path=path: load_sound(path),
+                       lambda sound, name=name: sfx.set_effect(name, sound), required=False)
+
+        def start_music(_):
+            sfx.load_music()
+            sfx.start_bgmusic()
+        # Music is streamed, so there is nothing to decode up front; it is just opened and started last
+        loader.add("music", PRIORITY_MUSIC, lambda: True, start_music, required=False)
+    return loader
+
+
+# Progress screen shown while the required assets load. Returns False if the window was closed.
+def run_loading_screen(loader):
+    while not loader.required_done():
+        clock.tick(60)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+        loader.poll()
 
-# Load user's theme preference
-load_user_theme()
+        screen.fill(get_current_theme()['background'])
+        title_surf = font.render("Minesweeper", True, get_current_theme()['text'])
+        screen.blit(title_surf, (WIDTH // 2 - title_surf.get_width() // 2, HEIGHT // 2 - 80))
+
+        # Progress bar
+        bar_w, bar_h = 300, 20
+        bar_x, bar_y = WIDTH // 2 - bar_w // 2, HEIGHT // 2
+        fraction = loader.loaded / loader.total if loader.total else 1
+        pygame.draw.rect(screen, get_current_theme()['grid_tile'], (bar_x, bar_y, bar_w, bar_h), border_radius=6)
+        pygame.draw.rect(screen, GREEN, (bar_x, bar_y, int(bar_w * fraction), bar_h), border_radius=6)
+        loading_surf = small_font.render("Loading...", True, get_current_theme()['text'])
+        screen.blit(loading_surf, (WIDTH // 2 - loading_surf.get_width() // 2, bar_y + 30))
+        pygame.display.flip()
+    return True
 
-running = True
 
-while running:
-    dt = clock.tick(60) / 1000.0 # seconds since last frame
+# Main Game Loop
+def main(frame_hook=None, fps=FPS, ai_delay=AI_MOVE_DELAY):
+    # The main loop keeps the game's state in module globals so the helper functions above can see it.
+    # frame_hook (used by headless_runner.py) is called at the start of every frame, before events are read, and
+    # can post events for the frame to handle; fps=0 runs uncapped; ai_delay is the pause before each AI move.
+    global screen, clock, sfx, font, small_font, tiny_font
+    global state, counter_value, difficulty, mode, ai, player_turn, counts, first_click_done
+    global show_high_score_notification, notification_start_time, profile_surface
+    global signup_input, setpfp_input, setpfp_error, pfp_import, profile_load, board_size_index, board_rows, board_cols, game_seed
+    global saved_game_available, generation
+
+    open_player_data()
+
+    # Bring the window up first; everything else is decoded by the asset loader behind a progress screen
+    screen = app.get_screen()
+    clock = app.get_clock()
+    font, small_font, tiny_font = app.get_fonts()
+    # Load user's theme preference
+    load_user_theme()
+
+    # Only start the mixer here; the sounds and music are handed to it by the loader
+    sfx = app.get_sfx(load_sounds=False)
+    loader = build_asset_loader()
+    loader.start()
+    if not run_loading_screen(loader):
+        profiling.mark("exit")
+        pygame.quit()
+        return
 
-    # Fill background with theme color every frame
-    screen.fill(get_current_theme()['background'])
+    setup_grid() # Setup the grid
+    profiling.mark("startup-end")
 
-    # Handle AI updates outside the user input processing and response loop
-    draw_sfx_info(screen)
-    if state == PLAYING:
-        # --- AI MOVE (automatic or interactive) ---
-        if ai and not player_turn:
-            sleep(0.5)
-            row, col, action = ai.make_move()
-            if row is not None and col is not None:
-                if action == "reveal":
-                    if not flagged[row][col] and not revealed[row][col]:
-                        if not first_click_done:  # Ensure a mine isn't initially clicked
-                            ensure_first_click_safe(row, col, grid)
-                            sfx.play_square_revealed()
-                            counts = compute_counts(grid)
-                            first_click_done = True
-                            # Remake the ai object with the new board
-                            ai = ai_solver(difficulty, grid, counts, revealed, flagged)
-                            # Start the game timer
-                            game_time.start()
-                        if grid[row][col] == MINE:  # Check for loss
-                            sfx.play_loss()
-                            revealed[row][col] = True
-                            reveal_all_mines(grid, revealed)  # reveal all mines on loss
-                            state = LOSE
-                            # Stop the game timer
-                            game_time.stop()
-                        else:  # Check win condition
-                            sfx.play_square_revealed()
-                            flood_reveal(row, col, grid, counts, revealed, flagged)
-                            revealed[row][col] = True
-                            if check_win(grid, revealed):
-                                state = WIN
-                                sfx.play_win()
-                                start_confetti() # add confetti animation
-                                # Stop the game timer
-                                game_time.stop()
-                                # Calculate and update high score (only for logged-in users since they have a high score and guest doesn't)
-                                if auth.is_logged_in():
-                                    # Get the elapsed time in seconds
-                                    elapsed_seconds = game_time.get_elapsed_time_seconds()
-                                    # Avoid division by zero
-                                    if elapsed_seconds > 0:
-                                        # Calculate the score
-                                        score = (counter_value * 1000) // elapsed_seconds  # Higher score = better
-                                        # Check if the score is a new high score
-                                        is_new_high = auth.set_high_score(score)
-                                        # Show notification if it's a new high score
-                                        if is_new_high:
-                                            # Show notification if it's a new high score (for 3s)
-                                            show_high_score_notification = True # Global toggle
-                                            # Set the notification start time to the current time
-                                            notification_start_time = pygame.time.get_ticks()
-                elif action == "flag":
-                    if not revealed[row][col]:
-                        if flagged[row][col]:
-                            sfx.play_flag_popped()
-                            flagged[row][col] = False
-                        elif get_remaining_flags() > 0:
-                            sfx.play_flag_placed()
-                            flagged[row][col] = True  # flag only if flags remain
-            if mode == AI_INTERACTIVE and action != "flag":
-                # In AUTOMATIC, keep player_turn = False so the AI moves again next frame.
-                # Also, since flags don't count as moves, don't progress to the next turn if the action
-                # taken was to place a flag.
-                player_turn = True
-
-    # Handle events/inputs
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:  # Close window
-            running = False
-        if skip_button.is_clicked(event):
-            sfx.change_song()
-        elif mute_button.is_clicked(event):
-            if sfx.enabled:
-                if not sfx.muted:
-                    mute_button.text = "Unmute"
-                    sfx.music_channel.set_volume(0)
-                    sfx.muted = True
-                else:
-                    mute_button.text = "Mute"
-                    sfx.music_channel.set_volume(0.1)
-                    sfx.muted = False
+    running = True
 
-        # MENU state logic
-        if state == MENU:
-            sfx.stop_sfx()
-            if start_button.is_clicked(event):
-                sfx.play_square_revealed()
-                state = PLAYING
-                # Reset high score notification when starting new game
-                show_high_score_notification = False
-                # Reset the game timer
-                game_time.reset()
-                # Add the game code here, or a call to some other module
-                print("Generate board")
-
-                for i in range(counter_value):
-                    # pick a random value
-                    randomIndex = random.randrange(len(squarePickList))
-                    # remove it so it doesn't get picked again
-                    randomValue = squarePickList.pop(randomIndex)
-                    # extract the row and column
-                    row = randomValue % 10
-                    column = randomValue // 10
-                    # print("Row: " , row, " - Coloumn: ", column, " - Item: " , i+1, " - Deleted: " , randomValue, " - Deleted2: " , squarePickList[randomValue-i])
-                    # mark the item as a mine
-                    grid[row][column] = int(3)
-
-                # Compute numbers for drawing/reveal logic
-                counts = compute_counts(grid)
-                first_click_done = False
-
-                # Define AI & turn order
-                ai = None
-                player_turn = True
-
-                # If an AI mode is selected, make a solver instance
-                if mode == AI_AUTOMATIC or mode == AI_INTERACTIVE:
-                    ai = ai_solver(difficulty, grid, counts, revealed, flagged)
-                    if mode == AI_AUTOMATIC:
-                        player_turn = False
-
-                # print(grid)
-                print(grid)
-
-                # generate a list of squares that can be chosen
-
-
-            # logged-in only: change pfp
-            elif auth.is_logged_in() and change_pfp_button.is_clicked(event):
-                state = "set_pfp"  # path input state
-                setpfp_input = ""
-            # logged-in only: logout
-            elif auth.is_logged_in() and logout_button.is_clicked(event):
-                auth.logout()
-                profile_surface = load_circular_profile(resolve_profile_path(), PROFILE_DIAMETER)
-            # logged-out only: sign in or create
-            elif (not auth.is_logged_in()) and sign_in_create_button.is_clicked(event):
-                state = "signup"  # username input state
-                signup_input = ""
-            # quit the game if the user presses quit
-            elif quit_button.is_clicked(event):
-                running = False  # Quit game
-
-            elif plus_button.is_clicked(event):
-                # check that the user doens't have more than the max bombs (20)
-                if (counter_value < 20):
-                    counter_value += 1  # Increase # bombs in menu
-
-            elif minus_button.is_clicked(event):
-                # check that the user doens't have less than the min bombs (10)
-                if (counter_value > 10):
-                    counter_value -= 1  # Decrease # bombs in menu
-
-            elif settings_button.is_clicked(event):
-                state = "settings"
+    while running:
+        profiler.begin_frame()
+        dt = clock.tick(fps) / 1000.0 # seconds since last frame
+        profiler.mark("tick")
+        if frame_hook is not None:
+            frame_hook()
 
-        elif state == "settings":
-            if easy_button.is_clicked(event):
-                difficulty = EASY
-            if medium_button.is_clicked(event):
-                difficulty = MEDIUM
-            if hard_button.is_clicked(event):
-                difficulty = HARD
-            if mode_interactive_button.is_clicked(event):
-                mode = AI_INTERACTIVE
-            if mode_automatic_button.is_clicked(event):
-                mode = AI_AUTOMATIC
-            if mode_manual_button.is_clicked(event):
-                mode = AI_MANUAL
-            if dark_mode_button.is_clicked(event):
-                switch_theme("dark")
-                auth.set_theme_preference("dark")
-                update_theme_button_styles()
-            if light_mode_button.is_clicked(event):
-                switch_theme("light")
-                auth.set_theme_preference("light")
-                update_theme_button_styles()
-            if settings_continue_button.is_clicked(event):
-                state = MENU
+        # Install any sounds/music the loader finished since the last frame
+        if not loader.done():
+            loader.poll()
 
-        # PLAYING state logic
-        elif state == PLAYING:
-            # --- PLAYER INPUT ---
-            if event.type == pygame.MOUSEBUTTONDOWN and mode != AI_AUTOMATIC:
-                mouse_x, mouse_y = event.pos  # get coordinates of mouse
-                row, col = get_grid_pos(mouse_x, mouse_y)  # convert coordinates to grid position
-
-                if row is not None and col is not None:  # check if click is in grid
-                    if event.button == 1:  # a left click
-                        if not flagged[row][col]:  # can't reveal a flagged tile
-                            if revealed[row][col]:
-                                # already revealed, ignore this click entirely
-                                continue
-                            if not first_click_done:  # Ensure a mine isn't initially clicked
-                                ensure_first_click_safe(row, col, grid)
-                                sfx.play_square_revealed()
-                                counts = compute_counts(grid)
-                                first_click_done = True
-                                # Remake the ai object with the new board
-                                ai = ai_solver(difficulty, grid, counts, revealed, flagged)
-                                # Start the game timer
-                                game_time.start()
-                            if grid[row][col] == MINE:  # Check for loss
-                                sfx.play_loss()
-                                revealed[row][col] = True
-                                reveal_all_mines(grid, revealed)  # reveal all mines on loss
-                                state = LOSE
-                                # Stop the game timer
-                                game_time.stop()
-                            else:  # Check win condition
-                                sfx.play_square_revealed()
-                                flood_reveal(row, col, grid, counts, revealed, flagged)
-                                revealed[row][col] = True
-                                if check_win(grid, revealed):
-                                    state = WIN
-                                    sfx.play_win()
-                                    start_confetti() # add confetti animation
-                                    # Stop the game timer
-                                    game_time.stop()
-                                    # Calculate and update high score (only for logged-in users since they have a high score and guest doesn't)
-                                    if auth.is_logged_in():
-                                        # Get the elapsed time in seconds
-                                        elapsed_seconds = game_time.get_elapsed_time_seconds()
-                                        # Avoid division by zero
-                                        if elapsed_seconds > 0:
-                                            # Calculate the score
-                                            score = (counter_value * 1000) // elapsed_seconds  # Higher score = better
-                                            # Check if the score is a new high score
-                                            is_new_high = auth.set_high_score(score)
-                                            # Show notification if it's a new high score
-                                            if is_new_high:
-                                                # Show notification if it's a new high score (for 3s)
-                                                show_high_score_notification = True # Global toggle
-                                                # Set the notification start time to the current time
-                                                notification_start_time = pygame.time.get_ticks()
-                            if mode == AI_INTERACTIVE:
-                                player_turn = False
-                    elif event.button == 3:  # a right click
-                        # check that the flagged tile isn't revealed
+        # Keep boards ready for the game the menu is set up for, until its first click takes one (or misses the pool
+        # and has a board built for it). Not while the settings screen is open: the board size and mode change there,
+        # and the pool waits for the mine count to stay put (see BoardPool.want)
+        if state == MENU or (state == PLAYING and not first_click_done and pending_reveal is None):
+            board_pool.want(board_rows, board_cols, counter_value, effective_generation())
+        else:
+            board_pool.want()
+
+        # Finish the first click once its board is built
+        if pending_reveal is not None:
+            finish_pending_reveal()
+
+        # Finish a profile picture import once its worker thread is done
+        if pfp_import is not None and pfp_import.done():
+            if pfp_import.result:
+                # Set the user's profile picture path
+                auth.set_pfp_path(pfp_import.result)
+                # Show the picture the worker already prepared
+                profile_surface = profile_to_surface(pfp_import.prepared)
+                profile_load = None  # an older load must not replace it
+                state = MENU
+                setpfp_error = ""  # clear any previous error on success
+            else:
+                # Show an error and stay on this screen
+                setpfp_error = "Invalid path or unreadable image. Try again or press 0 to go back."
+            pfp_import = None
+
+        # Show the picture of a user who signed in or out once its worker thread is done
+        if profile_load is not None and profile_load.done():
+            profile_surface = profile_to_surface(profile_load.prepared)
+            profile_load = None
+
+        # Fill background with theme color every frame
+        screen.fill(get_current_theme()['background'])
+
+        # Handle AI updates outside the user input processing and response loop
+        profiler.mark("other")
+        draw_sfx_info(screen)
+        profiler.mark("draw_sfx_info")
+        if state == PLAYING:
+            # --- AI MOVE (automatic or interactive) ---
+            if ai and not player_turn and pending_reveal is None:
+                sleep(ai_delay)
+                # The delay is on purpose, so it is kept out of the "ai" phase and the frame time
+                profiler.mark("ai_delay")
+                profiling.mark("ai-move")
+                row, col, action = ai.make_move()
+                if row is not None and col is not None:
+                    if action == "reveal":
+                        if flagged[row][col] and not revealed[row][col]:
+                            # Hard AI knows which tiles are safe and reveals them even when flagged, so lift the flag first
+                            set_flag(row, col, False)
+                            record_move(ACTOR_AI, ACTION_UNFLAG, row, col)
+                        reveal_tiles([(row, col)], ACTOR_AI)
+                    elif action == "flag":
                         if not revealed[row][col]:
-                            # if the user has flags flag it but if they don't have flags don't do anything
                             if flagged[row][col]:
                                 sfx.play_flag_popped()
-                                flagged[row][col] = False
+                                set_flag(row, col, False)
+                                record_move(ACTOR_AI, ACTION_UNFLAG, row, col)
                             elif get_remaining_flags() > 0:
                                 sfx.play_flag_placed()
-                                flagged[row][col] = True  # flag only if flags remain
-
-
-        # SIGNUP state
-        elif state == "signup":
-            if event.type == pygame.KEYDOWN:
-                # Submit on Enter
-                if event.key == pygame.K_RETURN:
-                    if signup_input.strip():
-                        # Issue a token for the user
-                        auth.issue_token(signup_input.strip())
-                        # Load the user's profile picture
-                        profile_surface = load_circular_profile(resolve_profile_path(), PROFILE_DIAMETER)
-                        state = MENU
-                # Go back on '0' without changes
-                elif event.key == pygame.K_0:
+                                set_flag(row, col, True)  # flag only if flags remain
+                                record_move(ACTOR_AI, ACTION_FLAG, row, col)
+                if mode == AI_INTERACTIVE and action != "flag":
+                    # In AUTOMATIC, keep player_turn = False so the AI moves again next frame.
+                    # Also, since flags don't count as moves, don't progress to the next turn if the action
+                    # taken was to place a flag.
+                    player_turn = True
+        profiler.mark("ai")
+
+        # Handle events/inputs
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:  # Close window
+                running = False
+            # Keep track of held mouse buttons (pressing left and right together chords)
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                mouse_buttons_down.add(event.button)
+            elif event.type == pygame.MOUSEBUTTONUP:
+                mouse_buttons_down.discard(event.button)
+            # Frame profiler: F3 shows/hides the timings, F4 saves them as CSV
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.overlay = not profiler.overlay
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                csv_path = os.path.join(FRAME_PROFILE_DIR, f"frames-{strftime('%Y%m%d-%H%M%S')}.csv")
+                # The result is shown in the overlay, since a windowed game has no console to print to
+                try:
+                    profiler.notify("Saved " + profiler.export_csv(csv_path))
+                except OSError as e:
+                    profiler.notify(f"Could not save frame timings: {e.strerror}")
+            if skip_button.is_clicked(event):
+                sfx.change_song()
+            elif mute_button.is_clicked(event):
+                if sfx.enabled:
+                    if not sfx.muted:
+                        mute_button.text = "Unmute"
+                        sfx.set_music_muted(True)
+                    else:
+                        mute_button.text = "Mute"
+                        sfx.set_music_muted(False)
+
+            # MENU state logic
+            if state == MENU:
+                sfx.stop_sfx()
+                if start_button.is_clicked(event):
+                    sfx.play_square_revealed()
+                    state = PLAYING
+                    # Reset high score notification when starting new game
+                    show_high_score_notification = False
+                    # Reset the game timer
+                    game_time.reset()
+                    # Seed this game's mines so the game log can rebuild the board. The mines are put down by the
+                    # first click (see place_first_click_board), usually from the board pool, so the board stays
+                    # empty until then.
+                    game_seed = random.getrandbits(32)
+                    save_tiles.clear()
+                    game_log.start_game(game_seed, board_rows, board_cols, counter_value, mode, difficulty,
+                                        auth.get_username() if auth.is_logged_in() else "", effective_generation())
+                    profiling.mark("game-begin")
+                    first_click_done = False
+
+                    # Define AI & turn order
+                    ai = None
+                    player_turn = True
+
+                    # If an AI mode is selected, make a solver instance
+                    if mode == AI_AUTOMATIC or mode == AI_INTERACTIVE:
+                        ai = ai_solver(difficulty, grid, counts, revealed, flagged)
+                        if mode == AI_AUTOMATIC:
+                            player_turn = False
+
+                    # generate a list of squares that can be chosen
+
+                # Resume the saved game
+                elif saved_game_available and resume_button.is_clicked(event):
+                    if resume_game():
+                        sfx.play_square_revealed()
+                        state = PLAYING
+                        profiling.mark("game-begin")
+                        show_high_score_notification = False
+                    else:
+                        # The save is missing or unreadable
+                        saved_game_available = False
+
+                # logged-in only: change pfp
+                elif auth.is_logged_in() and change_pfp_button.is_clicked(event):
+                    state = "set_pfp"  # path input state
+                    setpfp_input = ""
+                # logged-in only: logout
+                elif auth.is_logged_in() and logout_button.is_clicked(event):
+                    auth.logout()
+                    # Load the guest picture on a worker thread
+                    start_profile_load()
+                # logged-out only: sign in or create
+                elif (not auth.is_logged_in()) and sign_in_create_button.is_clicked(event):
+                    state = "signup"  # username input state
+                    signup_input = ""
+                # quit the game if the user presses quit
+                elif quit_button.is_clicked(event):
+                    running = False  # Quit game
+
+                elif plus_button.is_clicked(event):
+                    # check that the user doens't have more than the max bombs (20 on the 10x10 board)
+                    if (counter_value < get_max_mines()):
+                        counter_value = min(get_max_mines(), counter_value + get_mine_step())  # Increase # bombs in menu
+
+                elif minus_button.is_clicked(event):
+                    # check that the user doens't have less than the min bombs (10)
+                    if (counter_value > MIN_MINES):
+                        counter_value = max(MIN_MINES, counter_value - get_mine_step())  # Decrease # bombs in menu
+
+                elif settings_button.is_clicked(event):
+                    state = "settings"
+
+            elif state == "settings":
+                if easy_button.is_clicked(event):
+                    difficulty = EASY
+                if medium_button.is_clicked(event):
+                    difficulty = MEDIUM
+                if hard_button.is_clicked(event):
+                    difficulty = HARD
+                if mode_interactive_button.is_clicked(event):
+                    mode = AI_INTERACTIVE
+                if mode_automatic_button.is_clicked(event):
+                    mode = AI_AUTOMATIC
+                if mode_manual_button.is_clicked(event):
+                    mode = AI_MANUAL
+                if dark_mode_button.is_clicked(event):
+                    switch_theme("dark")
+                    auth.set_theme_preference("dark")
+                    update_theme_button_styles()
+                if light_mode_button.is_clicked(event):
+                    switch_theme("light")
+                    auth.set_theme_preference("light")
+                    update_theme_button_styles()
+                if board_size_button.is_clicked(event):
+                    # cycle to the next board size and start from its default mine count
+                    board_size_index = (board_size_index + 1) % len(BOARD_SIZES)
+                    size, counter_value = BOARD_SIZES[board_size_index]
+                    board_rows, board_cols = size, size
+                    board_size_button.text = f"{size} x {size}"
+                    setup_grid()
+                if generation_button.is_clicked(event):
+                    # switch between random and no-guess boards
+                    generation = GEN_NO_GUESS if generation == GEN_RANDOM else GEN_RANDOM
+                    generation_button.text = generation
+                if settings_continue_button.is_clicked(event):
                     state = MENU
-                # Backspace
-                elif event.key == pygame.K_BACKSPACE:
-                    signup_input = signup_input[:-1]
-                # Regular character input
-                else:
-                    if event.unicode.isprintable():
-                        # Add the input to the buffer
-                        signup_input += event.unicode
 
-        # SET_PFP state
-        elif state == "set_pfp":
-            if event.type == pygame.KEYDOWN:
-                # Submit on Enter
-                if event.key == pygame.K_RETURN:
-                    # Save the user's profile picture under a username-specific filename
-                    username = auth.get_username() or "guest"
-                    saved = save_profile_image(setpfp_input.strip(), username)
-                    if saved:
-                        # Set the user's profile picture path
-                        auth.set_pfp_path(saved)
-                        # Load the user's profile picture
-                        profile_surface = load_circular_profile(resolve_profile_path(), PROFILE_DIAMETER)
+            # PLAYING state logic
+            elif state == PLAYING:
+                # Mouse wheel zooms the board around the cursor
+                if event.type == pygame.MOUSEWHEEL:
+                    viewport.zoom_at(event.y, pygame.mouse.get_pos())
+                # --- PLAYER INPUT ---
+                if event.type == pygame.MOUSEBUTTONDOWN and mode != AI_AUTOMATIC:
+                    mouse_x, mouse_y = event.pos  # get coordinates of mouse
+                    row, col = get_grid_pos(mouse_x, mouse_y)  # convert coordinates to grid position
+
+                    if row is not None and col is not None:  # check if click is in grid
+                        if event.button == 2 or (event.button in (1, 3) and {1, 3} <= mouse_buttons_down):
+                            # a middle click or both buttons: chord (reveal the neighbors of a fully flagged number)
+                            if reveal_tiles(chord_cells(row, col, counts, revealed, flagged), ACTOR_PLAYER):
+                                if mode == AI_INTERACTIVE:
+                                    player_turn = False
+                        elif event.button == 1:  # a left click
+                            # can't reveal a flagged tile, and an already revealed one ignores the click entirely
+                            if reveal_tiles([(row, col)], ACTOR_PLAYER):
+                                if mode == AI_INTERACTIVE:
+                                    player_turn = False
+                        elif event.button == 3:  # a right click
+                            # check that the flagged tile isn't revealed
+                            if not revealed[row][col]:
+                                # if the user has flags flag it but if they don't have flags don't do anything
+                                if flagged[row][col]:
+                                    sfx.play_flag_popped()
+                                    set_flag(row, col, False)
+                                    record_move(ACTOR_PLAYER, ACTION_UNFLAG, row, col)
+                                elif get_remaining_flags() > 0:
+                                    sfx.play_flag_placed()
+                                    set_flag(row, col, True)  # flag only if flags remain
+                                    record_move(ACTOR_PLAYER, ACTION_FLAG, row, col)
+
+
+            # SIGNUP state
+            elif state == "signup":
+                if event.type == pygame.KEYDOWN:
+                    # Submit on Enter
+                    if event.key == pygame.K_RETURN:
+                        if signup_input.strip():
+                            # Issue a token for the user
+                            auth.issue_token(signup_input.strip())
+                            # Load the user's profile picture on a worker thread
+                            start_profile_load()
+                            state = MENU
+                    # Go back on '0' without changes
+                    elif event.key == pygame.K_0:
+                        state = MENU
+                    # Backspace
+                    elif event.key == pygame.K_BACKSPACE:
+                        signup_input = signup_input[:-1]
+                    # Regular character input
+                    else:
+                        if event.unicode.isprintable():
+                            # Add the input to the buffer
+                            signup_input += event.unicode
+
+            # SET_PFP state
+            elif state == "set_pfp" and pfp_import is None:  # ignore typing while an import is running
+                if event.type == pygame.KEYDOWN:
+                    # Submit on Enter
+                    if event.key == pygame.K_RETURN:
+                        # Import the user's profile picture under a username-specific filename on a worker thread
+                        # (finished at the top of the main loop)
+                        username = auth.get_username() or "guest"
+                        pfp_import = ProfileImport(setpfp_input.strip(), username,
+                                                   lambda path: prepare_circular_profile(path, PROFILE_DIAMETER))
+                    # Go back on '0'
+                    elif event.key == pygame.K_0:
                         state = MENU
-                        setpfp_error = ""  # clear any previous error on success
+                    # Backspace
+                    elif event.key == pygame.K_BACKSPACE:
+                        setpfp_input = setpfp_input[:-1]
+                    # Regular character input (clear error when typing)
                     else:
-                        # Show an error and stay on this screen
-                        setpfp_error = "Invalid path or unreadable image. Try again or press 0 to go back."
-                # Go back on '0'
-                elif event.key == pygame.K_0:
+                        if event.unicode.isprintable():
+                            setpfp_input += event.unicode
+                            setpfp_error = ""
+
+            # WIN and LOSE state logic
+            elif state in [WIN, LOSE]:
+                # The finished board can still be zoomed to look around
+                if event.type == pygame.MOUSEWHEEL:
+                    viewport.zoom_at(event.y, pygame.mouse.get_pos())
+                # check for win/lose everythime the user clicks (no need to waste resources as the board state only changes when clicks occur)
+                # (buttons 4/5 are the mouse wheel, which should not leave the board)
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button not in (4, 5):
                     state = MENU
-                # Backspace
-                elif event.key == pygame.K_BACKSPACE:
-                    setpfp_input = setpfp_input[:-1]
-                # Regular character input (clear error when typing)
-                else:
-                    if event.unicode.isprintable():
-                        setpfp_input += event.unicode
-                        setpfp_error = ""
 
-        # WIN and LOSE state logic
-        elif state in [WIN, LOSE]:
-            # check for win/lose everythime the user clicks (no need to waste resources as the board state only changes when clicks occur)
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                state = MENU
+                    # reset the grid, flags and mine counts back to the original state
+                    setup_grid()
 
-                # reset the grid back to the original state
-                for i in range(10):
-                    for j in range(10):
-                        grid[i][j] = 0
-                        revealed[i][j] = False
-                        flagged[i][j] = False
+                    # Reset first click check
+                    first_click_done = False
 
-                # reset the pick list
-                squarePickList = [0 for i in range(100)]
-                for i in range(100):
-                    squarePickList[i] = i
+                    # Reset the game timer
+                    game_time.reset()
 
-                # Reset mine counts
-                counts = [[0] * GRID_SIZE for _ in range(GRID_SIZE)]
+                    # Reset high score notification
+                    show_high_score_notification = False
 
-                # Reset first click check
-                first_click_done = False
+                    # Code here to reset values when going back to the menu
 
-                # Reset the game timer
-                game_time.reset()
+        profiler.mark("events")
 
-                # Reset high score notification
-                show_high_score_notification = False
+        # Autosave once per frame if the player or the AI moved (written on a background thread)
+        if save_pending and state == PLAYING:
+            autosave()
+        profiler.mark("other")
 
-                # Code here to reset values when going back to the menu
-
-    # Drawing (depends on state)
-    # Where the game should be drawn, visuals and images
-    if state == MENU:
-        # Title
-        title_surf = font.render("Minesweeper", True, get_current_theme()['text'])
-        title_x = WIDTH // 2 - title_surf.get_width() // 2
-        title_y = 60
-        screen.blit(title_surf, (title_x, title_y))
-
-        # Build vertical stack of primary buttons (made it dynamic and dependent on the login state)
-        primary_buttons = [start_button]
-        # Add the settings button
-        primary_buttons.append(settings_button)
-        if auth.is_logged_in():
-            # if the user is logged in, add the change pfp and logout buttons
-            primary_buttons += [change_pfp_button, logout_button]
-        else:
-            # If the user is not logged in, add the sign in or create button
-            primary_buttons += [sign_in_create_button]
-        # Add the quit button
-        primary_buttons.append(quit_button)
-
-        # Layout values
-        stack_spacing = 18
-        # Set the top y position of the buttons
-        stack_top_y = title_y + title_surf.get_height() + 20
-        # Set the width of the buttons
-        button_width = 200
-        # Set the height of the buttons
-        button_height = 60
-        # Set the x position of the buttons
-        stack_x = WIDTH // 2 - button_width // 2
-
-        # Position buttons in a tidy vertical stack
-        current_y = stack_top_y
-        for btn in primary_buttons:
-            # Set the position of the buttons
-            btn.rect.topleft = (stack_x, current_y)
+        # Drawing (depends on state)
+        # Where the game should be drawn, visuals and images
+        if state == MENU:
+            # Title
+            title_surf = font.render("Minesweeper", True, get_current_theme()['text'])
+            title_x = WIDTH // 2 - title_surf.get_width() // 2
+            title_y = 60
+            screen.blit(title_surf, (title_x, title_y))
+
+            # Build vertical stack of primary buttons (made it dynamic and dependent on the login state)
+            primary_buttons = [start_button]
+            # Add the settings button
+            primary_buttons.append(settings_button)
+            if auth.is_logged_in():
+                # if the user is logged in, add the change pfp and logout buttons
+                primary_buttons += [change_pfp_button, logout_button]
+            else:
+                # If the user is not logged in, add the sign in or create button
+                primary_buttons += [sign_in_create_button]
+            # Add the quit button
+            primary_buttons.append(quit_button)
+
+            # Layout values
+            stack_spacing = 18
+            # Set the top y position of the buttons
+            stack_top_y = title_y + title_surf.get_height() + 20
+            # Set the width of the buttons
+            button_width = 200
+            # Set the height of the buttons
+            button_height = 60
+            # Set the x position of the buttons
+            stack_x = WIDTH // 2 - button_width // 2
+
+            # Position buttons in a tidy vertical stack
+            current_y = stack_top_y
+            for btn in primary_buttons:
+                # Set the position of the buttons
+                btn.rect.topleft = (stack_x, current_y)
+                # Set the y position of the buttons
+                current_y += button_height + stack_spacing
+
+            # Bottom controls row: center minus, counter, plus near bottom
+            bottom_margin = 20
             # Set the y position of the buttons
-            current_y += button_height + stack_spacing
-
-        # Bottom controls row: center minus, counter, plus near bottom
-        bottom_margin = 20
-        # Set the y position of the buttons
-        row_y = HEIGHT - bottom_margin - button_height // 2
-        # Set the x position of the buttons
-        side_gap = 110
-        # Set the position of the buttons
-        minus_button.rect.center = (WIDTH // 2 - side_gap, row_y)
-        # Set the position of the buttons
-        plus_button.rect.center = (WIDTH // 2 + side_gap, row_y)
-
-        # Draw buttons
-        for btn in primary_buttons:
-            # Draw the buttons
-            btn.draw(screen, small_font)
-        # Draw the minus button
-        minus_button.draw(screen, font)
-        # Draw the plus button
-        plus_button.draw(screen, font)
-
-        # Counter centered between +/-
-        counter_surf = font.render(str(counter_value), True, get_current_theme()['text'])
-        # Set the x position of the counter
-        counter_x = WIDTH // 2 - counter_surf.get_width() // 2
-        # Set the y position of the counter
-        counter_y = row_y - counter_surf.get_height() // 2
-        # Draw the counter
-        screen.blit(counter_surf, (counter_x, counter_y))
-
-        # playing status
-        playing_info = small_font.render("Current Status: MENU", True, get_current_theme()['text'])
-        screen.blit(playing_info, (10, 10))
-
-        # difficulty display
-        difficulty_setting = small_font.render(f"AI Difficulty: {difficulty.upper()}", True, get_current_theme()['text'])
-        screen.blit(difficulty_setting, (10, 200))
-
-        # mode display
-        mode_setting = small_font.render(f"AI Mode: {mode.upper()}", True, get_current_theme()['text'])
-        screen.blit(mode_setting, (10, 240))
-
-        # Profile picture, username, and high score
-        draw_profile_and_info(screen)
-
-    elif state == "settings":
-            # difficulty display
-            difficulty_display = small_font.render("SELECT AI DIFFICULTY", True, get_current_theme()['text'])
-            screen.blit(difficulty_display, (WIDTH // 2 - 300, 60))
-
-            # settings
-            spacing = 160
-
-            # Set the position of the buttons
-            easy_button.rect.center = (WIDTH // 2 - spacing, 160)
-            easy_button.draw(screen, small_font)
+            row_y = HEIGHT - bottom_margin - button_height // 2
+            # Set the x position of the buttons
+            side_gap = 110
             # Set the position of the buttons
-            medium_button.rect.center = (WIDTH // 2 - spacing, 240)
-            medium_button.draw(screen, small_font)
+            minus_button.rect.center = (WIDTH // 2 - side_gap, row_y)
             # Set the position of the buttons
-            hard_button.rect.center = (WIDTH // 2 - spacing, 320)
-            hard_button.draw(screen, small_font)
+            plus_button.rect.center = (WIDTH // 2 + side_gap, row_y)
+
+            # Draw buttons
+            for btn in primary_buttons:
+                # Draw the buttons
+                btn.draw(screen, small_font)
+            # Resume sits to the left of Start while there is a saved game
+            if saved_game_available:
+                resume_button.rect.topleft = (stack_x - button_width - 20, stack_top_y)
+                resume_button.draw(screen, small_font)
+            # Draw the minus button
+            minus_button.draw(screen, font)
+            # Draw the plus button
+            plus_button.draw(screen, font)
+
+            # Counter centered between +/-
+            counter_surf = font.render(str(counter_value), True, get_current_theme()['text'])
+            # Set the x position of the counter
+            counter_x = WIDTH // 2 - counter_surf.get_width() // 2
+            # Set the y position of the counter
+            counter_y = row_y - counter_surf.get_height() // 2
+            # Draw the counter
+            screen.blit(counter_surf, (counter_x, counter_y))
+
+            # playing status
+            playing_info = small_font.render("Current Status: MENU", True, get_current_theme()['text'])
+            screen.blit(playing_info, (10, 10))
+
+            # difficulty display
+            difficulty_setting = small_font.render(f"AI Difficulty: {difficulty.upper()}", True, get_current_theme()['text'])
+            screen.blit(difficulty_setting, (10, 200))
 
             # mode display
-            mode_display = small_font.render("SELECT AI MODE", True, get_current_theme()['text'])
-            screen.blit(mode_display, (WIDTH // 2 + 60, 60))
+            mode_setting = small_font.render(f"AI Mode: {mode.upper()}", True, get_current_theme()['text'])
+            screen.blit(mode_setting, (10, 240))
 
-            # Set the position of the buttons
-            mode_interactive_button.rect.center = (WIDTH // 2 + spacing, 160)
-            mode_interactive_button.draw(screen, small_font)
-            # Set the position of the buttons
-            mode_automatic_button.rect.center = (WIDTH // 2 + spacing, 240)
-            mode_automatic_button.draw(screen, small_font)
-            # Set the position of the buttons
-            mode_manual_button.rect.center = (WIDTH // 2 + spacing, 320)
-            mode_manual_button.draw(screen, small_font)
-
-            # Output display
-            current_difficulty_display = small_font.render(f"Set to: {difficulty.upper()}", True, get_current_theme()['text'])
-            screen.blit(current_difficulty_display, (WIDTH // 2 - 260, 380))
-            current_mode_display = small_font.render(f"Set to: {mode.upper()}", True, get_current_theme()['text'])
-            screen.blit(current_mode_display, (WIDTH // 2 + 60, 380))
-
-            # Theme selection section - moved down for better spacing
-            theme_display = small_font.render("SELECT THEME", True, get_current_theme()['text'])
-            screen.blit(theme_display, (WIDTH // 2 - theme_display.get_width() // 2, 440))
+            # leaderboard for the current settings
+            draw_leaderboard(screen, WIDTH - 260, 200)
+
+            # Profile picture, username, and high score
+            draw_profile_and_info(screen)
+
+        elif state == "settings":
+                # difficulty display
+                difficulty_display = small_font.render("SELECT AI DIFFICULTY", True, get_current_theme()['text'])
+                screen.blit(difficulty_display, (WIDTH // 2 - 300, 60))
+
+                # settings
+                spacing = 160
+
+                # Set the position of the buttons
+                easy_button.rect.center = (WIDTH // 2 - spacing, 160)
+                easy_button.draw(screen, small_font)
+                # Set the position of the buttons
+                medium_button.rect.center = (WIDTH // 2 - spacing, 240)
+                medium_button.draw(screen, small_font)
+                # Set the position of the buttons
+                hard_button.rect.center = (WIDTH // 2 - spacing, 320)
+                hard_button.draw(screen, small_font)
+
+                # mode display
+                mode_display = small_font.render("SELECT AI MODE", True, get_current_theme()['text'])
+                screen.blit(mode_display, (WIDTH // 2 + 60, 60))
+
+                # Set the position of the buttons
+                mode_interactive_button.rect.center = (WIDTH // 2 + spacing, 160)
+                mode_interactive_button.draw(screen, small_font)
+                # Set the position of the buttons
+                mode_automatic_button.rect.center = (WIDTH // 2 + spacing, 240)
+                mode_automatic_button.draw(screen, small_font)
+                # Set the position of the buttons
+                mode_manual_button.rect.center = (WIDTH // 2 + spacing, 320)
+                mode_manual_button.draw(screen, small_font)
+
+                # Output display
+                current_difficulty_display = small_font.render(f"Set to: {difficulty.upper()}", True, get_current_theme()['text'])
+                screen.blit(current_difficulty_display, (WIDTH // 2 - 260, 380))
+                current_mode_display = small_font.render(f"Set to: {mode.upper()}", True, get_current_theme()['text'])
+                screen.blit(current_mode_display, (WIDTH // 2 + 60, 380))
+
+                # Theme selection section - moved down for better spacing
+                theme_display = small_font.render("SELECT THEME", True, get_current_theme()['text'])
+                screen.blit(theme_display, (WIDTH // 2 - theme_display.get_width() // 2, 440))
             
-            # Position and draw theme buttons with more spacing
-            dark_mode_button.rect.center = (WIDTH // 2 - 50, 490)
-            light_mode_button.rect.center = (WIDTH // 2 + 50, 490)
-            dark_mode_button.draw(screen, small_font)
-            light_mode_button.draw(screen, small_font)
-
-            # Add the continue button with much more spacing from bottom
-            settings_continue_button.rect.center = (WIDTH // 2, 580)
-            settings_continue_button.draw(screen, small_font)
-
-    # What should be displayed during each state
-    elif state == PLAYING:
-        draw_grid()
-
-        # Instructions
-        info_surf = small_font.render("Left click: Reveal | Right click: Flag", True, get_current_theme()['text'])
-        screen.blit(info_surf, (10, HEIGHT - 30))
-
-        # playing status
-        playing_info = small_font.render("Current Status: Playing", True, get_current_theme()['text'])
-        screen.blit(playing_info, (10, 10))
-        
-        # game timer display
-        if game_time.running:
-            # Get the elapsed time and set up the surface
-            timer_info = small_font.render(f"Time: {game_time.get_elapsed_time()}", True, get_current_theme()['text'])
-            # Draw the game time info
-            screen.blit(timer_info, (10, 40))
-
-        # Turn display
-        if auth.is_logged_in():
-            username = auth.get_username()
-        else:
-            username = "Player"
-        turn_string = "Turn: " + (username if player_turn else "AI")
-        turn_display = small_font.render(turn_string, True, get_current_theme()['text'])
-        screen.blit(turn_display, (10, HEIGHT - 60))
-
-        # Profile picture, username, and high score
-        draw_profile_and_info(screen)
-
-        remaining_flags_text = small_font.render(f"Flags Remaining: {get_remaining_flags()}", True, get_current_theme()['text'])
-        x = WIDTH - remaining_flags_text.get_width() - 10
-        y = HEIGHT - remaining_flags_text.get_height() - 10
-        screen.blit(remaining_flags_text, (x, y))
-
-    # SIGNUP screen UI
-    elif state == "signup":
-        # Set the prompt
-        prompt = small_font.render("Enter username (Enter submit, 0 back):", True, get_current_theme()['text'])
-        # Set the x position of the prompt
-        screen.blit(prompt, (WIDTH // 2 - prompt.get_width() // 2, HEIGHT // 2 - 40))
-        # Set the typed input
-        typed = small_font.render(signup_input, True, get_current_theme()['text'])
-        # Draw the typed input
-        screen.blit(typed, (WIDTH // 2 - typed.get_width() // 2, HEIGHT // 2))
-
-    # SET_PFP screen UI
-    elif state == "set_pfp":
-        # Set the prompt
-        prompt = small_font.render("Enter image path (Enter submit, 0 back):", True, get_current_theme()['text'])
-        # Draw the prompt
-        screen.blit(prompt, (WIDTH // 2 - prompt.get_width() // 2, HEIGHT // 2 - 60))
-        # Set the typed input
-        typed = small_font.render(setpfp_input, True, get_current_theme()['text'])
-        # Draw the typed input
-        screen.blit(typed, (WIDTH // 2 - typed.get_width() // 2, HEIGHT // 2 - 20))
-        # If there is an error, show it in red below the input
-        if setpfp_error:
-            error_surf = small_font.render(setpfp_error, True, RED)
-            screen.blit(error_surf, (WIDTH // 2 - error_surf.get_width() // 2, HEIGHT // 2 + 20))
-
-    # if the user wins
-    elif state == WIN:
-        draw_grid() # show board with no mines uncovered
-        update_confetti(dt)
-        draw_confetti(screen)
-
-        # tell the user they won
-        draw_game_end_message(screen, True)
-
-        # playing status
-        playinginfo = small_font.render("Current Status: WIN", True, get_current_theme()['text'])
-        screen.blit(playinginfo, (10, 10))
-        
-        # Display final time
-        timer_text = small_font.render(f"Time: {game_time.get_elapsed_time()}", True, get_current_theme()['text'])
-        screen.blit(timer_text, (10, 40))
-        
-        # Profile picture, username, and high score
-        draw_profile_and_info(screen)
+                # Position and draw theme buttons with more spacing
+                dark_mode_button.rect.center = (WIDTH // 2 - 50, 490)
+                light_mode_button.rect.center = (WIDTH // 2 + 50, 490)
+                dark_mode_button.draw(screen, small_font)
+                light_mode_button.draw(screen, small_font)
+
+                # Board size selection, to the right of the theme buttons
+                board_size_display = small_font.render("BOARD SIZE", True, get_current_theme()['text'])
+                screen.blit(board_size_display, (WIDTH // 2 + 230 - board_size_display.get_width() // 2, 440))
+                board_size_button.rect.center = (WIDTH // 2 + 230, 490)
+                board_size_button.draw(screen, small_font)
+
+                # Board generation selection, to the left of the theme buttons
+                generation_display = small_font.render("BOARDS", True, get_current_theme()['text'])
+                screen.blit(generation_display, (WIDTH // 2 - 230 - generation_display.get_width() // 2, 440))
+                generation_button.rect.center = (WIDTH // 2 - 230, 490)
+                generation_button.draw(screen, small_font)
+                if generation != effective_generation():
+                    # no-guess generation is too slow for the largest board
+                    random_note = tiny_font.render("Random on this size", True, get_current_theme()['text'])
+                    screen.blit(random_note, (WIDTH // 2 - 230 - random_note.get_width() // 2, 520))
+
+                # Add the continue button with much more spacing from bottom
+                settings_continue_button.rect.center = (WIDTH // 2, 580)
+                settings_continue_button.draw(screen, small_font)
+
+        # What should be displayed during each state
+        elif state == PLAYING:
+            update_viewport_pan(dt)
+            profiler.mark("draw")
+            draw_grid()
+            profiler.mark("draw_grid")
+
+            # Instructions
+            info_surf = small_font.render("Left click: Reveal | Right click: Flag", True, get_current_theme()['text'])
+            screen.blit(info_surf, (10, HEIGHT - 30))
+
+            # playing status
+            status_text = "Current Status: Building board..." if pending_reveal is not None else "Current Status: Playing"
+            playing_info = small_font.render(status_text, True, get_current_theme()['text'])
+            screen.blit(playing_info, (10, 10))
         
-        # Draw high score notification if active
-        if show_high_score_notification:
-            # Draw high score notification for a duration of 3 seconds
-            elapsed_notif = (pygame.time.get_ticks() - notification_start_time) / 1000.0
-            if elapsed_notif < NOTIFICATION_DURATION:
-                draw_high_score_notification(screen)
+            # game timer display
+            if game_time.running:
+                # Get the elapsed time and set up the surface
+                timer_info = small_font.render(f"Time: {game_time.get_elapsed_time()}", True, get_current_theme()['text'])
+                # Draw the game time info
+                screen.blit(timer_info, (10, 40))
+
+            # Turn display
+            if auth.is_logged_in():
+                username = auth.get_username()
             else:
-                # Hide notification after duration expires
-                show_high_score_notification = False
+                username = "Player"
+            turn_string = "Turn: " + (username if player_turn else "AI")
+            turn_display = small_font.render(turn_string, True, get_current_theme()['text'])
+            screen.blit(turn_display, (10, HEIGHT - 60))
 
-    # if the user loses
-    elif state == LOSE:
-        draw_grid() # Show the board with all mines revealed
+            # Profile picture, username, and high score
+            draw_profile_and_info(screen)
 
-        # tell the user they lost
-        draw_game_end_message(screen, False)
+            remaining_flags_text = small_font.render(f"Flags Remaining: {get_remaining_flags()}", True, get_current_theme()['text'])
+            x = WIDTH - remaining_flags_text.get_width() - 10
+            y = HEIGHT - remaining_flags_text.get_height() - 10
+            screen.blit(remaining_flags_text, (x, y))
 
-        # playing status
-        playinginfo = small_font.render("Current Status: LOSE", True, get_current_theme()['text'])
-        screen.blit(playinginfo, (10, 10))
+        # SIGNUP screen UI
+        elif state == "signup":
+            # Set the prompt
+            prompt = small_font.render("Enter username (Enter submit, 0 back):", True, get_current_theme()['text'])
+            # Set the x position of the prompt
+            screen.blit(prompt, (WIDTH // 2 - prompt.get_width() // 2, HEIGHT // 2 - 40))
+            # Set the typed input
+            typed = small_font.render(signup_input, True, get_current_theme()['text'])
+            # Draw the typed input
+            screen.blit(typed, (WIDTH // 2 - typed.get_width() // 2, HEIGHT // 2))
+
+        # SET_PFP screen UI
+        elif state == "set_pfp":
+            # Set the prompt
+            prompt = small_font.render("Enter image path (Enter submit, 0 back):", True, get_current_theme()['text'])
+            # Draw the prompt
+            screen.blit(prompt, (WIDTH // 2 - prompt.get_width() // 2, HEIGHT // 2 - 60))
+            # Set the typed input
+            typed = small_font.render(setpfp_input, True, get_current_theme()['text'])
+            # Draw the typed input
+            screen.blit(typed, (WIDTH // 2 - typed.get_width() // 2, HEIGHT // 2 - 20))
+            # While the image is being imported, say so
+            if pfp_import is not None:
+                busy_surf = small_font.render("Importing image...", True, get_current_theme()['text'])
+                screen.blit(busy_surf, (WIDTH // 2 - busy_surf.get_width() // 2, HEIGHT // 2 + 20))
+            # If there is an error, show it in red below the input
+            elif setpfp_error:
+                error_surf = small_font.render(setpfp_error, True, RED)
+                screen.blit(error_surf, (WIDTH // 2 - error_surf.get_width() // 2, HEIGHT // 2 + 20))
+
+        # if the user wins
+        elif state == WIN:
+            update_viewport_pan(dt)
+            profiler.mark("draw")
+            draw_grid() # show board with no mines uncovered
+            profiler.mark("draw_grid")
+            update_confetti(dt)
+            draw_confetti(screen)
+
+            # tell the user they won
+            draw_game_end_message(screen, True)
+
+            # playing status
+            playinginfo = small_font.render("Current Status: WIN", True, get_current_theme()['text'])
+            screen.blit(playinginfo, (10, 10))
         
-        # Display final time
-        timer_text = small_font.render(f"Time: {game_time.get_elapsed_time()}", True, get_current_theme()['text'])
-        screen.blit(timer_text, (10, 40))
+            # Display final time
+            timer_text = small_font.render(f"Time: {game_time.get_elapsed_time()}", True, get_current_theme()['text'])
+            screen.blit(timer_text, (10, 40))
         
-        # Profile picture, username, and high score
-        draw_profile_and_info(screen)
-
-    # Update screen
-    pygame.display.flip()
-
-# Exit
-pygame.quit()
+            # Profile picture, username, and high score
+            draw_profile_and_info(screen)
+        
+            # Draw high score notification if active
+            if show_high_score_notification:
+                # Draw high score notification for a duration of 3 seconds
+                elapsed_notif = (pygame.time.get_ticks() - notification_start_time) / 1000.0
+                if elapsed_notif < NOTIFICATION_DURATION:
+                    draw_high_score_notification(screen)
+                else:
+                    # Hide notification after duration expires
+                    show_high_score_notification = False
+
+        # if the user loses
+        elif state == LOSE:
+            update_viewport_pan(dt)
+            profiler.mark("draw")
+            draw_grid() # Show the board with all mines revealed
+            profiler.mark("draw_grid")
+
+            # tell the user they lost
+            draw_game_end_message(screen, False)
+
+            # playing status
+            playinginfo = small_font.render("Current Status: LOSE", True, get_current_theme()['text'])
+            screen.blit(playinginfo, (10, 10))
+        
+            # Display final time
+            timer_text = small_font.render(f"Time: {game_time.get_elapsed_time()}", True, get_current_theme()['text'])
+            screen.blit(timer_text, (10, 40))
+        
+            # Profile picture, username, and high score
+            draw_profile_and_info(screen)
+
+        # Frame timings overlay (F3)
+        profiler.mark("draw")
+        if profiler.overlay:
+            profiler.draw_overlay(screen, tiny_font, get_current_theme()['text'], get_current_theme()['background'])
+            profiler.mark("overlay")
+
+        # Update screen
+        pygame.display.flip()
+        profiler.mark("flip")
+
+    # Exit (write any account changes still waiting in the background)
+    if game_log.in_game:
+        # The window was closed mid-game
+        game_log.end_game(RESULT_ABANDONED, game_time.get_elapsed_time_ms())
+    if state == PLAYING:
+        # Keep the game (and its timer) so it can be resumed next time
+        autosave()
+    game_saver.flush()
+    profiling.mark("exit")
+    auth.flush()
+    leaderboard.flush()
+    game_log.flush()
+    board_pool.close()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
 """
 File Name: pfp_helper.py
 Module: src
-Function: Define a helper function used to save user profile images and provide the new path.
+Function: Define a helper function used to save user profile images and provide the new path. Imported images are
+    checked, downscaled once to at most PROFILE_IMAGE_MAX_SIZE pixels and stored as a small JPEG (PNG if the image has
+    transparency), so the game never decodes the original photo again. ProfileImport runs the import on a worker
+    thread; ProfileLoad does the same for a picture that is already stored (after signing in or out).
 Inputs: None.
 Outputs: None.
 Authors:
@@ -12,28 +15,99 @@ NOTE: All code in the file was authored by 1 or more of the authors. No outside
 """
 
 import os  # Used to build full asset paths
-import shutil  # Used to copy files into the assets folder
-from typing import Optional  # return type hint
-from settings import ASSETS_DIR  # base assets directory
+import threading  # Used to import images off the main thread
+from typing import Callable, Optional  # type hints
+from settings import PROFILE_IMAGES_DIR, PROFILE_IMAGE_MAX_SIZE  # stored picture folder and size limit
+
+JPEG_QUALITY = 90
 
 
 def save_profile_image(source_path: str, username: str) -> Optional[str]:
-    """Copy a chosen image into store and return the new path."""
-    # Make sure the folder exists
-    images_dir = os.path.join(ASSETS_DIR, "images", "profiles")
-    os.makedirs(images_dir, exist_ok=True)
+    """Check a chosen image, store a downscaled copy and return the new path (None if the image can't be used)."""
+    # Pillow is only needed when a picture is imported, so import it here
+    from PIL import Image, ImageOps
+    try:
+        img = Image.open(source_path)
+        # Let JPEG decoding skip detail we're about to throw away (much faster for large photos)
+        img.draft("RGB", (PROFILE_IMAGE_MAX_SIZE, PROFILE_IMAGE_MAX_SIZE))
+        # Apply the camera's rotation, then shrink (never enlarge) to fit the size limit
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail((PROFILE_IMAGE_MAX_SIZE, PROFILE_IMAGE_MAX_SIZE), Image.LANCZOS)
+    except Exception:
+        # Missing file or not an image: the UI shows a message
+        return None
 
-    # Keep original extension if available; default to .jpg
-    _, ext = os.path.splitext(source_path)
-    ext = (ext or ".jpg").lower()
+    # Keep transparency as PNG; everything else is a compact JPEG
+    has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+    ext = ".png" if has_alpha else ".jpg"
+
+    # Make sure the folder exists
+    os.makedirs(PROFILE_IMAGES_DIR, exist_ok=True)
     # Use username-based unique filename
-    target_path = os.path.join(images_dir, f"{username}{ext}")
+    target_path = os.path.join(PROFILE_IMAGES_DIR, f"{username}{ext}")
+    tmp_path = f"{target_path}.tmp"
     try:
-        # Copy the file into our assets/images directory
-        shutil.copyfile(source_path, target_path)
-        # Return the path so callers can store it
-        return target_path
+        # Write through a temp file so a failed import never leaves a broken picture behind
+        if has_alpha:
+            img.convert("RGBA").save(tmp_path, "PNG", optimize=True)
+        else:
+            img.convert("RGB").save(tmp_path, "JPEG", quality=JPEG_QUALITY, optimize=True)
+        os.replace(tmp_path, target_path)
     except Exception:
-        # Any error (missing input, permissions) returns None so UI can show a message
+        # Any error (permissions, disk full) returns None so UI can show a message
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
         return None
 
+    # Remove this user's earlier picture if it was stored under another extension
+    for name in os.listdir(PROFILE_IMAGES_DIR):
+        stem, old_ext = os.path.splitext(name)
+        if stem == username and old_ext.lower() != ext:
+            try:
+                os.remove(os.path.join(PROFILE_IMAGES_DIR, name))
+            except OSError:
+                pass
+    # Return the path so callers can store it
+    return target_path
+
+
+class ProfileImport:
+    """Runs save_profile_image on a worker thread so the window keeps responding while a large photo is imported.
+
+    prepare, if given, is called with the saved path on the same thread (e.g. to build the circular picture) and
+    its return value is kept in prepared. Poll done() from the main loop; result is then the saved path or None.
+    """
+
+    def __init__(self, source_path: str, username: str, prepare: Optional[Callable[[str], object]] = None):
+        self.result: Optional[str] = None
+        self.prepared = None
+        self._prepare = prepare
+        self._done = threading.Event()
+        thread = threading.Thread(target=self._run, args=(source_path, username), name="profile-import", daemon=True)
+        thread.start()
+
+    def _run(self, source_path: str, username: str) -> None:
+        try:
+            self.result = self._save(source_path, username)
+            if self.result and self._prepare:
+                self.prepared = self._prepare(self.result)
+        finally:
+            self._done.set()
+
+    def _save(self, source_path: str, username: str) -> Optional[str]:
+        return save_profile_image(source_path, username)
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+
+class ProfileLoad(ProfileImport):
+    """Runs only prepare for a picture that is already stored, on the worker thread; result is its path."""
+
+    def __init__(self, image_path: str, prepare: Callable[[str], object]):
+        super().__init__(image_path, "", prepare)
+
+    def _save(self, source_path: str, username: str) -> Optional[str]:
+        return source_path
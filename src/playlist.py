@@ -0,0 +1,116 @@
+"""
+File Name: playlist.py
+Module: src
+Function: Define the Playlist class, an index of the background music folder built once at startup (with parsed song
+    titles and a shuffled play order) that reads the next track into memory in the background so skipping is instant.
+Inputs: The background music folder.
+Outputs: None.
+Authors:
+    Minesweeper project contributors (see the git history of this file)
+Creation Date: 10/19/2026
+"""
+
+import io  # in-memory copy of the prefetched track
+import os  # list the music folder
+import random  # shuffle the play order
+import threading  # background prefetch
+
+MUSIC_EXTENSIONS = (".mp3", ".ogg", ".wav")
+
+
+def parse_song_title(filename):
+    """Turn a file name like '03_Blue_in_Green_-_Sergeeo.mp3' into the song title ('Blue in Green')."""
+    stem = os.path.splitext(filename)[0]
+    # The title is everything before the '-' that separates it from the artist
+    if '-' in stem:
+        stem = stem[:stem.index('-')]
+    # Underscores are spaces, and the track number is dropped
+    title = ''.join([i for i in stem.replace("_", " ") if not i.isdigit()])
+    return title.strip()
+
+
+class Track:
+    """One song in the music folder."""
+
+    def __init__(self, path, title):
+        self.path = path
+        self.title = title
+
+
+class Playlist:
+    """Shuffled, looping playlist over a music folder.
+
+    The folder is listed and every title parsed once, here. Songs play in shuffled rounds over the whole folder; a
+    new round is shuffled whenever the current one runs out (never starting with the song that just played), so
+    moving to the next song is a constant time step that can't get stuck, even with a single track.
+    """
+
+    def __init__(self, music_dir, rng=None):
+        self.rng = rng or random.Random()
+        names = sorted(name for name in os.listdir(music_dir) if name.lower().endswith(MUSIC_EXTENSIONS))
+        self.tracks = [Track(os.path.join(music_dir, name), parse_song_title(name)) for name in names]
+
+        # Index of the playing track, and the rest of the current shuffled round
+        self._current = None
+        self._upcoming = []
+        if self.tracks:
+            self._current = self._peek_next()
+            self._upcoming.pop(0)
+
+        # Prefetched bytes for one upcoming track: (track index, bytes); written by the prefetch thread
+        self._prefetched = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.tracks)
+
+    def _peek_next(self):
+        # Index of the track advance() will move to, shuffling a new round if this one is used up
+        if not self._upcoming:
+            self._upcoming = list(range(len(self.tracks)))
+            self.rng.shuffle(self._upcoming)
+            if len(self._upcoming) > 1 and self._upcoming[0] == self._current:
+                self._upcoming.append(self._upcoming.pop(0))
+        return self._upcoming[0]
+
+    def current(self):
+        """The track that is playing (None if the folder has no music)."""
+        if self._current is None:
+            return None
+        return self.tracks[self._current]
+
+    def advance(self):
+        """Move to the next track in the play order and return it."""
+        if not self.tracks:
+            return None
+        self._current = self._peek_next()
+        self._upcoming.pop(0)
+        return self.current()
+
+    def open_current(self):
+        """Return something mixer.music.load can read for the current track: the prefetched bytes if ready, else the path."""
+        with self._lock:
+            prefetched, self._prefetched = self._prefetched, None
+        if prefetched is not None and prefetched[0] == self._current:
+            return io.BytesIO(prefetched[1])
+        return self.tracks[self._current].path
+
+    def prefetch_next(self):
+        """Read the next track into memory on a background thread so the next skip doesn't wait on the disk."""
+        if not self.tracks:
+            return
+        index = self._peek_next()
+        if index == self._current:
+            # Only one track: skipping just restarts it, nothing to prefetch
+            return
+        thread = threading.Thread(target=self._prefetch, args=(index,), name="music-prefetch", daemon=True)
+        thread.start()
+
+    def _prefetch(self, index):
+        try:
+            with open(self.tracks[index].path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return
+        with self._lock:
+            self._prefetched = (index, data)
@@ -0,0 +1,107 @@
+"""
+File Name: profile_cache.py
+Module: src
+Function: Cache finished circular profile pictures on disk. Each entry holds the RGBA pixels of one picture at one
+    diameter, keyed by the source file's path, modification time, size and the diameter, so showing a profile
+    picture again never reopens or resizes the original. The folder is kept under a size limit by removing the
+    least recently used entries, and older versions of a picture are removed when it changes.
+Inputs: Profile picture files.
+Outputs: Cache files under PROFILE_CACHE_DIR (images/profiles/cache in the data folder).
+Authors:
+    Minesweeper project contributors (see the git history of this file)
+Creation Date: 10/19/2026
+"""
+
+import os  # build cache paths, list and remove entries
+import hashlib  # hash the cache keys
+import struct  # cache file header
+from settings import PROFILE_CACHE_DIR, PROFILE_CACHE_MAX_BYTES
+
+# Cache file layout: header, then width * height * 4 bytes of RGBA pixels.
+# Header: magic, format version, width, height.
+# Bump CACHE_VERSION whenever the layout (or the way pictures are processed) changes so old files are ignored.
+CACHE_MAGIC = b"MSPFP"
+CACHE_VERSION = 1
+HEADER = struct.Struct("<5sBHH")
+CACHE_EXTENSION = ".rgba"
+
+
+def _source_prefix(image_path):
+    # Every entry for the same source file starts with this, so stale versions can be found
+    return hashlib.sha1(os.path.abspath(image_path).encode("utf-8")).hexdigest()[:16]
+
+
+def cache_path_for(image_path, diameter):
+    """Cache file for image_path at diameter. Raises OSError if the source file can't be read."""
+    info = os.stat(image_path)
+    version = hashlib.sha1(f"{info.st_mtime_ns}-{info.st_size}-{diameter}".encode("ascii")).hexdigest()[:16]
+    return os.path.join(PROFILE_CACHE_DIR, f"{_source_prefix(image_path)}-{version}{CACHE_EXTENSION}")
+
+
+def read_cached(image_path, diameter):
+    """Return (pixels, (width, height), "RGBA") from the cache, or None on a miss."""
+    try:
+        cache_path = cache_path_for(image_path, diameter)
+        with open(cache_path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) < HEADER.size:
+        return None
+    magic, version, width, height = HEADER.unpack_from(data, 0)
+    if magic != CACHE_MAGIC or version != CACHE_VERSION or len(data) != HEADER.size + width * height * 4:
+        return None
+    try:
+        # Mark the entry as recently used so eviction keeps it
+        os.utime(cache_path)
+    except OSError:
+        pass
+    return memoryview(data)[HEADER.size:], (width, height), "RGBA"
+
+
+def write_cached(image_path, diameter, prepared):
+    """Store (pixels, (width, height), "RGBA") for image_path at diameter, then trim the cache."""
+    data, (width, height), mode = prepared
+    if mode != "RGBA":
+        return
+    try:
+        cache_path = cache_path_for(image_path, diameter)
+        os.makedirs(PROFILE_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(CACHE_MAGIC, CACHE_VERSION, width, height))
+            f.write(data)
+        os.replace(tmp_path, cache_path)
+        _evict(cache_path)
+    except OSError:
+        # The cache is only an optimization; failing to write it is not an error
+        pass
+
+
+def _evict(keep_path):
+    # Remove every other entry for the picture just cached (older versions of the file), then the least recently
+    # used entries until the folder fits in PROFILE_CACHE_MAX_BYTES
+    keep_name = os.path.basename(keep_path)
+    prefix = keep_name.split("-")[0]
+    entries = []
+    for name in os.listdir(PROFILE_CACHE_DIR):
+        path = os.path.join(PROFILE_CACHE_DIR, name)
+        if not name.endswith(CACHE_EXTENSION) or name == keep_name:
+            continue
+        try:
+            if name.startswith(prefix + "-"):
+                os.remove(path)
+                continue
+            info = os.stat(path)
+        except OSError:
+            continue
+        entries.append((info.st_mtime, info.st_size, path))
+    total = sum(size for _, size, _ in entries) + os.path.getsize(keep_path)
+    for _, size, path in sorted(entries):
+        if total <= PROFILE_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
@@ -0,0 +1,157 @@
+"""
+File Name: profiling.py
+Module: src
+Function: Opt-in profiling sessions for the real game. A session records CPU time with cProfile and memory with
+    tracemalloc over one bounded part of a run: startup (imports, window, assets and sound), one game, or N AI moves.
+    When it ends it writes a .prof file (open with pstats or snakeviz), a text summary of the slowest functions and a
+    report of what was allocated during the session.
+Inputs: The MINESWEEPER_PROFILE environment variable or the --profile command line switch:
+    startup | game | ai:N (e.g. ai:50)
+Outputs: Report files under assets/logs/profiles.
+Authors:
+    Minesweeper project contributors (see the git history of this file)
+Creation Date: 10/19/2026
+
+Usage (from the src folder):
+    python minesweeper.py --profile startup
+    MINESWEEPER_PROFILE=ai:50 python minesweeper.py
+"""
+
+import io  # capture the pstats summary
+import os  # build report paths
+import sys  # read the command line
+import time  # name reports by time
+import pstats  # summarize the CPU profile
+import cProfile  # CPU profiler
+import tracemalloc  # memory allocations
+from settings import PROFILE_DIR
+
+SCOPES = ("startup", "game", "ai")
+REPORT_LINES = 40  # functions / allocation sites listed in the text reports
+
+# The session configured for this run (None when profiling is off)
+_session = None
+
+
+class ProfileSession:
+    """One profiling session over a single stretch of the run, started and stopped by events from the game."""
+
+    def __init__(self, scope, ai_moves=0, out_dir=PROFILE_DIR):
+        self.scope = scope
+        self.ai_moves = ai_moves  # for the "ai" scope: how many AI moves to cover
+        self.out_dir = out_dir
+        self.running = False
+        self.finished = False
+        self._moves_seen = 0
+        self._profile = None
+        self._before = None
+        self._started = 0.0
+
+    def handle(self, event):
+        """React to a game event: startup-begin, startup-end, game-begin, game-end, ai-move or exit."""
+        if self.finished:
+            return
+        if event == "exit":
+            if self.running:
+                self.stop()
+        elif self.scope == "startup":
+            if event == "startup-begin" and not self.running:
+                self.start()
+            elif event == "startup-end" and self.running:
+                self.stop()
+        elif self.scope == "game":
+            if event == "game-begin" and not self.running:
+                self.start()
+            elif event == "game-end" and self.running:
+                self.stop()
+        elif self.scope == "ai":
+            if event == "ai-move":
+                # Called just before each AI move, so the session covers exactly ai_moves moves
+                if not self.running:
+                    self.start()
+                elif self._moves_seen >= self.ai_moves:
+                    self.stop()
+                    return
+                self._moves_seen += 1
+            elif event == "game-end" and self.running:
+                self.stop()
+
+    def start(self):
+        self.running = True
+        self._started = time.perf_counter()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._before = tracemalloc.take_snapshot()
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def stop(self):
+        self._profile.disable()
+        after = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        elapsed = time.perf_counter() - self._started
+        self.running = False
+        self.finished = True
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{self.scope}"
+        base = os.path.join(self.out_dir, name)
+        self._profile.dump_stats(base + ".prof")
+
+        # Slowest functions by cumulative time
+        text = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=text)
+        stats.sort_stats("cumulative").print_stats(REPORT_LINES)
+        with open(base + "-cpu.txt", "w", encoding="utf-8") as f:
+            f.write(f"Session: {self.scope}, {elapsed:.3f}s wall time")
+            if self.scope == "ai":
+                f.write(f", {self._moves_seen} AI moves")
+            f.write("\n\n" + text.getvalue())
+
+        # What was allocated (and not freed) during the session, by source line
+        with open(base + "-alloc.txt", "w", encoding="utf-8") as f:
+            f.write(f"Session: {self.scope}, traced memory at end {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB\n\n")
+            for diff in after.compare_to(self._before, "lineno")[:REPORT_LINES]:
+                f.write(f"{diff}\n")
+        print(f"Profile written to {base}.prof (+ -cpu.txt, -alloc.txt)")
+
+
+def parse_request(value):
+    """Turn "startup", "game" or "ai:N" into (scope, ai_moves). Raises ValueError for anything else."""
+    scope, _, count = value.strip().lower().partition(":")
+    if scope not in SCOPES:
+        raise ValueError(f"unknown profiling scope {value!r} (use startup, game or ai:N)")
+    ai_moves = 0
+    if scope == "ai":
+        ai_moves = int(count) if count else 20
+        if ai_moves <= 0:
+            raise ValueError("ai:N needs a positive number of moves")
+    return scope, ai_moves
+
+
+def configure(argv=None):
+    """Set up the session asked for by --profile SCOPE on the command line or MINESWEEPER_PROFILE (if any)."""
+    global _session
+    argv = sys.argv[1:] if argv is None else argv
+    request = os.environ.get("MINESWEEPER_PROFILE", "")
+    for i, arg in enumerate(argv):
+        if arg == "--profile" and i + 1 < len(argv):
+            request = argv[i + 1]
+        elif arg.startswith("--profile="):
+            request = arg.split("=", 1)[1]
+    if not request:
+        return None
+    try:
+        scope, ai_moves = parse_request(request)
+    except ValueError as error:
+        print(f"Profiling disabled: {error}")
+        return None
+    _session = ProfileSession(scope, ai_moves)
+    return _session
+
+
+def mark(event):
+    """Tell the configured session (if any) that something happened. Costs nothing when profiling is off."""
+    if _session is not None:
+        _session.handle(event)
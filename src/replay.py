@@ -0,0 +1,346 @@
+"""
+File Name: replay.py
+Module: src
+Function: Replay games from the game log. The board is rebuilt from each game's seed with the board engine and the
+    logged moves are applied in order, either as fast as possible with no rendering (to check that every game ends
+    the way it was logged, or to let an AI replay the same boards) or in a pygame window at a chosen speed with
+    seeking. Seeking starts from the nearest saved checkpoint, so jumping to move N never replays from move 0.
+Inputs: A game log file (see game_log.py).
+Outputs: A summary printed to the console, or the playback window.
+Authors:
+    Minesweeper project contributors (see the git history of this file)
+Creation Date: 10/19/2026
+
+Usage (from the src folder):
+    python replay.py [LOG]                      check every game in the log
+    python replay.py [LOG] --ai hard            also let an AI play each logged board from the same first click
+    python replay.py [LOG] --play N [--speed 4] watch game N (0 = first)
+Playback keys: Space pause, Left/Right step, Up/Down speed, Home/End, Page Up/Down jump 10%, click the bar to seek,
+    mouse wheel to zoom.
+"""
+
+import sys  # exit codes
+import time  # measure replay speed
+import random  # rebuild boards from their seeds
+import argparse  # command line options
+from board import new_board, place_mines, compute_counts, ensure_first_click_safe, reveal_cells
+from game_log import (
+    read_games, ACTION_NAMES, ACTION_REVEAL, RESULT_WIN, RESULT_LOSS
+)
+from solver import ensure_first_click_no_guess
+from board_pool import build_board, transform_rows
+from settings import MINE, GAME_LOG_PATH, EASY, MEDIUM, HARD, GEN_NO_GUESS
+
+# Save the board every this many moves so seeking only replays the moves after the nearest checkpoint
+CHECKPOINT_EVERY = 50
+
+
+class Replay:
+    """A logged game that can be stepped through and seeked.
+
+    The board is exactly the one that was played: mines are placed from the game's seed with the same generator
+    calls the game made, and the first reveal regenerates the board with that generator just like the game did (or
+    rebuilds the pooled board the game was served, see board_pool.py).
+    """
+
+    def __init__(self, game, checkpoint_every=CHECKPOINT_EVERY):
+        self.game = game
+        self.checkpoint_every = checkpoint_every
+        self._checkpoints = {}  # move index -> saved board state
+        self._restart()
+
+    def _restart(self):
+        self.rng = random.Random(self.game.seed)
+        self.grid, self.revealed, self.flagged, _ = new_board(self.game.rows, self.game.cols)
+        place_mines(self.grid, self.game.mines, self.rng)
+        self.counts = compute_counts(self.grid)
+        self.first_click_done = False
+        self.hidden_safe = self.game.rows * self.game.cols - self.game.mines  # safe tiles not revealed yet
+        self.result = None  # RESULT_WIN / RESULT_LOSS once the game ends
+        self.index = 0  # number of logged moves applied
+
+    def __len__(self):
+        return len(self.game.moves)
+
+    def apply(self, row, col, action):
+        """Apply one move in the ai_solver format: action is "reveal", "flag" (toggle) or "unflag"."""
+        if self.result is not None or self.revealed[row][col]:
+            return
+        if action == "flag":
+            self.flagged[row][col] = not self.flagged[row][col]
+        elif action == "unflag":
+            self.flagged[row][col] = False
+        elif action == "reveal" and not self.flagged[row][col]:
+            if self.game.pooled is not None and not self.first_click_done:
+                # The game took a board the pool had built ahead of time
+                seed, anchor_row, anchor_col, symmetry = self.game.pooled
+                grid, counts = build_board(self.game.rows, self.game.cols, self.game.mines, self.game.generation,
+                                           seed, anchor_row, anchor_col)
+                self.grid, self.counts = transform_rows(grid, symmetry), transform_rows(counts, symmetry)
+                self.first_click_done = True
+            elif not self.first_click_done:
+                # Same regeneration the game did on the first click
+                first_click = ensure_first_click_no_guess if self.game.generation == GEN_NO_GUESS else ensure_first_click_safe
+                self.counts = first_click(row, col, self.grid, self.counts, self.game.mines, self.rng)
+                self.first_click_done = True
+            opened, exploded, won = reveal_cells([(row, col)], self.grid, self.counts, self.revealed, self.flagged,
+                                                 self.hidden_safe)
+            self.hidden_safe -= opened
+            if exploded:
+                self.result = RESULT_LOSS
+            elif won:
+                self.result = RESULT_WIN
+
+    def step(self):
+        """Apply the next logged move. Returns False once every move has been applied."""
+        if self.index >= len(self.game.moves):
+            return False
+        _, _, action, row, col = self.game.moves[self.index]
+        self.apply(row, col, ACTION_NAMES[action])
+        self.index += 1
+        if self.index % self.checkpoint_every == 0 and self.index not in self._checkpoints:
+            self._checkpoints[self.index] = self._save()
+        return True
+
+    def seek(self, target):
+        """Put the board in the state it was in after target moves."""
+        target = max(0, min(target, len(self.game.moves)))
+        # Start from the latest checkpoint at or before target (or the very beginning) when going back, or when
+        # going forward past a checkpoint
+        saved = max((i for i in self._checkpoints if i <= target), default=0)
+        if target < self.index or saved > self.index:
+            if saved:
+                self._load(saved, self._checkpoints[saved])
+            else:
+                self._restart()
+        while self.index < target:
+            self.step()
+
+    def run(self):
+        """Apply every logged move and return the result."""
+        self.seek(len(self.game.moves))
+        return self.result
+
+    def matches_log(self):
+        """True if replaying the moves ends the way the log says the game ended."""
+        result = self.run()
+        if self.game.result in (RESULT_WIN, RESULT_LOSS):
+            return result == self.game.result
+        # Abandoned or cut off: the game must not have ended yet
+        return result is None
+
+    def _save(self):
+        # Until the first reveal the mines can still be moved in place, so the grid is copied; after that it never
+        # changes and is shared between checkpoints
+        grid = self.grid if self.first_click_done else [row[:] for row in self.grid]
+        return (grid, self.counts, [row[:] for row in self.revealed], [row[:] for row in self.flagged],
+                self.first_click_done, self.hidden_safe, self.result, self.rng.getstate())
+
+    def _load(self, index, saved):
+        grid, counts, revealed, flagged, first_click_done, hidden_safe, result, rng_state = saved
+        self.grid = grid if first_click_done else [row[:] for row in grid]
+        self.counts = counts
+        self.revealed = [row[:] for row in revealed]
+        self.flagged = [row[:] for row in flagged]
+        self.first_click_done = first_click_done
+        self.hidden_safe = hidden_safe
+        self.result = result
+        self.rng.setstate(rng_state)
+        self.index = index
+
+
+def rerun_ai(game, difficulty, max_moves=None):
+    """Let an ai_solver play a logged board from the same first click. Returns the result (None if it stalls)."""
+    from ai import ai_solver
+    replay = Replay(game)
+    # Apply logged moves up to and including the first reveal, which fixes where the mines are
+    for _, _, action, row, col in game.moves:
+        replay.apply(row, col, ACTION_NAMES[action])
+        if action == ACTION_REVEAL:
+            break
+    if not replay.first_click_done:
+        return None
+    solver = ai_solver(difficulty, replay.grid, replay.counts, replay.revealed, replay.flagged)
+    limit = max_moves if max_moves is not None else game.rows * game.cols * 2
+    for _ in range(limit):
+        if replay.result is not None:
+            break
+        row, col, action = solver.make_move()
+        if row is None:
+            break
+        if action == "reveal" and replay.flagged[row][col]:
+            # The game lifts the flag before an AI reveal
+            replay.apply(row, col, "unflag")
+        replay.apply(row, col, action)
+    return replay.result
+
+
+def check_log(path, ai_difficulty=None):
+    """Replay every game in a log without rendering and print a summary. Returns the number of mismatches."""
+    games = played = mismatches = moves = 0
+    ai_wins = ai_games = 0
+    started = time.perf_counter()
+    for number, game in enumerate(read_games(path)):
+        games += 1
+        replay = Replay(game)
+        if not replay.matches_log():
+            mismatches += 1
+            print(f"game {number}: log says {game.result}, replay ended with {replay.result}")
+        moves += len(replay)
+        if game.moves:
+            played += 1
+        if ai_difficulty and game.moves:
+            ai_games += 1
+            ai_wins += rerun_ai(game, ai_difficulty) == RESULT_WIN
+    elapsed = time.perf_counter() - started
+    rate = moves / elapsed if elapsed > 0 else 0
+    print(f"{games} games ({played} with moves), {moves} moves replayed in {elapsed:.2f}s ({rate:.0f} moves/s)")
+    print(f"{mismatches} games did not end the way they were logged")
+    if ai_difficulty:
+        print(f"{ai_difficulty} AI won {ai_wins} of {ai_games} logged boards")
+    return mismatches
+
+
+def play(game, speed=1.0):
+    """Watch a logged game in a pygame window."""
+    import pygame
+    import app
+    from game_assets import get_sprites
+    from viewport import Viewport
+    from settings import WIDTH, HEIGHT, DARK_RED, GRID_START_X, GRID_START_Y, GRID_SIZE, TILE_SIZE, get_current_theme
+
+    screen = app.get_screen()
+    clock = app.get_clock()
+    _, small_font, tiny_font = app.get_fonts()
+    pygame.display.set_caption("Minesweeper replay")
+    replay = Replay(game)
+    board_size = GRID_SIZE * TILE_SIZE
+    viewport = Viewport((GRID_START_X, GRID_START_Y, board_size, board_size), game.rows, game.cols)
+    bar = pygame.Rect(40, HEIGHT - 40, WIDTH - 80, 14)
+    sprite_cache = {}
+
+    def move_time(index):
+        # Time (ms since the game started) of the move that brings the board to index moves
+        return game.moves[index - 1][0] if index > 0 else 0
+
+    def seek(index):
+        nonlocal clock_ms
+        replay.seek(index)
+        clock_ms = move_time(replay.index)
+
+    def sprites_for(tile_size):
+        sprites = sprite_cache.get(tile_size)
+        if sprites is None:
+            flag_sprite, mines_sprite, numbers_sprites = get_sprites()
+            size = max(1, tile_size // 2)
+            scale = lambda sprite: pygame.transform.smoothscale(sprite, (size, size))
+            sprites = sprite_cache[tile_size] = (scale(flag_sprite), scale(mines_sprite),
+                                                 {n: scale(s) for n, s in numbers_sprites.items()})
+        return sprites
+
+    clock_ms = 0.0  # playback position in game time
+    paused = False
+    running = True
+    while running:
+        dt = clock.tick(60)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.MOUSEWHEEL:
+                viewport.zoom_at(event.y, pygame.mouse.get_pos())
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and bar.collidepoint(event.pos):
+                seek(round((event.pos[0] - bar.x) / bar.width * len(replay)))
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    running = False
+                elif event.key == pygame.K_SPACE:
+                    paused = not paused
+                elif event.key == pygame.K_RIGHT:
+                    seek(replay.index + 1)
+                elif event.key == pygame.K_LEFT:
+                    seek(replay.index - 1)
+                elif event.key == pygame.K_UP:
+                    speed = min(speed * 2, 256)
+                elif event.key == pygame.K_DOWN:
+                    speed = max(speed / 2, 0.125)
+                elif event.key == pygame.K_HOME:
+                    seek(0)
+                elif event.key == pygame.K_END:
+                    seek(len(replay))
+                elif event.key == pygame.K_PAGEUP:
+                    seek(replay.index + max(1, len(replay) // 10))
+                elif event.key == pygame.K_PAGEDOWN:
+                    seek(replay.index - max(1, len(replay) // 10))
+
+        # Advance playback: apply every move whose time has come
+        if not paused and replay.index < len(replay):
+            clock_ms += dt * speed
+            while replay.index < len(replay) and game.moves[replay.index][0] <= clock_ms:
+                replay.step()
+
+        # Draw the visible part of the board
+        theme = get_current_theme()
+        screen.fill(theme['background'])
+        ts = viewport.tile_size
+        flag_sprite, mine_sprite, number_sprites = sprites_for(ts)
+        offset = (ts - max(1, ts // 2)) // 2
+        first_row, last_row, first_col, last_col = viewport.visible_cells()
+        screen.set_clip(viewport.rect)
+        for row in range(first_row, last_row):
+            for col in range(first_col, last_col):
+                x, y = viewport.cell_to_screen(row, col)
+                tile = (x, y, ts, ts)
+                if replay.revealed[row][col]:
+                    if replay.grid[row][col] == MINE:
+                        screen.fill(DARK_RED, tile)
+                        screen.blit(mine_sprite, (x + offset, y + offset))
+                    else:
+                        screen.fill(theme['grid_revealed'], tile)
+                        n = replay.counts[row][col]
+                        if n > 0:
+                            screen.blit(number_sprites[n], (x + offset, y + offset))
+                else:
+                    screen.fill(theme['grid_tile'], tile)
+                    if replay.flagged[row][col]:
+                        screen.blit(flag_sprite, (x + offset, y + offset))
+                pygame.draw.rect(screen, theme['grid_border'], tile, max(1, ts // 20))
+        screen.set_clip(None)
+
+        # Status line and the seek bar
+        status = {RESULT_WIN: "WIN", RESULT_LOSS: "LOSE"}.get(replay.result, "paused" if paused else "playing")
+        info = (f"Move {replay.index}/{len(replay)}   {clock_ms / 1000:.1f}s   speed x{speed:g}   {status}   "
+                f"{game.rows}x{game.cols}, {game.mines} mines, {game.mode}/{game.difficulty}")
+        screen.blit(small_font.render(info, True, theme['text']), (10, 10))
+        if replay.index:
+            actor, action = game.moves[replay.index - 1][1:3]
+            last = f"Last: {'AI' if actor else 'player'} {ACTION_NAMES[action]} {game.moves[replay.index - 1][3:]}"
+            screen.blit(tiny_font.render(last, True, theme['text']), (10, 40))
+        pygame.draw.rect(screen, theme['grid_tile'], bar)
+        if len(replay):
+            filled = bar.copy()
+            filled.width = bar.width * replay.index // len(replay)
+            pygame.draw.rect(screen, theme['grid_border'], filled)
+        pygame.display.flip()
+    pygame.quit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay games from the Minesweeper game log.")
+    parser.add_argument("log", nargs="?", default=GAME_LOG_PATH, help="game log file (default: the game's own log)")
+    parser.add_argument("--play", type=int, metavar="N", help="watch game N in a window instead of checking the log")
+    parser.add_argument("--speed", type=float, default=1.0, help="playback speed multiplier (default 1)")
+    parser.add_argument("--ai", choices=(EASY, MEDIUM, HARD), help="also let this AI play every logged board")
+    args = parser.parse_args(argv)
+
+    if args.play is not None:
+        for number, game in enumerate(read_games(args.log)):
+            if number == args.play:
+                play(game, args.speed)
+                return 0
+        print(f"No game {args.play} in {args.log}")
+        return 1
+    return 1 if check_log(args.log, args.ai) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
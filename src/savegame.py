@@ -0,0 +1,200 @@
+"""
+File Name: savegame.py
+Module: src
+Function: Save and resume an in-progress game. The mines, revealed and flagged tiles are each stored as one bit per
+    tile (a 1000x1000 board is about 375 KB instead of megabytes of JSON lists), after a small header with the
+    settings, the first-click flag, the timer and whose turn it is. GameSaver writes saves on a background thread,
+    always through a temp file plus rename, so the game can autosave after every move.
+Inputs: The game state from the main loop.
+Outputs: The save file.
+Authors:
+    Minesweeper project contributors (see the git history of this file)
+Creation Date: 10/19/2026
+"""
+
+import os  # remove the save file
+import struct  # save file header
+import atexit  # finish the last save when the program exits
+import threading  # save on a background thread
+from settings import MINE, EASY, MEDIUM, HARD, AI_INTERACTIVE, AI_AUTOMATIC, AI_MANUAL, GEN_RANDOM, GEN_NO_GUESS
+from user_store import atomic_write  # temp file + rename
+
+# Save file layout: HEADER, then the mine, revealed and flagged bit planes, each (rows * cols + 7) // 8 bytes with
+# tiles in row-major order, most significant bit first.
+# Header: magic, format version, rows, cols, mines, mode, difficulty, flags (bit 0 first click done, bit 1 player's
+# turn, bit 2 no-guess generation), game timer milliseconds, mine seed.
+SAVE_MAGIC = b"MSSAV"
+SAVE_VERSION = 1
+HEADER = struct.Struct("<5sBIIIBBBQQ")
+
+# Settings are stored as their index in these tuples
+MODES = (AI_INTERACTIVE, AI_AUTOMATIC, AI_MANUAL)
+DIFFICULTIES = (EASY, MEDIUM, HARD)
+
+# Byte translation tables: tile byte (0 = empty/False) -> ASCII bit, and back
+_TO_BIT = bytes(48 if i == 0 else 49 for i in range(256))
+_FROM_BIT = bytes(1 if i == 49 else 0 for i in range(256))
+
+
+def snapshot_rows(rows):
+    """One byte per tile (non-zero = set) for a 2D list of bools or grid values. Cheap enough for the main thread."""
+    return b"".join(map(bytes, rows))
+
+
+def pack_bits(tiles):
+    """Pack one byte per tile (from snapshot_rows) into one bit per tile."""
+    bits = tiles.translate(_TO_BIT)
+    bits += b"0" * (-len(bits) % 8)  # pad the last byte
+    if not bits:
+        return b""
+    return int(bits, 2).to_bytes(len(bits) // 8, "big")
+
+
+def unpack_bits(data, count):
+    """Unpack count tiles from pack_bits output back into one byte (0 or 1) per tile."""
+    if count == 0:
+        return b""
+    bits = format(int.from_bytes(data, "big"), f"0{len(data) * 8}b")
+    return bits[:count].encode("ascii").translate(_FROM_BIT)
+
+
+class SavedGame:
+    """Everything needed to put a game back on the screen. Tile data is one byte per tile in row-major order."""
+
+    def __init__(self, rows, cols, mines, mode, difficulty, first_click_done, player_turn, elapsed_ms, seed,
+                 mine_tiles, revealed_tiles, flagged_tiles, generation=GEN_RANDOM):
+        self.rows = rows
+        self.cols = cols
+        self.mines = mines
+        self.mode = mode
+        self.difficulty = difficulty
+        self.first_click_done = first_click_done
+        self.player_turn = player_turn
+        self.elapsed_ms = elapsed_ms
+        self.seed = seed
+        self.mine_tiles = mine_tiles
+        self.revealed_tiles = revealed_tiles
+        self.flagged_tiles = flagged_tiles
+        self.generation = generation
+
+    def _rows_of(self, tiles, value):
+        cols = self.cols
+        return [[value * b for b in tiles[r * cols:(r + 1) * cols]] for r in range(self.rows)]
+
+    def grid(self):
+        """The mine grid as a 2D list (MINE or 0)."""
+        return self._rows_of(self.mine_tiles, MINE)
+
+    def revealed(self):
+        return self._rows_of(self.revealed_tiles, True)
+
+    def flagged(self):
+        return self._rows_of(self.flagged_tiles, True)
+
+
+def encode_game(game):
+    """Turn a SavedGame into the bytes of a save file."""
+    flags = ((1 if game.first_click_done else 0) | (2 if game.player_turn else 0)
+             | (4 if game.generation == GEN_NO_GUESS else 0))
+    header = HEADER.pack(SAVE_MAGIC, SAVE_VERSION, game.rows, game.cols, game.mines, MODES.index(game.mode),
+                         DIFFICULTIES.index(game.difficulty), flags, max(0, game.elapsed_ms), game.seed)
+    return b"".join((header, pack_bits(game.mine_tiles), pack_bits(game.revealed_tiles), pack_bits(game.flagged_tiles)))
+
+
+def decode_game(data):
+    """Turn the bytes of a save file back into a SavedGame. Raises ValueError if the data isn't a valid save."""
+    if len(data) < HEADER.size:
+        raise ValueError("save file is too short")
+    magic, version, rows, cols, mines, mode, difficulty, flags, elapsed_ms, seed = HEADER.unpack_from(data, 0)
+    count = rows * cols
+    plane = (count + 7) // 8
+    if magic != SAVE_MAGIC or version != SAVE_VERSION or len(data) != HEADER.size + 3 * plane:
+        raise ValueError("not a save file from this version of the game")
+    if mode >= len(MODES) or difficulty >= len(DIFFICULTIES):
+        raise ValueError("unknown mode or difficulty in save file")
+    planes = [unpack_bits(data[HEADER.size + i * plane:HEADER.size + (i + 1) * plane], count) for i in range(3)]
+    return SavedGame(rows, cols, mines, MODES[mode], DIFFICULTIES[difficulty], bool(flags & 1), bool(flags & 2),
+                     elapsed_ms, seed, *planes, generation=GEN_NO_GUESS if flags & 4 else GEN_RANDOM)
+
+
+def load_game(path):
+    """Read the save file at path. Returns None if there is no usable save."""
+    try:
+        with open(path, "rb") as f:
+            return decode_game(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+class GameSaver:
+    """Writes the latest save in the background.
+
+    save() only stores the SavedGame and wakes the writer thread, which encodes and writes it. If several saves
+    arrive before the writer gets to them only the newest is written. delete() is queued the same way, so a save
+    that is still waiting can never bring back a finished game.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()  # guards _pending
+        self._pending = None  # newest SavedGame to write, or False to delete the file
+        self._idle = threading.Event()  # set while nothing is waiting to be written
+        self._idle.set()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._writer, name="game-saver", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def exists(self):
+        """True if there is a save on disk (or one about to be written)."""
+        with self._lock:
+            if self._pending is not None:
+                return self._pending is not False
+        return os.path.exists(self.path)
+
+    def save(self, game):
+        self._submit(game)
+
+    def delete(self):
+        self._submit(False)
+
+    def _submit(self, item):
+        with self._lock:
+            self._pending = item
+            self._idle.clear()
+        self._wake.set()
+
+    def _writer(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            with self._lock:
+                item, self._pending = self._pending, None
+            try:
+                if item is False:
+                    if os.path.exists(self.path):
+                        os.remove(self.path)
+                elif item is not None:
+                    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                    atomic_write(self.path, encode_game(item))
+            except OSError:
+                # Don't crash the game over a failed save
+                pass
+            with self._lock:
+                if self._pending is None:
+                    self._idle.set()
+            if self._closed and self._idle.is_set():
+                return
+
+    def flush(self):
+        """Block until the newest save (or delete) is on disk."""
+        self._idle.wait()
+
+    def close(self):
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
@@ -1,9 +1,10 @@
 """
 File Name: settings.py
 Module: src
-Function: Store a series of constants and their related values for use throughout the application. Also initializes pygame.
+Function: Store a series of constants and their related values for use throughout the application. Importing this file
+    has no side effects; pygame, the window, fonts and sound are started by app.py.
 Inputs: Assets from the assets folder to create constant path values.
-Outputs: Initialized pygame, mixer. Any constant values that are imported by other areas of the application.
+Outputs: Any constant values that are imported by other areas of the application.
 Authors:
     Blake Carlson
     Jack Bauer
@@ -13,10 +14,6 @@ Creation Date: 9/23/2025
 
 NOTE: All code in the file was authored by 1 or more of the authors. No outside sources were used for code
 """
-# Import sound effects class, pygame, and pygame's audio mixer
-from sfx import SFX
-import pygame 
-from pygame import mixer
 import os # For file path logic
 
 # define visual asset path variables
@@ -25,20 +22,57 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 ASSETS_DIR = os.path.join(PROJECT_ROOT, "assets")
 NUM_DIR = os.path.join(ASSETS_DIR, "numbers")
 SOUND_DIR = os.path.join(ASSETS_DIR, "sounds")
+CACHE_DIR = os.path.join(ASSETS_DIR, "cache")  # decoded/processed asset caches (safe to delete)
+# How big the folder of finished circular profile pictures may grow
+PROFILE_CACHE_MAX_BYTES = 2 * 1024 * 1024
+# Imported profile pictures are downscaled to fit in this many pixels (width and height)
+PROFILE_IMAGE_MAX_SIZE = 256
+
+# Where player data lives (accounts, leaderboard, game log, saves, profiler output). Defaults to the assets folder;
+# the MINESWEEPER_DATA_DIR environment variable points it somewhere else (e.g. a throwaway folder for test runs).
+DATA_DIR = os.environ.get("MINESWEEPER_DATA_DIR", ASSETS_DIR)
+USER_FILE_PATH = os.path.join(DATA_DIR, "user.json")
+# Imported profile pictures (see pfp_helper.py)
+PROFILE_IMAGES_DIR = os.path.join(DATA_DIR, "images", "profiles")
+# Finished circular profile pictures (safe to delete), see profile_cache.py
+PROFILE_CACHE_DIR = os.path.join(DATA_DIR, "images", "profiles", "cache")
+
+# Seconds the user store waits after a change before writing user.json (changes in between share one write)
+USER_STORE_WRITE_DELAY = 0.5
+
+# Where accounts are stored: "json" (assets/user.json) or "sqlite" (assets/users.db, migrated from user.json once).
+# Can be overridden with the MINESWEEPER_USER_STORE environment variable.
+USER_STORE_BACKEND = os.environ.get("MINESWEEPER_USER_STORE", "json")
+USER_DB_PATH = os.path.join(DATA_DIR, "users.db")
+
+# Every finished game (one JSON line each), and how many entries the menu leaderboard shows
+LEADERBOARD_PATH = os.path.join(DATA_DIR, "leaderboard.jsonl")
+LEADERBOARD_SIZE = 5
+
+# Binary log of every game played (seed, settings, moves, result), see game_log.py
+GAME_LOG_PATH = os.path.join(DATA_DIR, "logs", "games.mslog")
+
+# Autosave of the game in progress (see savegame.py)
+SAVE_GAME_PATH = os.path.join(DATA_DIR, "saves", "current.sav")
+
+# Frame profiler: frames kept per phase (10 seconds at 60 fps), and where F4 writes them as CSV
+FRAME_PROFILE_SIZE = 600
+FRAME_PROFILE_DIR = os.path.join(DATA_DIR, "logs")
+# cProfile / tracemalloc session reports (see profiling.py)
+PROFILE_DIR = os.path.join(DATA_DIR, "logs", "profiles")
+
+# Audio mixer format (passed to pygame.mixer.pre_init by app.py before the mixer starts)
+MIXER_FREQUENCY = 44100
+MIXER_SIZE = -16
+MIXER_CHANNELS = 2
+# Samples per audio buffer: smaller means lower sound latency but more risk of crackling on slow machines.
+# Can be overridden with the MINESWEEPER_MIXER_BUFFER environment variable.
+MIXER_BUFFER = int(os.environ.get("MINESWEEPER_MIXER_BUFFER", "512"))
+SFX_VOICES = 8  # number of mixer channels sound effects can play on at once
 
 # Screen setup
-try:
-    pygame.mixer.pre_init(frequency=44100, size=-16, channels=2, buffer=512)
-except: 
-    pass
-
-pygame.init()  # start pygame
-sfx = SFX(SOUND_DIR)
-clock = pygame.time.Clock() # for smooth animation
-
 WIDTH, HEIGHT = 850, 650  # Set height and width of the screen
-screen = pygame.display.set_mode((WIDTH, HEIGHT))  # create the screen
-pygame.display.set_caption("Minesweeper")  # title the program
+WINDOW_TITLE = "Minesweeper"  # title the program
 
 # Colors
 WHITE = (255, 255, 255)  # define white on the RGB scale
@@ -53,10 +87,10 @@ GRAY = (100, 100, 100)  # define grey on the RGB scale
 LIGHT_GRAY = (200, 200, 200)  # define light grey on the RGB scale
 CONFETTI_COLORS = [(255, 99, 132), (255, 205, 86), (75, 192, 192), (54, 162, 235), (153, 102, 255), (255, 159, 64)] # define colors for win scenario
 
-# Fonts
-font = pygame.font.Font(None, 60)  # Bigger font for titles
-small_font = pygame.font.Font(None, 36)  # Smaller font for buttons/text
-tiny_font = pygame.font.Font(None, 18)  # Tiny font for sfx info
+# Font sizes (fonts themselves are created by app.py once pygame is running)
+FONT_SIZE = 60  # Bigger font for titles
+SMALL_FONT_SIZE = 36  # Smaller font for buttons/text
+TINY_FONT_SIZE = 18  # Tiny font for sfx info
 
 # Game states
 MENU = "menu"  # define the menu state
@@ -74,12 +108,40 @@ AI_INTERACTIVE = "Interactive" # AI and player take turns
 AI_AUTOMATIC = "Automatic" # AI plays the entire game
 AI_MANUAL = "Manual" # Player only mode (no AI)
 
+# Board generation
+GEN_RANDOM = "Random"  # mines anywhere except around the first click
+GEN_NO_GUESS = "No Guess"  # every board can be solved from the first click without guessing
+NO_GUESS_MAX_TILES = 100 * 100  # larger boards are always generated randomly
+# No-guess generation speed targets in boards per second, per (board size, mines) from BOARD_SIZES
+# (checked by python solver.py --benchmark, which averages at least 20 boards per size: single 100 x 100 boards take
+# anywhere from 0.15 to 2 seconds; the average measured about 1.7 boards/s)
+NO_GUESS_TARGETS = {(10, 10): 500, (16, 40): 100, (30, 180): 20, (100, 2000): 1}
+
+# Boards built ahead of time while the menu is open (see board_pool.py)
+BOARD_POOL_DEPTH = 4  # boards kept ready per configuration
+BOARD_POOL_TILES = 1_000_000  # at most this many tiles kept ready per configuration (big boards keep fewer)
+BOARD_POOL_CONFIGS = 3  # configurations kept (the most recently chosen ones)
+BOARD_POOL_SETTLE = 0.3  # seconds a configuration must stay chosen before boards are built for it
+# Seconds the first click waits for a board the pool didn't have before the game shows it as still being built
+BOARD_BUILD_WAIT = 0.01
+
 # grid settings
 GRID_SIZE = 10  # set each blank space between squares to be 10 pixels
 TILE_SIZE = 40  # set each square to be 40 pixels
 GRID_START_X = (WIDTH - GRID_SIZE * TILE_SIZE) // 2  # calucate the middle of the board so that the board is centred
 GRID_START_Y = 100  # place the top of the board slightly from the top
 
+# Board viewport settings (boards larger than GRID_SIZE x GRID_SIZE scroll inside the same screen area)
+MIN_TILE_SIZE = 8  # smallest zoom level; keeps the number of tiles drawn per frame bounded
+MAX_TILE_SIZE = 80  # largest zoom level
+PAN_SPEED = 600  # pixels per second when panning with the arrow keys / WASD
+FPS = 60  # frame rate cap
+AI_MOVE_DELAY = 0.5  # seconds the AI "thinks" before each move
+
+# Board sizes selectable in settings, paired with the mine count they start with
+BOARD_SIZES = [(10, 10), (16, 40), (30, 180), (100, 2000), (1000, 150000)]
+MIN_MINES = 10  # fewest mines allowed on any board
+
 MINE = 3  # define mine as 3 (the value of an array should be 3 when a mine is placed there)
 DIRS8 = [(-1, -1), (-1, 0), (-1, 1),
          # create a matrix to easily be able to refference the adjactent tiles for recusive uncovering.
@@ -18,108 +18,200 @@ NOTE: All code in the file was authored by 1 or more of the authors. No outside
 from pygame import mixer # import pygame's audio system
 import pygame # import pygame
 import os # import os for path related tools
-import random # so we can randomly select a song to play 
+import time # rate limiting sound effects
+from sound_cache import load_sound # decoded sound effect cache
+from playlist import Playlist # shuffled background music playlist
+from settings import SFX_VOICES # size of the sound effect voice pool
 
 
 class SFX:
-    def __init__(self, sound_dir):
+    MUSIC_VOLUME = 0.1 # Background music volume while not muted
+    SFX_VOLUME = 0.3 # Volume of every sound effect voice
+
+    # Sound effect name -> file in the sounds folder
+    EFFECT_FILES = {
+        "bomb_clicked": "bomb-clicked.mp3",
+        "flag_placed": "flag-placed.mp3",
+        "loss": "loss.mp3",
+        "win": "win.mp3",
+        "square_revealed": "square-revealed.mp3",
+        "flag_popped": "flag-popped.mp3",
+    }
+
+    # Sound effect name -> (priority, minimum seconds between two plays of it).
+    # When every voice is busy a new sound may only take over a voice playing something of equal or lower
+    # priority, so the win/loss sounds are never cut off by a reveal. The minimum gap keeps fast AI play or a big
+    # flood reveal from starting the same short sound hundreds of times a second.
+    EFFECT_RULES = {
+        "square_revealed": (0, 0.05),
+        "flag_placed": (1, 0.03),
+        "flag_popped": (1, 0.03),
+        "bomb_clicked": (2, 0.0),
+        "loss": (3, 0.0),
+        "win": (3, 0.0),
+    }
+
+    def __init__(self, sound_dir, load_sounds=True):
+        # With load_sounds=False only the mixer is started; the effects and music are handed in later by the
+        # asset loader (set_effect / load_music) and anything not loaded yet is simply silent.
         # Use a try-except block so that if there are any initialization errors (such as in the case the host lacks
         # an audio driver) the program won't crash. Instead, we appropriately set the "enabled" flag to disable 
         # the SFX system. 
         try: 
-            # Create channel strictly for sound effects and music
+            # Create a pool of channels ("voices") strictly for sound effects so overlapping sounds don't cut each
+            # other off. Music doesn't use a channel: it is streamed from disk through mixer.music so the whole
+            # track is never decoded into memory.
             self.sound_dir = sound_dir
             mixer.init()
-            
-            self.sfx_channel = mixer.Channel(0)
-            self.music_channel = mixer.Channel(1)
-            mixer.set_reserved(1) # Ensure nothing else can play on music channel
-            
+
+            mixer.set_num_channels(SFX_VOICES)
+            mixer.set_reserved(SFX_VOICES) # Ensure nothing else can play on the sound effect channels
+            self.voices = [mixer.Channel(i) for i in range(SFX_VOICES)]
+            # Per voice: (priority, start time) of the sound it was last given
+            self.voice_info = [(0, 0.0)] * SFX_VOICES
+            # Effect name -> when it last started playing (for rate limiting)
+            self.last_played = {}
+
             # Set channel volumes
-            self.sfx_channel.set_volume(0.3)
-            self.music_channel.set_volume(0.1)
-
-            # Choose random background music from directory, create song name for printing
-            background_music_choice = random.choice(os.listdir(os.path.join(sound_dir, "bgmusic")))
-            print(f"{os.path.join(sound_dir, 'bgmusic', background_music_choice)}")
-            self.background_music = mixer.Sound(os.path.join(sound_dir, "bgmusic", background_music_choice))
-            music_choice = background_music_choice[:background_music_choice.index('-')].replace("_"," ")
-            music_choice = ''.join([i for i in music_choice if not i.isdigit()])
-            self.song_name = music_choice[1:]
-
-            # Create pygame sound objects for music and game sounds
-            self.bomb_clicked_sound = mixer.Sound(os.path.join(sound_dir,"bomb-clicked.mp3"))
-            self.flag_placed_sound = mixer.Sound(os.path.join(sound_dir,"flag-placed.mp3"))
-            self.loss_sound = mixer.Sound(os.path.join(sound_dir,"loss.mp3"))
-            self.win_sound = mixer.Sound(os.path.join(sound_dir,"win.mp3"))
-            self.square_revealed_sound = mixer.Sound(os.path.join(sound_dir,"square-revealed.mp3"))
-            self.flagg_popped_sound = mixer.Sound(os.path.join(sound_dir, "flag-popped.mp3"))
+            for voice in self.voices:
+                voice.set_volume(self.SFX_VOLUME)
+            mixer.music.set_volume(self.MUSIC_VOLUME)
 
+            # Pygame sound objects for the game sounds, keyed by effect name
+            self.sounds = {}
+            self.song_name = ""
+            self.music_loaded = False
+            self.playlist = None
 
             self.muted = False
-            self.enabled = True            
+            self.enabled = True
+
+            if load_sounds:
+                # Create pygame sound objects for music and game sounds
+                for name, path in self.effect_paths():
+                    self.set_effect(name, load_sound(path))
+                self.load_music()
         except:
             self.enabled = False
 
+    def effect_paths(self):
+        # (name, full path) of every sound effect file
+        return [(name, os.path.join(self.sound_dir, filename)) for name, filename in self.EFFECT_FILES.items()]
+
+    def set_effect(self, name, sound):
+        # Install a decoded sound effect (may be called from the asset loader after startup)
+        self.sounds[name] = sound
+
+    def load_music(self):
+        # Index the background music folder once (random order) and open the first song
+        if not self.enabled:
+            return
+        self.playlist = Playlist(os.path.join(self.sound_dir, "bgmusic"))
+        if not len(self.playlist):
+            return
+        self._load_current_track()
+        self.music_loaded = True
+        # Get the following song ready so the first Skip is instant too
+        self.playlist.prefetch_next()
+
+    def _load_current_track(self):
+        # Open the playlist's current song for streaming and update the song name shown on screen
+        track = self.playlist.current()
+        source = self.playlist.open_current()
+        # Only opens the file (or the prefetched bytes); decoding happens a little at a time while it plays
+        if isinstance(source, str):
+            mixer.music.load(source)
+        else:
+            mixer.music.load(source, os.path.splitext(track.path)[1][1:])
+        self.song_name = track.title
+
+    def _play(self, name):
+        # Play a sound effect if the system is enabled and the effect has been loaded
+        if not self.enabled:
+            return
+        sound = self.sounds.get(name)
+        if sound is None:
+            return
+        priority, min_gap = self.EFFECT_RULES.get(name, (0, 0.0))
+
+        # Rate limit: skip it if the same effect started less than min_gap seconds ago
+        now = time.monotonic()
+        if now - self.last_played.get(name, -min_gap) < min_gap:
+            return
+
+        voice = self._pick_voice(priority)
+        if voice is None:
+            # Every voice is busy with something more important
+            return
+        self.voices[voice].play(sound)
+        self.voice_info[voice] = (priority, now)
+        self.last_played[name] = now
+
+    def _pick_voice(self, priority):
+        # Index of an idle voice, or else of the voice to steal: the lowest priority one (oldest first among equals),
+        # as long as it isn't more important than the new sound. None if nothing can be used.
+        steal = None
+        for i, voice in enumerate(self.voices):
+            if not voice.get_busy():
+                return i
+            if self.voice_info[i][0] <= priority and (steal is None or self.voice_info[i] < self.voice_info[steal]):
+                steal = i
+        return steal
+
     def stop_sfx(self):
         # Stop any sounds from being played
         if self.enabled:
-            self.sfx_channel.stop()
+            for voice in self.voices:
+                voice.stop()
 
     def ensure_bgmusic(self):
         # Use short circuit evaluation to ensure that we are enabled before we call any SFX methods
-        if self.enabled and not self.music_channel.get_busy():
+        if self.enabled and not mixer.music.get_busy():
                 self.start_bgmusic()
 
+    def set_music_muted(self, muted):
+        # Mute or unmute the background music (sound effects are unaffected)
+        if self.enabled:
+            mixer.music.set_volume(0 if muted else self.MUSIC_VOLUME)
+            self.muted = muted
+
     def play_flag_placed(self):
         # Play flag placed sound
-        if self.enabled:
-            self.sfx_channel.play(self.flag_placed_sound)
+        self._play("flag_placed")
     def play_bomb_clicked(self):
         # Play bomb clicked sound
-        if self.enabled:
-            self.sfx_channel.play(self.bomb_clicked_sound)
+        self._play("bomb_clicked")
     def play_win(self):
         # Play win sound
-        if self.enabled:
-            self.sfx_channel.play(self.win_sound)
+        self._play("win")
     def play_loss(self):
         # Play loss sound
-        if self.enabled:
-            self.sfx_channel.play(self.loss_sound)
+        self._play("loss")
     def play_square_revealed(self):
         # Play revealed sound
-        if self.enabled:
-            self.sfx_channel.play(self.square_revealed_sound)
+        self._play("square_revealed")
     def play_flag_popped(self):
         # Play popped sound
-        if self.enabled:
-            self.sfx_channel.play(self.flagg_popped_sound)
+        self._play("flag_popped")
     def start_bgmusic(self):
-        # Start background music
-        if self.enabled:
-            self.music_channel.play(self.background_music, loops=-1)
+        # Start background music, looping forever (the stream loops without a gap)
+        if self.enabled and self.music_loaded:
+            mixer.music.play(loops=-1)
 
     def change_song(self):
-        if not self.enabled:
+        if not self.enabled or not self.music_loaded:
             return
         # Stop music before change
-        self.music_channel.stop()
-        choice =None
-        background_music_choice =None
-
-        # Loop until we find a song that isn't the current one
-        while choice == self.song_name or choice is None: 
-            background_music_choice = random.choice(os.listdir(os.path.join(self.sound_dir, "bgmusic")))
-            music_choice = background_music_choice[:background_music_choice.index('-')].replace("_"," ")
-            music_choice = ''.join([i for i in music_choice if not i.isdigit()])
-            choice = music_choice[1:]
-
-        # Update music choice and play song
-        self.background_music = mixer.Sound(os.path.join(self.sound_dir, "bgmusic", background_music_choice))
-        self.song_name = choice
+        mixer.music.stop()
+
+        # Move to the next song in the shuffled order (with a single song this restarts it) and play it
+        self.playlist.advance()
+        self._load_current_track()
         self.start_bgmusic()
 
+        # Read the song after this one in the background
+        self.playlist.prefetch_next()
+
 
     def draw_sfx_info(self, surface, WIDTH, HEIGHT, WHITE, tiny_font):
         if not self.enabled:
@@ -0,0 +1,114 @@
+"""
+File Name: simulate.py
+Module: src
+Function: Play many AI games without a window, as fast as the computer allows, and report win rate, game times and
+    scores. Each game runs on a seeded board (the same boards the game would build from those seeds) and its timer
+    reads a FrameClock that moves forward one frame of the automatic mode per AI move (AI_MOVE_DELAY plus one frame
+    at FPS), so the times and scores are the ones the game would have shown, without waiting for them.
+Inputs: Board size, mine count, AI difficulty, number of games and the first seed.
+Outputs: A summary printed to the console.
+Authors:
+    Minesweeper project contributors (see the git history of this file)
+Creation Date: 10/19/2026
+
+Usage (from the src folder):
+    python simulate.py --games 5000 --difficulty hard --size 10 --mines 10
+"""
+
+import sys  # exit codes
+import random  # the AI's own random choices
+import argparse  # command line options
+from time import perf_counter  # measure simulation speed
+from replay import Replay
+from strategies import STRATEGIES, make_strategy
+from game_log import LoggedGame, RESULT_WIN, RESULT_LOSS
+from game_timer import GameTimer, FrameClock
+from leaderboard import compute_score
+from settings import AI_AUTOMATIC, AI_MOVE_DELAY, FPS, HARD, GRID_SIZE, MIN_MINES, GEN_RANDOM, GEN_NO_GUESS
+
+# Game time one AI move takes in automatic mode: the delay before the move plus the frame it is made in
+MOVE_MS = int(AI_MOVE_DELAY * 1000) + 1000 // FPS
+
+
+class SimulatedGame:
+    """The outcome of one simulated game."""
+
+    def __init__(self, seed, result, moves, elapsed_ms, score, guesses=0, decision_s=0.0):
+        self.seed = seed
+        self.result = result  # RESULT_WIN, RESULT_LOSS or None if the AI stalled
+        self.moves = moves
+        self.elapsed_ms = elapsed_ms  # game time
+        self.score = score
+        self.guesses = guesses  # reveals the strategy could not prove safe
+        self.decision_s = decision_s  # real time spent choosing moves
+
+
+def simulate_game(seed, rows, cols, mines, strategy, move_ms=MOVE_MS, max_moves=None, generation=GEN_RANDOM):
+    """Let a registered strategy (e.g. an AI difficulty) play the board built from seed with the given board
+    generation. The timer runs from the first reveal, like in the game."""
+    game = LoggedGame(seed, rows, cols, mines, AI_AUTOMATIC, strategy, 0, "", generation)
+    board = Replay(game)
+    clock = FrameClock(move_ms)
+    timer = GameTimer(clock)
+    # The AI's random guesses are seeded too, so a game can be played again exactly. The strategy gets its own
+    # generator: the shared random module is left alone for whatever else runs in this process
+    rng = random.Random(seed)
+    solver = make_strategy(strategy, board.grid, board.counts, board.revealed, board.flagged, rng)
+    limit = max_moves if max_moves is not None else rows * cols * 2
+    moves = guesses = 0
+    decision_s = 0.0
+    while board.result is None and moves < limit:
+        clock.tick()
+        started = perf_counter()
+        row, col, action = solver.make_move()
+        decision_s += perf_counter() - started
+        if row is None or col is None:
+            break
+        moves += 1
+        guesses += solver.guessed
+        if action == "reveal" and board.flagged[row][col]:
+            # The game lifts the flag before an AI reveal
+            board.apply(row, col, "unflag")
+        first = not board.first_click_done
+        board.apply(row, col, action)
+        if first and board.first_click_done:
+            # The first reveal moved the mines: start the timer and give the AI the final board
+            timer.start()
+            solver = make_strategy(strategy, board.grid, board.counts, board.revealed, board.flagged, rng)
+    timer.stop()
+    elapsed = timer.get_elapsed_time_ms()
+    score = compute_score(mines, elapsed) if board.result == RESULT_WIN else 0
+    return SimulatedGame(seed, board.result, moves, elapsed, score, guesses, decision_s)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate AI games with realistic game times and scores.")
+    parser.add_argument("--games", type=int, default=1000, help="number of games (default 1000)")
+    parser.add_argument("--size", type=int, default=GRID_SIZE, help="board rows and columns (default %(default)s)")
+    parser.add_argument("--mines", type=int, default=MIN_MINES, help="mine count (default %(default)s)")
+    parser.add_argument("--difficulty", choices=sorted(STRATEGIES), default=HARD, help="AI difficulty (or strategy)")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the first game; game i uses seed + i")
+    parser.add_argument("--move-ms", type=int, default=MOVE_MS, help="game time per AI move (default %(default)s)")
+    parser.add_argument("--generation", choices=(GEN_RANDOM, GEN_NO_GUESS), default=GEN_RANDOM,
+                        help="how boards are built (default %(default)s)")
+    args = parser.parse_args(argv)
+
+    started = perf_counter()
+    games = [simulate_game(args.seed + i, args.size, args.size, args.mines, args.difficulty, args.move_ms,
+                           generation=args.generation)
+             for i in range(args.games)]
+    took = perf_counter() - started
+
+    wins = [g for g in games if g.result == RESULT_WIN]
+    losses = sum(1 for g in games if g.result == RESULT_LOSS)
+    print(f"{len(games)} games in {took:.2f}s ({len(games) / took:.0f} games/s)")
+    print(f"Wins {len(wins)} ({100 * len(wins) / len(games):.1f}%), losses {losses}, "
+          f"stalled {len(games) - len(wins) - losses}")
+    if wins:
+        print(f"Won games: mean time {sum(g.elapsed_ms for g in wins) / len(wins) / 1000:.2f}s, "
+              f"mean score {sum(g.score for g in wins) / len(wins):.0f}, best score {max(g.score for g in wins)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
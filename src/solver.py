@@ -0,0 +1,861 @@
+"""
+File Name: solver.py
+Module: src
+Function: A fast deduction solver and the no-guess board generator built on it. The solver plays a board the way a
+    careful player would, using only what is on screen: a number whose mines are all found clears its other
+    neighbors, a number with exactly as many hidden neighbors as missing mines flags them all, two overlapping
+    numbers are compared, and the total mine count is used at the end. It never guesses.
+    generate_no_guess() places mines away from the first click and runs the solver. When the solver gets stuck it
+    moves one mine from the stuck edge to an unexplored tile and carries on from where it stopped. The whole board
+    is only regenerated if repairs keep failing, so every board it returns can be solved from the first click
+    without guessing.
+    FrontierSolver is the playing side: it follows a game through reveals and flags, keeps a Zobrist hash of the
+    position up to date as it goes, and finds the safe tiles, the mines and every hidden tile's chance of being a
+    mine by solving each independent group of frontier tiles exactly. Solved groups go in an LRU transposition
+    table keyed by the group's hash, so a group that a move didn't touch (or that an earlier game already met) costs
+    one dictionary lookup.
+Inputs: Board size, mine count, first click and a random generator.
+Outputs: Boards as the same 2D lists the rest of the game uses.
+Authors:
+    Minesweeper project contributors (see the git history of this file)
+Creation Date: 10/19/2026
+
+Usage (from the src folder):
+    python solver.py --benchmark          boards/second for each board size against NO_GUESS_TARGETS
+"""
+
+import sys  # exit codes
+import random  # default generator
+import argparse  # command line options
+from math import comb  # ways to place the mines away from the frontier
+from collections import deque, OrderedDict  # tiles waiting to be looked at again, LRU transposition table
+from time import perf_counter  # benchmark timing
+from board import compute_counts, ensure_first_click_safe
+from settings import MINE, DIRS8, BOARD_SIZES, NO_GUESS_MAX_TILES, NO_GUESS_TARGETS
+
+# What the solver knows about each tile
+UNKNOWN = 0
+SAFE = 1  # revealed
+KNOWN_MINE = 2  # proven to be a mine
+
+# Fresh mine placements generate_no_guess tries before giving up (at the game's densities one is almost always enough)
+MAX_PLACEMENTS = 20
+
+# Neighbor lists for recently used board sizes, as flat tile indexes (row * cols + col)
+_neighbor_tables = {}
+
+
+def neighbor_table(rows, cols):
+    """For every tile (row-major index) the tuple of its neighbors' indexes. Cached per board size."""
+    key = (rows, cols)
+    table = _neighbor_tables.get(key)
+    if table is None:
+        table = []
+        for r in range(rows):
+            for c in range(cols):
+                table.append(tuple((r + dr) * cols + c + dc for dr, dc in DIRS8
+                                   if 0 <= r + dr < rows and 0 <= c + dc < cols))
+        if len(_neighbor_tables) >= 4:
+            _neighbor_tables.clear()
+        _neighbor_tables[key] = table
+    return table
+
+
+class Deducer:
+    """Solves a board by deduction alone. Tiles are flat indexes; counts holds the number shown on every safe tile.
+
+    open(tile) reveals a tile (flooding zeros), then run() deduces as far as it can and returns True once every safe
+    tile is revealed. Only tiles proven safe are ever opened, so the knowledge stays correct.
+    """
+
+    def __init__(self, rows, cols, mines, counts):
+        self.rows, self.cols, self.mines = rows, cols, mines
+        self.tiles = rows * cols
+        self.counts = counts
+        self.neighbors = neighbor_table(rows, cols)
+        self.state = bytearray(self.tiles)
+        self.opened = 0
+        self.known_mines = 0
+        self.frontier = set()  # revealed numbers that may still have hidden neighbors
+        self._queue = deque()  # revealed numbers to look at again
+        self._queued = bytearray(self.tiles)
+
+    def solved(self):
+        return self.opened == self.tiles - self.mines
+
+    def enqueue(self, tile):
+        # Look at a revealed number again (its neighbors or its count changed)
+        if self.state[tile] == SAFE and self.counts[tile] > 0 and not self._queued[tile]:
+            self._queued[tile] = 1
+            self._queue.append(tile)
+
+    def open(self, tile):
+        """Reveal a safe tile, flooding outwards from zeros."""
+        state, counts, neighbors = self.state, self.counts, self.neighbors
+        stack = [tile]
+        while stack:
+            t = stack.pop()
+            if state[t] != UNKNOWN:
+                continue
+            state[t] = SAFE
+            self.opened += 1
+            if counts[t] == 0:
+                stack.extend(n for n in neighbors[t] if state[n] == UNKNOWN)
+            else:
+                self.frontier.add(t)
+                self.enqueue(t)
+            # Numbers next to this tile have one hidden neighbor fewer now
+            for n in neighbors[t]:
+                if state[n] == SAFE:
+                    self.enqueue(n)
+
+    def mark_mine(self, tile):
+        if self.state[tile] != UNKNOWN:
+            return
+        self.state[tile] = KNOWN_MINE
+        self.known_mines += 1
+        for n in self.neighbors[tile]:
+            self.enqueue(n)
+
+    def _look(self, tile):
+        # Mines still missing around a number, and its hidden neighbors
+        need = self.counts[tile]
+        hidden = []
+        state = self.state
+        for n in self.neighbors[tile]:
+            s = state[n]
+            if s == UNKNOWN:
+                hidden.append(n)
+            elif s == KNOWN_MINE:
+                need -= 1
+        return need, hidden
+
+    def _single(self, tile):
+        # One number on its own: all missing mines found, or every hidden neighbor must be a mine
+        need, hidden = self._look(tile)
+        if not hidden:
+            self.frontier.discard(tile)
+        elif need == 0:
+            for n in hidden:
+                self.open(n)
+        elif need == len(hidden):
+            for n in hidden:
+                self.mark_mine(n)
+
+    def _pairs(self):
+        # Two numbers sharing hidden tiles. If A is missing as many more mines than B as A has hidden tiles of its
+        # own, those tiles are all mines and B's own hidden tiles are all safe (this covers A inside B as well).
+        info = {}
+        for tile in list(self.frontier):
+            need, hidden = self._look(tile)
+            if hidden:
+                info[tile] = (need, frozenset(hidden))
+            else:
+                self.frontier.discard(tile)
+        neighbors = self.neighbors
+        for a, (need_a, hidden_a) in info.items():
+            seen = {a}
+            for h in hidden_a:
+                for b in neighbors[h]:
+                    if b in seen or b not in info:
+                        continue
+                    seen.add(b)
+                    need_b, hidden_b = info[b]
+                    only_a = hidden_a - hidden_b
+                    if need_a - need_b == len(only_a):
+                        only_b = hidden_b - hidden_a
+                        if only_a or only_b:
+                            for n in only_a:
+                                self.mark_mine(n)
+                            for n in only_b:
+                                self.open(n)
+                            return True
+        return False
+
+    def _mine_count(self):
+        # The mine counter: no mines left means every hidden tile is safe, and as many mines as hidden tiles means
+        # they are all mines
+        left = self.mines - self.known_mines
+        hidden = self.tiles - self.opened - self.known_mines
+        if hidden == 0 or 0 < left < hidden:
+            return False
+        unknown = [t for t in range(self.tiles) if self.state[t] == UNKNOWN]
+        for t in unknown:
+            if left == 0:
+                self.open(t)
+            else:
+                self.mark_mine(t)
+        return True
+
+    def run(self):
+        """Deduce until stuck. Returns True if the board is solved."""
+        queue, queued = self._queue, self._queued
+        while True:
+            while queue:
+                tile = queue.popleft()
+                queued[tile] = 0
+                self._single(tile)
+            if self.solved():
+                return True
+            if not (self._pairs() or self._mine_count()):
+                return False
+
+    def stuck_tiles(self):
+        """Hidden tiles next to a revealed number that the solver could not decide."""
+        state, neighbors = self.state, self.neighbors
+        return {n for t in self.frontier for n in neighbors[t] if state[n] == UNKNOWN}
+
+
+def flat_counts(is_mine, neighbors):
+    """Number of neighboring mines for every tile of a flat mine map."""
+    return [sum(is_mine[n] for n in tile_neighbors) for tile_neighbors in neighbors]
+
+
+def _move_mine(source, target, is_mine, counts, neighbors):
+    is_mine[source] = 0
+    is_mine[target] = 1
+    for n in neighbors[source]:
+        counts[n] -= 1
+    for n in neighbors[target]:
+        counts[n] += 1
+
+
+def _random_tile(deducer, is_mine, wanted_state, avoid, rng, tries=64):
+    # A random tile in wanted_state, without a mine and not in avoid, found by random probes (None if the probes
+    # all miss, which only happens when such tiles are scarce)
+    state, tiles = deducer.state, deducer.tiles
+    for _ in range(tries):
+        t = rng.randrange(tiles)
+        if state[t] == wanted_state and not is_mine[t] and t not in avoid:
+            return t
+    return None
+
+
+def _repair(deducer, is_mine, counts, protected, rng):
+    """Move one mine so the stuck solver can go on. Returns True to continue, "restart" if the solver has to start
+    over, or False if no move helps (the caller then places all the mines again)."""
+    state, neighbors = deducer.state, deducer.neighbors
+    stuck = deducer.stuck_tiles()
+    stuck_mines = sorted(t for t in stuck if is_mine[t])
+    # Unexplored tiles (not next to anything revealed) are the best place for the mine: no number on screen changes
+    target = _random_tile(deducer, is_mine, UNKNOWN, stuck, rng)
+    if stuck_mines:
+        source = rng.choice(stuck_mines)
+        if target is None:
+            # The unexplored part is (nearly) full of mines. Move the mine back into the solved part instead; the
+            # numbers there change, so the solver starts over.
+            target = _random_tile(deducer, is_mine, SAFE, protected, rng)
+            if target is None:
+                return False
+            _move_mine(source, target, is_mine, counts, neighbors)
+            return "restart"
+        # Both tiles were undecided, so nothing the solver has deduced depended on them and it can carry on
+        _move_mine(source, target, is_mine, counts, neighbors)
+        for n in neighbors[source] + neighbors[target]:
+            deducer.enqueue(n)
+            if state[n] == SAFE and counts[n] == 0:
+                # A number that dropped to 0 clears its neighbors, like in the game
+                for m in neighbors[n]:
+                    deducer.open(m)
+        return True
+    # Nothing undecided on the edge: the unexplored part is walled off by proven mines. Move one of those into it.
+    walls = sorted(t for t in range(deducer.tiles) if state[t] == KNOWN_MINE
+                   and any(state[n] == UNKNOWN for n in neighbors[t]))
+    if not walls or target is None:
+        return False
+    _move_mine(rng.choice(walls), target, is_mine, counts, neighbors)
+    return "restart"
+
+
+def generate_no_guess(rows, cols, mines, first_row, first_col, rng=random, max_repairs=None,
+                      max_placements=MAX_PLACEMENTS):
+    """Place mines so the board can be solved from a first click on (first_row, first_col) without guessing.
+
+    Returns the flat mine map (bytearray, 1 = mine, row-major). The first click is always a zero. Raises ValueError
+    if the mines don't fit around the first click, and RuntimeError if max_placements fresh placements all get stuck.
+    """
+    tiles = rows * cols
+    neighbors = neighbor_table(rows, cols)
+    start = first_row * cols + first_col
+    protected = set(neighbors[start]) | {start}
+    allowed = [t for t in range(tiles) if t not in protected]
+    if mines > len(allowed):
+        raise ValueError(f"{mines} mines don't fit on a {rows}x{cols} board with a safe first click")
+    limit = max_repairs if max_repairs is not None else max(50, tiles // 4)
+    for _ in range(max_placements):
+        is_mine = bytearray(tiles)
+        for t in rng.sample(allowed, mines):
+            is_mine[t] = 1
+        counts = flat_counts(is_mine, neighbors)
+        deducer = Deducer(rows, cols, mines, counts)
+        deducer.open(start)
+        for _ in range(limit):
+            if deducer.run():
+                return is_mine
+            repaired = _repair(deducer, is_mine, counts, protected, rng)
+            if not repaired:
+                break
+            if repaired == "restart":
+                deducer = Deducer(rows, cols, mines, counts)
+                deducer.open(start)
+        # Too many repairs (or none possible): place every mine again
+    raise RuntimeError(f"no no-guess board found for {mines} mines on {rows}x{cols} in {max_placements} placements")
+
+
+def is_solvable(grid, first_row, first_col):
+    """True if a board (2D grid of MINE / 0) can be solved from a first click on (first_row, first_col)."""
+    rows, cols = len(grid), len(grid[0])
+    is_mine = bytearray(1 if v == MINE else 0 for row in grid for v in row)
+    counts = flat_counts(is_mine, neighbor_table(rows, cols))
+    start = first_row * cols + first_col
+    if is_mine[start]:
+        return False
+    deducer = Deducer(rows, cols, sum(is_mine), counts)
+    deducer.open(start)
+    return deducer.run()
+
+
+def ensure_first_click_no_guess(fr, fc, grid, counts, mine_count, rng=random):
+    """No-guess version of board.ensure_first_click_safe: rebuild the mines in grid (in place) so the board can be
+    solved without guessing from this first click. Returns the new adjacent-mine counts.
+
+    If generation gives up (only seen far above the game's 20% mine limit) the board is made the random way instead,
+    from the same generator, so replays still rebuild exactly the board that was played."""
+    rows, cols = len(grid), len(grid[0])
+    try:
+        is_mine = generate_no_guess(rows, cols, mine_count, fr, fc, rng)
+    except RuntimeError:
+        return ensure_first_click_safe(fr, fc, grid, counts, mine_count, rng)
+    for r in range(rows):
+        grid[r][:] = [MINE * m for m in is_mine[r * cols:(r + 1) * cols]]
+    return compute_counts(grid)
+
+
+# Visible tile states the frontier solver hashes: 0-8 is a revealed number
+HIDDEN = 9
+FLAGGED = 10
+TILE_STATES = 11
+MASK64 = (1 << 64) - 1
+TRANSPOSITION_SIZE = 50_000  # solved components kept in the transposition table
+MAX_COMPONENT_NODES = 50_000  # search steps per component before it is left undecided
+
+
+def zobrist(tile, state):
+    """The 64-bit Zobrist key of a tile in a visible state. Worked out from the index (splitmix64) rather than kept in
+    a table, so boards of any size need no setup."""
+    x = ((tile * TILE_STATES + state + 1) * 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+
+class TranspositionTable:
+    """A bounded LRU map from frontier component hashes to their solved results."""
+
+    def __init__(self, size=TRANSPOSITION_SIZE):
+        self.size = size
+        self._entries = OrderedDict()
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return result
+
+    def put(self, key, result):
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+
+# Shared by every FrontierSolver in the process, so games played one after another reuse each other's results
+TRANSPOSITIONS = TranspositionTable()
+
+
+class _TooBig(Exception):
+    """A component needs more than MAX_COMPONENT_NODES search steps."""
+
+
+def _search(variables, constraints, nodes, budget):
+    # Enumerate the layouts of a connected set of variables by backtracking: {mines: [layouts, {var: layouts}]}.
+    # nodes is a one-item list shared between calls so the budget covers the whole component.
+    constraints_of = {v: [] for v in variables}
+    for index, (_, members) in enumerate(constraints):
+        for v in members:
+            constraints_of[v].append(index)
+    # Search the variables in the order the numbers link them, so each number is closed off early
+    order = []
+    placed = {variables[0]}
+    queue = deque([variables[0]])
+    while queue:
+        v = queue.popleft()
+        order.append(v)
+        for index in constraints_of[v]:
+            for w in constraints[index][1]:
+                if w not in placed:
+                    placed.add(w)
+                    queue.append(w)
+    touched_by = [constraints_of[v] for v in order]
+    need = [n for n, _ in constraints]
+    left = [len(members) for _, members in constraints]
+    ones = []  # variables set to a mine on the current path
+    table = {}
+    size = len(order)
+
+    def search(i, mines):
+        nodes[0] += 1
+        if nodes[0] > budget:
+            raise _TooBig
+        if i == size:
+            entry = table.get(mines)
+            if entry is None:
+                entry = table[mines] = [0, dict.fromkeys(variables, 0)]
+            entry[0] += 1
+            per_var = entry[1]
+            for v in ones:
+                per_var[v] += 1
+            return
+        touched = touched_by[i]
+        for value in (0, 1):
+            fits = True
+            for index in touched:
+                left[index] -= 1
+                need[index] -= value
+                if need[index] < 0 or need[index] > left[index]:
+                    fits = False
+            if fits:
+                if value:
+                    ones.append(order[i])
+                    search(i + 1, mines + 1)
+                    ones.pop()
+                else:
+                    search(i + 1, mines)
+            for index in touched:
+                left[index] += 1
+                need[index] += value
+
+    search(0, 0)
+    return table
+
+
+def solve_component(size, constraints, budget=MAX_COMPONENT_NODES):
+    """Every mine layout of a frontier component. constraints are (mines needed, variable indexes) pairs over
+    variables 0 .. size-1. Returns {mines in the component: (layouts, tuple of layouts with a mine per variable)}
+    (empty if the numbers contradict each other), or None if the search goes over budget.
+
+    Numbers that settle their variables on their own are applied first. That often splits the component into
+    smaller independent pieces, which are searched one at a time and multiplied back together.
+    """
+    fixed = {}
+    constraints = [(need, list(members)) for need, members in constraints]
+    changed = True
+    while changed:
+        changed = False
+        for need, members in constraints:
+            open_vars = [v for v in members if v not in fixed]
+            need -= sum(fixed[v] for v in members if v in fixed)
+            if need < 0 or need > len(open_vars):
+                return {}
+            if open_vars and need in (0, len(open_vars)):
+                for v in open_vars:
+                    fixed[v] = 1 if need else 0
+                changed = True
+    # What is left of each number after the settled variables
+    remaining = []
+    for need, members in constraints:
+        open_vars = [v for v in members if v not in fixed]
+        if open_vars:
+            remaining.append((need - sum(fixed[v] for v in members if v in fixed), open_vars))
+    # Split the open variables into independent pieces
+    constraints_of = {}
+    for index, (_, members) in enumerate(remaining):
+        for v in members:
+            constraints_of.setdefault(v, []).append(index)
+    pieces = []
+    seen = set()
+    for v in constraints_of:
+        if v in seen:
+            continue
+        seen.add(v)
+        stack = [v]
+        piece_vars, piece_constraints = [], set()
+        while stack:
+            w = stack.pop()
+            piece_vars.append(w)
+            for index in constraints_of[w]:
+                piece_constraints.add(index)
+                for x in remaining[index][1]:
+                    if x not in seen:
+                        seen.add(x)
+                        stack.append(x)
+        pieces.append((piece_vars, [remaining[i] for i in piece_constraints]))
+    nodes = [0]
+    fixed_mines = sum(fixed.values())
+    # Start from the settled variables and fold each piece in
+    per_tile = [fixed.get(v, 0) for v in range(size)]
+    combined = {fixed_mines: (1, per_tile)}
+    try:
+        tables = [_search(piece_vars, piece_constraints, nodes, budget) for piece_vars, piece_constraints in pieces]
+    except _TooBig:
+        return None
+    for table in tables:
+        if not table:
+            return {}
+        merged = {}
+        for mines_a, (ways_a, per_a) in combined.items():
+            for mines_b, (ways_b, per_b) in table.items():
+                mines = mines_a + mines_b
+                ways, per = merged.get(mines, (0, [0] * size))
+                for v in range(size):
+                    per[v] += per_a[v] * ways_b
+                for v, count in per_b.items():
+                    per[v] += count * ways_a
+                merged[mines] = (ways + ways_a * ways_b, per)
+        combined = merged
+    return {mines: (ways, tuple(per)) for mines, (ways, per) in combined.items()}
+
+
+def estimate_component(size, constraints):
+    """Stand-in for a component too big to search: each variable's chance of a mine is the highest needed / hidden
+    ratio of the numbers around it, which is exactly 0 or 1 where a single number settles it. Returns a tuple."""
+    chance = [0.0] * size
+    settled = [False] * size
+    for need, variables in constraints:
+        ratio = need / len(variables)
+        for v in variables:
+            if ratio in (0.0, 1.0):
+                chance[v] = ratio
+                settled[v] = True
+            elif not settled[v]:
+                chance[v] = max(chance[v], ratio)
+    return tuple(chance)
+
+
+def _convolve(a, b):
+    # Distribution of the total mines of two independent groups ({mines: layouts})
+    out = {}
+    for i, x in a.items():
+        for j, y in b.items():
+            out[i + j] = out.get(i + j, 0) + x * y
+    return out
+
+
+class FrontierAnalysis:
+    """What the visible board proves: safe and mines are lists of tiles, probabilities maps every hidden tile next to
+    a number to its chance of being a mine, and interior is the chance for every other hidden tile."""
+
+    def __init__(self, safe, mines, probabilities, interior, consistent=True):
+        self.safe = safe
+        self.mines = mines
+        self.probabilities = probabilities
+        self.interior = interior
+        self.consistent = consistent  # False if the flags contradict the numbers (nothing is proven then)
+
+
+class FrontierSolver:
+    """Works out, from the visible board only, which hidden tiles are safe or mines and how likely each is a mine.
+
+    The board is followed through reveal(), flag() and unflag(). They keep each tile's Zobrist key and the hash of
+    the whole position up to date, and remember which tiles changed. analyze() only rebuilds the independent groups
+    of frontier tiles next to a change: a rebuilt group is looked up in the transposition table by its hash and only
+    solved if it is new, and untouched groups keep their result. The groups are then combined with the mine counter.
+    Flags are taken as mines, like the game's AI does.
+    """
+
+    def __init__(self, rows, cols, mines, table=None):
+        self.rows, self.cols, self.mines = rows, cols, mines
+        self.neighbors = neighbor_table(rows, cols)
+        self.state = bytearray([HIDDEN]) * (rows * cols)
+        self.keys = [zobrist(t, HIDDEN) for t in range(rows * cols)]  # each tile's key in its current state
+        self.table = table if table is not None else TRANSPOSITIONS
+        self.hash = 0  # Zobrist hash of the position, relative to the all-hidden board
+        self.hidden = rows * cols  # hidden tiles without a flag
+        self.flags = 0
+        self.frontier = set()  # revealed tiles with hidden neighbors, kept up to date by every change
+        self._dirty = set()  # tiles changed since the last analyze()
+        self._groups = {}  # group id -> (hidden tiles, numbers, layouts or None if too big)
+        self._group_of = {}  # hidden tile or number -> group id
+        self._next_group = 0
+        self._analysis = None
+        self._analysis_hash = None
+
+    def _set(self, tile, state):
+        key = zobrist(tile, state)
+        self.hash ^= self.keys[tile] ^ key
+        self.keys[tile] = key
+        self.state[tile] = state
+        self._dirty.add(tile)
+        # Only this tile and its neighbors can join or leave the frontier
+        neighbors = self.neighbors
+        for t in (tile, *neighbors[tile]):
+            if self.state[t] < HIDDEN and any(self.state[n] == HIDDEN for n in neighbors[t]):
+                self.frontier.add(t)
+            else:
+                self.frontier.discard(t)
+
+    def reveal(self, tile, count):
+        """A tile was revealed showing count."""
+        state = self.state[tile]
+        if state == HIDDEN:
+            self.hidden -= 1
+        elif state == FLAGGED:
+            self.flags -= 1
+        else:
+            return
+        self._set(tile, count)
+
+    def flag(self, tile):
+        if self.state[tile] == HIDDEN:
+            self._set(tile, FLAGGED)
+            self.hidden -= 1
+            self.flags += 1
+
+    def unflag(self, tile):
+        if self.state[tile] == FLAGGED:
+            self._set(tile, HIDDEN)
+            self.hidden += 1
+            self.flags -= 1
+
+    def sync(self, revealed, flagged, counts):
+        """Catch up with a board (2D lists) in one pass, e.g. when the solver is created mid-game."""
+        cols = self.cols
+        for r in range(self.rows):
+            revealed_row, flagged_row, counts_row = revealed[r], flagged[r], counts[r]
+            for c in range(cols):
+                if revealed_row[c]:
+                    self.reveal(r * cols + c, max(0, counts_row[c]))
+                elif flagged_row[c]:
+                    self.flag(r * cols + c)
+                else:
+                    self.unflag(r * cols + c)
+
+    def sync_reveal(self, tile, revealed, counts):
+        """Catch up after a reveal on tile: follows the flood through the tiles it opened, without scanning the
+        board."""
+        cols, state, neighbors = self.cols, self.state, self.neighbors
+        stack = [tile]
+        while stack:
+            t = stack.pop()
+            r, c = divmod(t, cols)
+            if not revealed[r][c] or state[t] < HIDDEN:
+                continue
+            count = max(0, counts[r][c])
+            self.reveal(t, count)
+            if count == 0:
+                stack.extend(n for n in neighbors[t] if state[n] >= HIDDEN)
+
+    def interior_tiles(self, analysis):
+        """Hidden, unflagged tiles the analysis has no probability of their own for."""
+        probabilities = analysis.probabilities
+        return [t for t, state in enumerate(self.state) if state == HIDDEN and t not in probabilities]
+
+    def _update_groups(self):
+        # Drop the groups next to a changed tile, then regroup their numbers (and any new ones)
+        state, neighbors, group_of = self.state, self.neighbors, self._group_of
+        touched = set(self._dirty)
+        for tile in self._dirty:
+            touched.update(neighbors[tile])
+        self._dirty.clear()
+        loose = {t for t in touched if t in self.frontier}
+        for tile in touched:
+            group = self._groups.pop(group_of.get(tile), None)
+            if group is None:
+                continue
+            hidden, numbers, _ = group
+            for t in hidden:
+                del group_of[t]
+            for t in numbers:
+                del group_of[t]
+            loose.update(numbers)
+        hidden_of = {}
+        for t in loose:
+            hidden = [n for n in neighbors[t] if state[n] == HIDDEN]
+            if hidden and state[t] < HIDDEN:
+                hidden_of[t] = hidden
+            else:
+                self.frontier.discard(t)
+        numbers_of = {}
+        for t, hidden in hidden_of.items():
+            for h in hidden:
+                numbers_of.setdefault(h, []).append(t)
+        done = set()
+        for first in hidden_of:
+            if first in done:
+                continue
+            done.add(first)
+            stack = [first]
+            numbers = []
+            tiles = set()
+            while stack:
+                t = stack.pop()
+                numbers.append(t)
+                for h in hidden_of[t]:
+                    if h not in tiles:
+                        tiles.add(h)
+                        for other in numbers_of[h]:
+                            if other not in done:
+                                done.add(other)
+                                stack.append(other)
+            tiles = sorted(tiles)
+            group = self._next_group
+            self._next_group += 1
+            self._groups[group] = (tiles, numbers, self._solve(tiles, numbers))
+            for t in tiles:
+                group_of[t] = group
+            for t in numbers:
+                group_of[t] = group
+
+    def _solve(self, tiles, numbers):
+        # A group's layouts, from the transposition table when this exact group was solved before. Its hash covers
+        # everything the layouts depend on: the numbers, their hidden tiles and their flags.
+        state, neighbors, keys = self.state, self.neighbors, self.keys
+        key = 0
+        for t in tiles:
+            key ^= keys[t]
+        flags = set()
+        constraints = []
+        for t in numbers:
+            key ^= keys[t]
+            flagged = [n for n in neighbors[t] if state[n] == FLAGGED]
+            flags.update(flagged)
+            constraints.append((state[t] - len(flagged), [n for n in neighbors[t] if state[n] == HIDDEN]))
+        for f in flags:
+            key ^= keys[f]
+        key = (key, len(tiles))
+        result = self.table.get(key)
+        if result is None:
+            position = {t: i for i, t in enumerate(tiles)}
+            constraints = [(need, [position[t] for t in hidden]) for need, hidden in constraints]
+            layouts = solve_component(len(tiles), constraints)
+            # Over budget is stored too (as an estimate), so the same group isn't searched again
+            result = (layouts, estimate_component(len(tiles), constraints) if layouts is None else None)
+            self.table.put(key, result)
+        return result
+
+    def analyze(self):
+        """The FrontierAnalysis of the current position (the same object again if nothing changed since last time)."""
+        if self._analysis is not None and self._analysis_hash == self.hash:
+            return self._analysis
+        self._update_groups()
+        solved = []
+        estimated = []
+        unconstrained = self.hidden
+        consistent = True
+        for tiles, _, (table, estimate) in self._groups.values():
+            if table is None:
+                # Too big to search: its tiles count as interior tiles for the mine counter, with their own estimate
+                estimated.append((tiles, estimate))
+                continue
+            if not table:
+                consistent = False
+                break
+            solved.append((tiles, table))
+            unconstrained -= len(tiles)
+        left = self.mines - self.flags
+        if not consistent or left < 0:
+            density = left / self.hidden if self.hidden and left > 0 else 0.0
+            analysis = FrontierAnalysis([], [], {}, min(1.0, density), consistent=False)
+        else:
+            analysis = self._combine(solved, unconstrained, left)
+            for tiles, estimate in estimated:
+                for tile, chance in zip(tiles, estimate):
+                    analysis.probabilities[tile] = chance
+                    if chance == 0.0:
+                        analysis.safe.append(tile)
+                    elif chance == 1.0:
+                        analysis.mines.append(tile)
+        self._analysis, self._analysis_hash = analysis, self.hash
+        return analysis
+
+    @staticmethod
+    def _combine(solved, unconstrained, left):
+        # Weigh every component's layouts by how many ways the rest of the mines fit in the other hidden tiles
+        def weight(mines):
+            rest = left - mines
+            return comb(unconstrained, rest) if 0 <= rest <= unconstrained else 0
+
+        dists = [{mines: ways for mines, (ways, _) in table.items()} for _, table in solved]
+        # prefix[i] combines components before i, suffix[i] components from i on
+        prefix = [{0: 1}]
+        for dist in dists:
+            prefix.append(_convolve(prefix[-1], dist))
+        suffix = [{0: 1}]
+        for dist in reversed(dists):
+            suffix.append(_convolve(suffix[-1], dist))
+        suffix.reverse()
+        total = sum(ways * weight(mines) for mines, ways in prefix[-1].items())
+        if total == 0:
+            return FrontierAnalysis([], [], {}, 0.0, consistent=False)
+        safe, mines_found, probabilities = [], [], {}
+        for i, (tiles, table) in enumerate(solved):
+            others = _convolve(prefix[i], suffix[i + 1])
+            for_count = {k: sum(ways * weight(k + s) for s, ways in others.items()) for k in table}
+            for v, tile in enumerate(tiles):
+                mine_weight = sum(per_tile[v] * for_count[k] for k, (_, per_tile) in table.items())
+                if mine_weight == 0:
+                    safe.append(tile)
+                elif mine_weight == total:
+                    mines_found.append(tile)
+                probabilities[tile] = mine_weight / total
+        interior = 0.0
+        if unconstrained:
+            expected = sum(ways * weight(mines) * (left - mines) for mines, ways in prefix[-1].items())
+            interior = expected / total / unconstrained
+        return FrontierAnalysis(safe, mines_found, probabilities, interior)
+
+
+def benchmark(seconds=2.0, seed=1, min_boards=20):
+    """Generate no-guess boards for each board size (up to NO_GUESS_MAX_TILES) for about `seconds` each and at least
+    min_boards of them (single boards vary several-fold in generation time, so a short run on a big board would measure
+    one or two lucky or unlucky boards), check every board with a fresh solver, and compare the rate with
+    NO_GUESS_TARGETS. Returns True if every target is met."""
+    rng = random.Random(seed)
+    all_met = True
+    print(f"{'board':>10} {'mines':>6} {'density':>8} {'boards/s':>10} {'target':>8}")
+    for size, mines in BOARD_SIZES:
+        if size * size > NO_GUESS_MAX_TILES:
+            print(f"{size:>4} x {size:<4} {mines:>6} {mines / (size * size):>8.1%}   (larger than NO_GUESS_MAX_TILES)")
+            continue
+        boards = 0
+        started = perf_counter()
+        while perf_counter() - started < seconds or boards < min_boards:
+            first = rng.randrange(size), rng.randrange(size)
+            is_mine = generate_no_guess(size, size, mines, *first, rng)
+            grid = [[MINE * m for m in is_mine[r * size:(r + 1) * size]] for r in range(size)]
+            assert sum(is_mine) == mines and is_solvable(grid, *first), "generated board is not solvable"
+            boards += 1
+        rate = boards / (perf_counter() - started)
+        target = NO_GUESS_TARGETS.get((size, mines))
+        met = target is None or rate >= target
+        all_met = all_met and met
+        print(f"{size:>4} x {size:<4} {mines:>6} {mines / (size * size):>8.1%} {rate:>10.1f} "
+              f"{target if target is not None else '-':>8} {'' if met else '  BELOW TARGET'}")
+    return all_met
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="No-guess board generation tools.")
+    parser.add_argument("--benchmark", action="store_true", help="measure boards/second for each board size")
+    parser.add_argument("--seconds", type=float, default=2.0, help="time per board size (default 2)")
+    parser.add_argument("--min-boards", type=int, default=20, help="boards per board size at least (default 20)")
+    args = parser.parse_args(argv)
+    if args.benchmark:
+        return 0 if benchmark(args.seconds, min_boards=args.min_boards) else 1
+    parser.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+File Name: sound_cache.py
+Module: src
+Function: Cache decoded sound effects on disk so repeat launches skip mp3 decoding. Each entry holds the raw PCM
+    samples of one sound, keyed by the source file's hash and the mixer format, and is memory-mapped and handed
+    straight to mixer.Sound(buffer=...) when loaded.
+Inputs: Sound effect files from the sounds folder.
+Outputs: pygame Sound objects. Cache files under assets/cache/sounds.
+Authors:
+    Minesweeper project contributors (see the git history of this file)
+Creation Date: 10/19/2026
+"""
+
+import os  # build cache paths
+import hashlib  # hash the source files
+import mmap  # map cache files instead of reading them
+import struct  # cache file header
+from pygame import mixer  # pygame's audio system
+from settings import CACHE_DIR
+
+SOUND_CACHE_DIR = os.path.join(CACHE_DIR, "sounds")
+
+# Cache file layout: header, then the raw samples exactly as mixer.Sound.get_raw() returns them.
+# Header: magic, format version, frequency, sample size (negative = signed), channels, sample byte count.
+# Bump CACHE_VERSION whenever the layout changes so old files are ignored and rebuilt.
+CACHE_MAGIC = b"MSPCM"
+CACHE_VERSION = 1
+HEADER = struct.Struct("<5sBihBQ")
+
+
+def _file_hash(path):
+    # Hash the source file's bytes so an edited sound never reuses a stale cache entry
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def cache_path_for(path, mixer_format):
+    """Cache file for a source sound decoded to mixer_format (frequency, size, channels)."""
+    frequency, size, channels = mixer_format
+    name = f"{_file_hash(path)}-{frequency}-{size}-{channels}.pcm"
+    return os.path.join(SOUND_CACHE_DIR, name)
+
+
+def _read_cached(cache_path, mixer_format):
+    # Return a Sound built from a valid cache file, or None if it is missing, from another version or format,
+    # or truncated.
+    try:
+        with open(cache_path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if len(mapped) < HEADER.size:
+                    return None
+                magic, version, frequency, size, channels, length = HEADER.unpack_from(mapped, 0)
+                if (magic != CACHE_MAGIC or version != CACHE_VERSION or (frequency, size, channels) != tuple(mixer_format)
+                        or len(mapped) != HEADER.size + length):
+                    return None
+                samples = memoryview(mapped)[HEADER.size:]
+                try:
+                    # mixer.Sound copies the samples, so the mapping can be closed right after
+                    return mixer.Sound(buffer=samples)
+                finally:
+                    samples.release()
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cached(cache_path, mixer_format, sound):
+    # Write the decoded samples through a temp file so a crash never leaves a half written entry behind
+    frequency, size, channels = mixer_format
+    samples = sound.get_raw()
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(CACHE_MAGIC, CACHE_VERSION, frequency, size, channels, len(samples)))
+            f.write(samples)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # The cache is only an optimization; failing to write it is not an error
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def load_sound(path):
+    """Return a mixer.Sound for path, from the decoded cache when possible (the mixer must already be started)."""
+    mixer_format = mixer.get_init()
+    try:
+        cache_path = cache_path_for(path, mixer_format)
+    except OSError:
+        # Can't read the source file to hash it; let mixer.Sound report the problem
+        return mixer.Sound(path)
+
+    sound = _read_cached(cache_path, mixer_format)
+    if sound is None:
+        # Cache miss: decode the mp3 once and store the samples for next launch
+        sound = mixer.Sound(path)
+        _write_cached(cache_path, mixer_format, sound)
+    return sound
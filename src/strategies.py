@@ -0,0 +1,112 @@
+"""
+File Name: strategies.py
+Module: src
+Function: The registry of AI strategies that tools (simulate.py, tournament.py) can play by name. A strategy is built
+    for a board with factory(grid, counts, revealed, flagged, rng) and must have make_move() returning
+    (row, col, action) like ai_solver. After each move its `guessed` attribute says whether that move was a guess
+    (a reveal the strategy could not prove safe). Every random choice a strategy makes comes from rng (a
+    random.Random), so a seeded game plays out the same every time. EASY, MEDIUM and HARD are the game's own
+    ai_solver difficulties; FRONTIER plays from the visible board with solver.FrontierSolver.
+Inputs: None.
+Outputs: None.
+Authors:
+    Minesweeper project contributors (see the git history of this file)
+Creation Date: 10/19/2026
+"""
+
+import random  # default source of random choices
+from ai import ai_solver
+from solver import FrontierSolver, HIDDEN
+from settings import EASY, MEDIUM, HARD, MINE
+
+FRONTIER = "frontier"
+
+# name -> factory(grid, counts, revealed, flagged, rng)
+STRATEGIES = {}
+
+
+def register_strategy(name, factory):
+    """Make a strategy available by name (a later registration under the same name replaces the earlier one)."""
+    STRATEGIES[name] = factory
+
+
+def make_strategy(name, grid, counts, revealed, flagged, rng=random):
+    """Build the strategy registered as name for a board, making its random choices with rng. Raises KeyError for an
+    unknown name."""
+    if name not in STRATEGIES:
+        raise KeyError(f"unknown strategy {name!r} (known: {', '.join(STRATEGIES)})")
+    return STRATEGIES[name](grid, counts, revealed, flagged, rng)
+
+
+class SolverStrategy:
+    """An ai_solver difficulty as a strategy. ai_solver says itself whether each move was a guess."""
+
+    def __init__(self, difficulty, grid, counts, revealed, flagged, rng=random):
+        self.solver = ai_solver(difficulty, grid, counts, revealed, flagged, rng)
+        self.guessed = False
+
+    def make_move(self):
+        move = self.solver.make_move()
+        self.guessed = move[0] is not None and self.solver.guessed
+        return move
+
+
+for _difficulty in (EASY, MEDIUM, HARD):
+    register_strategy(_difficulty, lambda grid, counts, revealed, flagged, rng, difficulty=_difficulty:
+                      SolverStrategy(difficulty, grid, counts, revealed, flagged, rng))
+
+
+class FrontierStrategy:
+    """Reveals a tile FrontierSolver proves safe, or else the hidden tile least likely to be a mine. It never flags.
+    The solver follows the board through this strategy's own reveals, so the board is only scanned once, when the
+    strategy is built."""
+
+    def __init__(self, grid, counts, revealed, flagged, rng=random):
+        self.counts, self.revealed, self.flagged = counts, revealed, flagged
+        self.rng = rng  # first move and ties between guesses
+        self.rows, self.cols = len(grid), len(grid[0])
+        # The mine counter is on screen, so this is the only thing read from the grid
+        mines = sum(row.count(MINE) for row in grid)
+        self.solver = FrontierSolver(self.rows, self.cols, mines)
+        self.solver.sync(revealed, flagged, counts)
+        self.guessed = False
+        self._last = None
+        self._safe = []  # tiles the last analysis proved safe and that haven't been revealed yet
+
+    def make_move(self):
+        if self._last is not None:
+            self.solver.sync_reveal(self._last, self.revealed, self.counts)
+        self.guessed = False
+        if self.solver.hidden == 0:
+            return None, None, None
+        # A tile proven safe stays safe, so use up the last analysis before asking for a new one
+        while self._safe:
+            tile = self._safe.pop()
+            if self.solver.state[tile] == HIDDEN:
+                self._last = tile
+                return tile // self.cols, tile % self.cols, "reveal"
+        if self.solver.hidden == self.rows * self.cols:
+            # Nothing revealed yet: the first click is always safe
+            tile = self.rng.randrange(self.rows * self.cols)
+        else:
+            analysis = self.solver.analyze()
+            if analysis.safe:
+                self._safe = analysis.safe[::-1]
+                tile = self._safe.pop()
+            else:
+                interior = self.solver.interior_tiles(analysis) if analysis.interior < 1.0 else []
+                if interior and analysis.interior == 0.0:
+                    tile = interior[0]
+                else:
+                    # Guess: the lowest chance of a mine, away from the frontier if that is as good
+                    self.guessed = True
+                    tile = min(analysis.probabilities, key=analysis.probabilities.get, default=None)
+                    if tile is None or (interior and analysis.interior <= analysis.probabilities[tile]):
+                        tile = self.rng.choice(interior) if interior else tile
+                    if tile is None:
+                        return None, None, None
+        self._last = tile
+        return tile // self.cols, tile % self.cols, "reveal"
+
+
+register_strategy(FRONTIER, FrontierStrategy)
@@ -0,0 +1,150 @@
+"""
+File Name: tournament.py
+Module: src
+Function: Compare AI strategies on data. Every registered strategy (see strategies.py) plays the same set of seeded
+    boards, split across worker processes. The report gives each strategy's win rate with a 95% confidence interval,
+    mean guesses per game, mean decision time per move and time per game, then compares every strategy with a
+    baseline game by game on the same boards, so a solver change can be accepted or rejected on the numbers.
+Inputs: Strategies, board size, mine count, number of boards, first seed and worker count.
+Outputs: A report printed to the console.
+Authors:
+    Minesweeper project contributors (see the git history of this file)
+Creation Date: 10/19/2026
+
+Usage (from the src folder):
+    python tournament.py --games 2000                          every strategy on 2000 10x10 boards
+    python tournament.py --strategies medium hard --baseline medium --size 16 --mines 40 --workers 4
+"""
+
+import os  # worker count
+import sys  # exit codes
+import math  # confidence intervals
+import argparse  # command line options
+from time import perf_counter  # measure the whole run
+from concurrent.futures import ProcessPoolExecutor  # parallel workers
+from simulate import simulate_game, MOVE_MS
+from strategies import STRATEGIES
+from game_log import RESULT_WIN
+from settings import GRID_SIZE, MIN_MINES, GEN_RANDOM, GEN_NO_GUESS
+
+Z_95 = 1.96  # normal quantile for 95% intervals
+CHUNK = 50  # boards per worker task
+
+
+def wilson_interval(wins, games, z=Z_95):
+    """Wilson score interval for a win rate (works near 0% and 100%, unlike the plain normal interval)."""
+    if games == 0:
+        return 0.0, 0.0
+    p = wins / games
+    centre = (p + z * z / (2 * games)) / (1 + z * z / games)
+    half = z * math.sqrt(p * (1 - p) / games + z * z / (4 * games * games)) / (1 + z * z / games)
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def mean_interval(values, z=Z_95):
+    """(mean, half width of the normal 95% interval) of a list of numbers."""
+    n = len(values)
+    if n == 0:
+        return 0.0, 0.0
+    mean = sum(values) / n
+    if n == 1:
+        return mean, 0.0
+    variance = sum((v - mean) ** 2 for v in values) / (n - 1)
+    return mean, z * math.sqrt(variance / n)
+
+
+def play_chunk(strategy, seeds, rows, cols, mines, move_ms, generation=GEN_RANDOM):
+    """Worker task: play one strategy on some boards. Returns one compact tuple per game (in seed order):
+    (seed, won, moves, guesses, decision seconds, game ms, wall seconds)."""
+    results = []
+    for seed in seeds:
+        started = perf_counter()
+        game = simulate_game(seed, rows, cols, mines, strategy, move_ms, generation=generation)
+        results.append((seed, game.result == RESULT_WIN, game.moves, game.guesses, game.decision_s,
+                        game.elapsed_ms, perf_counter() - started))
+    return results
+
+
+def run_tournament(strategies, rows, cols, mines, games, first_seed=1, workers=None, move_ms=MOVE_MS,
+                   generation=GEN_RANDOM):
+    """Play every strategy on boards first_seed .. first_seed + games - 1.
+    Returns {strategy: list of per-game tuples in seed order} (see play_chunk)."""
+    seeds = list(range(first_seed, first_seed + games))
+    chunks = [seeds[i:i + CHUNK] for i in range(0, len(seeds), CHUNK)]
+    results = {name: [] for name in strategies}
+    if workers == 1:
+        for name in strategies:
+            for chunk in chunks:
+                results[name].extend(play_chunk(name, chunk, rows, cols, mines, move_ms, generation))
+        return results
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [(name, pool.submit(play_chunk, name, chunk, rows, cols, mines, move_ms, generation))
+                   for name in strategies for chunk in chunks]
+        # Collected in submission order, so every list stays in seed order
+        for name, future in futures:
+            results[name].extend(future.result())
+    return results
+
+
+def report(results, baseline=None):
+    """Print the per-strategy table and the paired comparison with the baseline."""
+    print(f"{'strategy':<10} {'games':>6} {'win rate (95% CI)':>24} {'guesses/game':>16} "
+          f"{'decide us/move':>15} {'game s (won)':>13} {'cpu ms/game':>12}")
+    for name, games in results.items():
+        n = len(games)
+        wins = sum(g[1] for g in games)
+        low, high = wilson_interval(wins, n)
+        guesses, guesses_ci = mean_interval([g[3] for g in games])
+        moves = sum(g[2] for g in games)
+        decide_us = 1e6 * sum(g[4] for g in games) / moves if moves else 0.0
+        won_times = [g[5] / 1000 for g in games if g[1]]
+        game_s = sum(won_times) / len(won_times) if won_times else 0.0
+        cpu_ms = 1000 * sum(g[6] for g in games) / n if n else 0.0
+        rate = f"{100 * wins / n:5.1f}% [{100 * low:5.1f}, {100 * high:5.1f}]" if n else "-"
+        print(f"{name:<10} {n:>6} {rate:>24} {guesses:>9.2f} ±{guesses_ci:<5.2f} "
+              f"{decide_us:>15.1f} {game_s:>13.2f} {cpu_ms:>12.2f}")
+
+    if baseline is None or baseline not in results:
+        return
+    # Same boards for every strategy, so compare game by game: the mean of (won - baseline won) and its interval
+    # is much tighter than comparing two independent win rates
+    base = results[baseline]
+    for name, games in results.items():
+        if name == baseline:
+            continue
+        diffs = [int(a[1]) - int(b[1]) for a, b in zip(games, base)]
+        diff, half = mean_interval(diffs)
+        # A difference of wins can't go past ±100 points; the normal interval can when one side wins almost always
+        low, high = max(-1.0, diff - half), min(1.0, diff + half)
+        verdict = "better" if low > 0 else "worse" if high < 0 else "no significant difference"
+        print(f"{name} vs {baseline}: win rate {100 * diff:+.1f} points [{100 * low:+.1f}, "
+              f"{100 * high:+.1f}] -> {verdict}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play AI strategies on the same seeded boards and compare them.")
+    parser.add_argument("--strategies", nargs="+", choices=sorted(STRATEGIES), default=list(STRATEGIES),
+                        help="strategies to play (default: all)")
+    parser.add_argument("--baseline", help="strategy the others are compared with (default: the first)")
+    parser.add_argument("--games", type=int, default=1000, help="boards per strategy (default 1000)")
+    parser.add_argument("--size", type=int, default=GRID_SIZE, help="board rows and columns (default %(default)s)")
+    parser.add_argument("--mines", type=int, default=MIN_MINES, help="mine count (default %(default)s)")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the first board; board i uses seed + i")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes (default: CPUs)")
+    parser.add_argument("--move-ms", type=int, default=MOVE_MS, help="game time per AI move (default %(default)s)")
+    parser.add_argument("--generation", choices=(GEN_RANDOM, GEN_NO_GUESS), default=GEN_RANDOM,
+                        help="how boards are built (default %(default)s)")
+    args = parser.parse_args(argv)
+
+    started = perf_counter()
+    results = run_tournament(args.strategies, args.size, args.size, args.mines, args.games, args.seed,
+                             args.workers, args.move_ms, args.generation)
+    took = perf_counter() - started
+    print(f"{len(args.strategies)} strategies x {args.games} boards ({args.size}x{args.size}, {args.mines} mines, "
+          f"{args.generation} boards, seeds {args.seed}..{args.seed + args.games - 1}) in {took:.1f}s with {args.workers} workers\n")
+    report(results, args.baseline or args.strategies[0])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
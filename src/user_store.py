@@ -0,0 +1,358 @@
+"""
+File Name: user_store.py
+Module: src
+Function: Define the persistence layers behind AuthContext. JsonUserStore keeps user records in memory for fast
+    lookups; changes are coalesced and written to user.json on a background thread (and at exit), always through a
+    temp file plus rename so a crash mid-write can never corrupt the file. SqliteUserStore offers the same methods
+    backed by an indexed SQLite database (WAL mode) with a score history table, and migrates user.json into it once.
+Inputs: The path of the user.json file (and the database file for SQLite).
+Outputs: The user.json file or the SQLite database.
+Authors:
+    Minesweeper project contributors (see the git history of this file)
+Creation Date: 10/19/2026
+"""
+
+import os  # used to build file paths and replace files atomically
+import json  # used to read and write small local data files
+import time  # used to timestamp score history
+import queue  # used to hand SQLite writes to the writer thread
+import atexit  # used to flush pending changes when the program exits
+import tempfile  # used to make a unique temp file next to the file being replaced
+import sqlite3  # optional database backend
+import threading  # used to write on a background thread
+from typing import Optional, Dict, Any  # type hints for clarity
+from settings import USER_STORE_WRITE_DELAY
+
+# Fields every user record starts with
+DEFAULT_RECORD = {"token": "", "pfp_path": "", "high_score": 0, "theme": "dark"}
+
+
+def read_user_json(path: str) -> Dict[str, Any]:
+    """Read a user.json file into {"current_user": ..., "users": {...}}. Raises if the file can't be parsed."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    cu = data.get("current_user", "")
+    users = data.get("users", {})
+    # If the users dictionary is not a dictionary, set it to an empty dictionary
+    if not isinstance(users, dict):
+        users = {}
+    return {"current_user": cu if isinstance(cu, str) else "", "users": users}
+
+
+def atomic_write(path: str, data: bytes, new_mode: int = 0o644) -> None:
+    """Write data to path through a temp file in the same folder and a rename, so readers only ever see the old
+    file or the complete new one. The file keeps the permissions it had; a new file gets new_mode."""
+    # A unique temp name, so two writers (or a temp file left by a crash) can never collide
+    f = tempfile.NamedTemporaryFile("wb", dir=os.path.dirname(os.path.abspath(path)),
+                                    prefix=os.path.basename(path) + ".", suffix=".tmp", delete=False)
+    try:
+        with f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # The temp file is private (0600); give the result the permissions the file it replaces had, or new_mode
+        # (a fixed mode rather than one worked out from the umask, which can only be read by changing it for the
+        # whole process)
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = new_mode
+        os.chmod(f.name, mode)
+        os.replace(f.name, path)
+    except BaseException:
+        os.unlink(f.name)
+        raise
+
+
+class JsonUserStore:
+    """User records in a single JSON file with write-behind persistence.
+
+    Reads never touch the disk. Each change marks the store dirty and wakes the writer thread, which waits
+    USER_STORE_WRITE_DELAY seconds (so a burst of changes becomes one write) and then writes a snapshot atomically.
+    """
+
+    def __init__(self, path: str, write_delay: float = USER_STORE_WRITE_DELAY):
+        self.path = path
+        self.write_delay = write_delay
+        self._lock = threading.Lock()  # guards _data and _dirty
+        self._write_lock = threading.Lock()  # one writer at a time, so an older snapshot never lands last
+        self._data: Dict[str, Any] = self._load()
+        self._dirty = False
+        self._wake = threading.Event()  # set when there is something to write
+        self._stop = threading.Event()  # set by close() to cut the writer's wait short
+        self._closed = False
+        self._thread = threading.Thread(target=self._writer, name="user-store-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _load(self) -> Dict[str, Any]:
+        # Read user.json if it exists; otherwise initialize an empty store
+        empty = {"current_user": "", "users": {}}
+        if not os.path.exists(self.path):
+            return empty
+        try:
+            return read_user_json(self.path)
+        except Exception:
+            # Keep the unreadable file for inspection instead of silently overwriting every user with nothing
+            try:
+                os.replace(self.path, f"{self.path}.corrupt")
+            except OSError:
+                pass
+            return empty
+
+    # --- record access (in memory) ---
+
+    def get_current_user(self) -> str:
+        return self._data.get("current_user") or ""
+
+    def set_current_user(self, username: str) -> None:
+        with self._lock:
+            self._data["current_user"] = username
+            self._mark_dirty()
+
+    def get_user(self, username: str) -> Optional[Dict[str, Any]]:
+        """Return the record for username (do not modify it; use update_user), or None."""
+        rec = self._data["users"].get(username)
+        return rec if isinstance(rec, dict) else None
+
+    def update_user(self, username: str, **fields: Any) -> None:
+        """Set fields on a user's record, creating the record if needed."""
+        with self._lock:
+            users = self._data["users"]
+            rec = users.get(username)
+            if not isinstance(rec, dict):
+                rec = users[username] = dict(DEFAULT_RECORD)
+            rec.update(fields)
+            self._mark_dirty()
+
+    def add_score(self, username: str, score: int) -> None:
+        """Score history is only kept by the SQLite store; the JSON file just holds each user's high score."""
+        pass
+
+    # --- persistence (background) ---
+
+    def _mark_dirty(self) -> None:
+        # Caller holds _lock
+        self._dirty = True
+        self._wake.set()
+
+    def _writer(self) -> None:
+        while not self._closed:
+            self._wake.wait()
+            # Let a burst of changes settle, then write them all at once
+            self._stop.wait(self.write_delay)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        """Write pending changes now (no-op if nothing changed)."""
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                payload = json.dumps(self._data).encode("utf-8")
+                self._dirty = False
+            try:
+                # user.json holds login tokens, so a new one is only readable by its owner
+                atomic_write(self.path, payload, new_mode=0o600)
+            except OSError:
+                # Try again with the next change rather than crash the game
+                with self._lock:
+                    self._dirty = True
+
+    def close(self) -> None:
+        """Stop the writer thread and flush anything pending. Registered to run at exit."""
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=2)
+        self.flush()
+
+
+class SqliteUserStore:
+    """User records in an SQLite database, with the same methods as JsonUserStore.
+
+    Users are looked up by primary key only when first needed and then served from memory, so startup time doesn't
+    grow with the number of users. Changes update the in-memory record right away and are queued for a writer
+    thread that applies everything waiting in one transaction. The database runs in WAL mode.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS users (
+            username TEXT PRIMARY KEY,
+            token TEXT NOT NULL DEFAULT '',
+            pfp_path TEXT NOT NULL DEFAULT '',
+            high_score INTEGER NOT NULL DEFAULT 0,
+            theme TEXT NOT NULL DEFAULT 'dark'
+        );
+        CREATE TABLE IF NOT EXISTS scores (
+            id INTEGER PRIMARY KEY,
+            username TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            played_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS scores_by_user ON scores (username, score DESC);
+        CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+    FIELDS = ("token", "pfp_path", "high_score", "theme")
+
+    def __init__(self, path: str, json_path: Optional[str] = None):
+        self.path = path
+        # One connection shared by the main thread (reads) and the writer thread (writes), guarded by _lock
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+        if json_path:
+            self._migrate_json(json_path)
+
+        self._cache: Dict[str, Optional[Dict[str, Any]]] = {}  # username -> record (None = known missing)
+        self._current_user = self._get_meta("current_user")
+        self._queue: "queue.Queue" = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._writer, name="user-store-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # --- setup ---
+
+    def _get_meta(self, key: str) -> str:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else ""
+
+    def _migrate_json(self, json_path: str) -> None:
+        # Copy user.json into the database the first time the SQLite store is used (user.json is left in place)
+        if self._get_meta("migrated_json") or not os.path.exists(json_path):
+            return
+        try:
+            data = read_user_json(json_path)
+        except Exception:
+            return
+        rows = []
+        for username, rec in data["users"].items():
+            if not isinstance(rec, dict):
+                continue
+            merged = dict(DEFAULT_RECORD)
+            merged.update({k: v for k, v in rec.items() if k in self.FIELDS})
+            rows.append((username,) + tuple(merged[k] for k in self.FIELDS))
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO users (username, token, pfp_path, high_score, theme) VALUES (?, ?, ?, ?, ?)", rows)
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('current_user', ?)", (data["current_user"],))
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_json', '1')")
+            self._conn.execute("COMMIT")
+
+    # --- record access (in memory, loading a user from the database the first time it is needed) ---
+
+    def get_current_user(self) -> str:
+        return self._current_user
+
+    def set_current_user(self, username: str) -> None:
+        self._current_user = username
+        self._queue.put(("meta", "current_user", username))
+
+    def get_user(self, username: str) -> Optional[Dict[str, Any]]:
+        """Return the record for username (do not modify it; use update_user), or None."""
+        if username not in self._cache:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT token, pfp_path, high_score, theme FROM users WHERE username = ?", (username,)).fetchone()
+            self._cache[username] = dict(zip(self.FIELDS, row)) if row else None
+        return self._cache[username]
+
+    def update_user(self, username: str, **fields: Any) -> None:
+        """Set fields on a user's record, creating the record if needed."""
+        rec = self.get_user(username)
+        if rec is None:
+            rec = self._cache[username] = dict(DEFAULT_RECORD)
+        rec.update({k: v for k, v in fields.items() if k in self.FIELDS})
+        self._queue.put(("user", username, tuple(rec[k] for k in self.FIELDS)))
+
+    def add_score(self, username: str, score: int) -> None:
+        """Append a score to the user's history."""
+        self._queue.put(("score", username, score, time.time()))
+
+    def get_top_scores(self, limit: int = 10):
+        """Best scores ever recorded as (username, score) pairs, highest first (served by the score index)."""
+        self.flush()
+        with self._lock:
+            return self._conn.execute(
+                "SELECT username, score FROM scores ORDER BY score DESC LIMIT ?", (limit,)).fetchall()
+
+    # --- persistence (background) ---
+
+    def _apply(self, op) -> None:
+        # Caller holds _lock and has a transaction open
+        kind = op[0]
+        if kind == "user":
+            _, username, values = op
+            self._conn.execute(
+                "INSERT INTO users (username, token, pfp_path, high_score, theme) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(username) DO UPDATE SET token = excluded.token, pfp_path = excluded.pfp_path, "
+                "high_score = excluded.high_score, theme = excluded.theme",
+                (username,) + values)
+        elif kind == "meta":
+            _, key, value = op
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+        elif kind == "score":
+            _, username, score, played_at = op
+            self._conn.execute("INSERT INTO scores (username, score, played_at) VALUES (?, ?, ?)",
+                               (username, score, played_at))
+
+    def _writer(self) -> None:
+        while True:
+            op = self._queue.get()
+            if op is None:
+                self._queue.task_done()
+                return
+            # Everything queued behind this change goes into the same transaction
+            batch = [op]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            try:
+                with self._lock:
+                    self._conn.execute("BEGIN")
+                    for item in batch:
+                        if item is not None:
+                            self._apply(item)
+                    self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                # Don't crash the game over a failed save; roll back so the connection stays usable
+                try:
+                    with self._lock:
+                        self._conn.execute("ROLLBACK")
+                except sqlite3.Error:
+                    pass
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def flush(self) -> None:
+        """Wait until every queued change is committed."""
+        if not self._closed:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Commit everything queued and close the database. Registered to run at exit."""
+        if self._closed:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        self._closed = True
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,122 @@
+"""
+File Name: viewport.py
+Module: src
+Function: Define the Viewport class, a camera over the game board that handles panning, zooming, tile culling, and
+    converting between screen pixels and board cells.
+Inputs: The screen rectangle the board is drawn into and the board dimensions.
+Outputs: None.
+Authors:
+    Minesweeper project contributors (see the git history of this file)
+Creation Date: 10/19/2026
+"""
+
+import pygame
+from settings import TILE_SIZE, MIN_TILE_SIZE, MAX_TILE_SIZE
+
+
+class Viewport:
+    """Camera over the board.
+
+    The board lives in "world" pixels where cell (row, col) starts at (col * tile_size, row * tile_size).
+    (offset_x, offset_y) is the world pixel shown at the top-left corner of the viewport rectangle.
+    Drawing and hit-testing both go through cell_to_screen / screen_to_cell so they always agree.
+    """
+
+    def __init__(self, rect, rows, cols, tile_size=TILE_SIZE):
+        # Screen area the board is drawn into (everything outside is clipped)
+        self.rect = pygame.Rect(rect)
+        # Tile size at zoom 1.0
+        self.base_tile_size = tile_size
+        self.tile_size = tile_size
+        self.offset_x = 0
+        self.offset_y = 0
+        self.rows = rows
+        self.cols = cols
+        self.set_board_size(rows, cols)
+
+    def set_board_size(self, rows, cols):
+        """Point the camera at a new board, reset the zoom and center it."""
+        self.rows = rows
+        self.cols = cols
+        self.tile_size = self.base_tile_size
+        self.center()
+
+    def board_width(self):
+        return self.cols * self.tile_size
+
+    def board_height(self):
+        return self.rows * self.tile_size
+
+    def center(self):
+        """Center the board in the viewport (or show its top-left corner if it is larger than the viewport)."""
+        self.offset_x = 0
+        self.offset_y = 0
+        self._clamp()
+
+    def _clamp(self):
+        # A board smaller than the viewport is centered; a larger one can scroll only until its edges line up
+        # with the viewport edges.
+        bw, bh = self.board_width(), self.board_height()
+        if bw <= self.rect.width:
+            self.offset_x = -((self.rect.width - bw) // 2)
+        else:
+            self.offset_x = max(0, min(self.offset_x, bw - self.rect.width))
+        if bh <= self.rect.height:
+            self.offset_y = -((self.rect.height - bh) // 2)
+        else:
+            self.offset_y = max(0, min(self.offset_y, bh - self.rect.height))
+
+    def pan(self, dx, dy):
+        """Move the camera by (dx, dy) screen pixels."""
+        self.offset_x += int(dx)
+        self.offset_y += int(dy)
+        self._clamp()
+
+    def zoom_at(self, steps, screen_pos=None):
+        """Zoom in (steps > 0) or out (steps < 0), keeping the world point under screen_pos fixed."""
+        if screen_pos is None:
+            screen_pos = self.rect.center
+        old_tile = self.tile_size
+        new_tile = old_tile
+        for _ in range(abs(steps)):
+            # Multiplicative steps feel even at every zoom level; +/-1 guarantees progress at tiny sizes
+            if steps > 0:
+                new_tile = max(new_tile + 1, int(new_tile * 1.25))
+            else:
+                new_tile = min(new_tile - 1, int(new_tile / 1.25))
+        new_tile = max(MIN_TILE_SIZE, min(MAX_TILE_SIZE, new_tile))
+        if new_tile == old_tile:
+            return
+
+        # World position (in old tile units) under the cursor, rescaled into the new tile size
+        sx, sy = screen_pos
+        world_x = (sx - self.rect.x + self.offset_x) * new_tile / old_tile
+        world_y = (sy - self.rect.y + self.offset_y) * new_tile / old_tile
+        self.tile_size = new_tile
+        self.offset_x = int(world_x) - (sx - self.rect.x)
+        self.offset_y = int(world_y) - (sy - self.rect.y)
+        self._clamp()
+
+    def cell_to_screen(self, row, col):
+        """Return the screen position of the top-left corner of a cell."""
+        return (self.rect.x + col * self.tile_size - self.offset_x,
+                self.rect.y + row * self.tile_size - self.offset_y)
+
+    def screen_to_cell(self, x, y):
+        """Return (row, col) of the cell under a screen position, or (None, None) if there is none."""
+        if not self.rect.collidepoint(x, y):
+            return None, None
+        col = (x - self.rect.x + self.offset_x) // self.tile_size
+        row = (y - self.rect.y + self.offset_y) // self.tile_size
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row, col
+        return None, None
+
+    def visible_cells(self):
+        """Return (first_row, last_row, first_col, last_col) (end exclusive) of the cells touching the viewport."""
+        ts = self.tile_size
+        first_col = max(0, self.offset_x // ts)
+        first_row = max(0, self.offset_y // ts)
+        last_col = min(self.cols, (self.offset_x + self.rect.width + ts - 1) // ts)
+        last_row = min(self.rows, (self.offset_y + self.rect.height + ts - 1) // ts)
+        return first_row, last_row, first_col, last_col
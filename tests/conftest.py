@@ -0,0 +1,15 @@
+"""
+Shared pytest setup: the game's modules live in src/ and import each other by bare name, so src/ goes on sys.path,
+and pygame gets dummy video and audio drivers so nothing opens a window or needs a sound card. Player data goes to
+a temporary folder (settings reads MINESWEEPER_DATA_DIR at import) so tests never touch assets/.
+"""
+
+import os
+import sys
+import tempfile
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("MINESWEEPER_DATA_DIR", tempfile.mkdtemp(prefix="minesweeper-tests-"))
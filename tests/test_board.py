@@ -0,0 +1,102 @@
+"""Tests for board.py: batch reveals, the counted win check and chords."""
+
+import random
+
+from board import (new_board, place_mines, compute_counts, ensure_first_click_safe, reveal_cells, chord_cells,
+                   count_hidden_safe, flood_reveal)
+from settings import MINE
+
+
+def board_from(rows_text):
+    """A board from strings, '*' for a mine and '.' for a safe tile."""
+    grid = [[MINE if ch == "*" else 0 for ch in row] for row in rows_text]
+    _, revealed, flagged, _ = new_board(len(grid), len(grid[0]))
+    return grid, compute_counts(grid), revealed, flagged
+
+
+def test_counts():
+    grid, counts, _, _ = board_from(["*..", "...", "..*"])
+    assert counts == [[-1, 1, 0], [1, 2, 1], [0, 1, -1]]
+
+
+def test_flood_reveal_stops_at_numbers():
+    grid, counts, revealed, flagged = board_from(["....", "....", "...*"])
+    opened = flood_reveal(0, 0, grid, counts, revealed, flagged)
+    assert opened == 11
+    assert not revealed[2][3]
+
+
+def test_win_is_counted_not_scanned():
+    grid, counts, revealed, flagged = board_from(["*...", "....", "...*"])
+    hidden = 12 - 2
+    opened, exploded, won = reveal_cells([(0, 3)], grid, counts, revealed, flagged, hidden)
+    assert not exploded and not won
+    hidden -= opened
+    assert hidden == count_hidden_safe(grid, revealed) > 0
+    remaining = [(r, c) for r in range(3) for c in range(4) if grid[r][c] != MINE and not revealed[r][c]]
+    opened, exploded, won = reveal_cells(remaining, grid, counts, revealed, flagged, hidden)
+    assert won and opened == hidden
+    assert count_hidden_safe(grid, revealed) == 0
+
+
+def test_counted_win_matches_a_full_scan():
+    rng = random.Random(3)
+    for _ in range(50):
+        rows, cols, mines = rng.randint(3, 12), rng.randint(3, 12), rng.randint(1, 8)
+        grid, revealed, flagged, _ = new_board(rows, cols)
+        place_mines(grid, mines, rng)
+        counts = compute_counts(grid)
+        hidden = rows * cols - mines
+        tiles = [(r, c) for r in range(rows) for c in range(cols) if grid[r][c] != MINE]
+        rng.shuffle(tiles)
+        for tile in tiles:
+            opened, exploded, won = reveal_cells([tile], grid, counts, revealed, flagged, hidden)
+            hidden -= opened
+            assert not exploded
+            assert hidden == count_hidden_safe(grid, revealed)
+            assert won == (opened > 0 and hidden == 0)
+
+
+def test_mine_loses_and_reveals_every_mine():
+    grid, counts, revealed, flagged = board_from(["*..", "...", "..*"])
+    opened, exploded, won = reveal_cells([(0, 0)], grid, counts, revealed, flagged, 7)
+    assert exploded == [(0, 0)] and not won
+    assert revealed[2][2]
+
+
+def test_first_click_is_a_zero():
+    rng = random.Random(1)
+    grid, _, _, _ = new_board(10, 10)
+    place_mines(grid, 20, rng)
+    counts = ensure_first_click_safe(4, 4, grid, compute_counts(grid), 20, rng)
+    assert counts[4][4] == 0 and sum(row.count(MINE) for row in grid) == 20
+
+
+def test_chord_needs_matching_flags():
+    grid, counts, revealed, flagged = board_from(["*..", "...", "..."])
+    revealed[1][1] = True
+    assert chord_cells(1, 1, counts, revealed, flagged) == []
+    flagged[0][0] = True
+    cells = chord_cells(1, 1, counts, revealed, flagged)
+    assert sorted(cells) == [(0, 1), (0, 2), (1, 0), (1, 2), (2, 0), (2, 1), (2, 2)]
+
+
+def test_chord_skips_revealed_and_ignores_zeros_and_hidden_tiles():
+    grid, counts, revealed, flagged = board_from(["*..", "...", "..."])
+    flagged[0][0] = True
+    # Hidden number: no chord
+    assert chord_cells(1, 1, counts, revealed, flagged) == []
+    revealed[1][1] = revealed[0][1] = True
+    assert (0, 1) not in chord_cells(1, 1, counts, revealed, flagged)
+    # A zero never chords
+    revealed[2][2] = True
+    assert chord_cells(2, 2, counts, revealed, flagged) == []
+
+
+def test_chord_with_a_wrong_flag_explodes():
+    grid, counts, revealed, flagged = board_from(["*..", "...", "..."])
+    revealed[1][1] = True
+    flagged[0][1] = True  # wrong: the mine is at (0, 0)
+    cells = chord_cells(1, 1, counts, revealed, flagged)
+    opened, exploded, won = reveal_cells(cells, grid, counts, revealed, flagged, 7)
+    assert exploded == [(0, 0)] and not won
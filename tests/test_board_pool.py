@@ -0,0 +1,109 @@
+"""Tests for board_pool.py: the symmetries, boards rebuilt from (seed, anchor, symmetry) in the game and in replays,
+and the pool waiting for the wanted configuration to settle."""
+
+import random
+import time
+
+import pytest
+
+from board import compute_counts
+from board_pool import (BoardPool, symmetries, transform_cell, original_cell, transform_rows, build_board,
+                        prepare_board)
+from game_log import LoggedGame, ACTOR_PLAYER, ACTION_REVEAL
+from replay import Replay
+from settings import MINE, GEN_RANDOM, GEN_NO_GUESS, AI_MANUAL, EASY
+from solver import is_solvable
+
+
+@pytest.mark.parametrize("rows, cols", [(5, 5), (4, 7)])
+def test_transform_cell_and_original_cell_are_inverses(rows, cols):
+    for symmetry in symmetries(rows, cols):
+        seen = set()
+        for r in range(rows):
+            for c in range(cols):
+                tr, tc = transform_cell(r, c, rows, cols, symmetry)
+                assert 0 <= tr < rows and 0 <= tc < cols
+                assert original_cell(tr, tc, rows, cols, symmetry) == (r, c)
+                seen.add((tr, tc))
+        assert len(seen) == rows * cols
+
+
+def test_rectangles_only_flip():
+    assert list(symmetries(4, 7)) == [0, 1, 2, 3]
+    assert list(symmetries(6, 6)) == list(range(8))
+
+
+@pytest.mark.parametrize("rows, cols", [(6, 6), (5, 9)])
+def test_transform_rows_moves_tiles_like_transform_cell(rows, cols):
+    grid, _ = build_board(rows, cols, 6, GEN_RANDOM, 11, rows // 2, cols // 2)
+    counts = compute_counts(grid)
+    for symmetry in symmetries(rows, cols):
+        moved = transform_rows(grid, symmetry)
+        for r in range(rows):
+            for c in range(cols):
+                tr, tc = transform_cell(r, c, rows, cols, symmetry)
+                assert moved[tr][tc] == grid[r][c]
+        # Mirroring or rotating the mines moves the numbers with them
+        assert compute_counts(moved) == transform_rows(counts, symmetry)
+
+
+def test_build_board_is_repeatable():
+    assert build_board(16, 16, 40, GEN_NO_GUESS, 5, 8, 8) == build_board(16, 16, 40, GEN_NO_GUESS, 5, 8, 8)
+
+
+@pytest.mark.parametrize("size, mines, generation", [(10, 10, GEN_RANDOM), (16, 40, GEN_NO_GUESS), (9, 10, GEN_RANDOM)])
+def test_pooled_boards_fit_the_click_and_replay_exactly(size, mines, generation):
+    rng = random.Random(size)
+    for _ in range(3):
+        board = prepare_board(size, size, mines, generation, rng)
+        starts = [(t // size, t % size) for t in range(size * size)]
+        rng.shuffle(starts)
+        # Any tile a symmetry maps onto a start
+        row, col = next((r, c) for r, c in starts if board.symmetry_for(r, c) is not None)
+        symmetry = board.symmetry_for(row, col)
+        original_grid = [line[:] for line in board.grid]
+        board.apply_symmetry(symmetry)
+
+        assert board.counts[row][col] == 0
+        assert sum(line.count(MINE) for line in board.grid) == mines
+        assert board.counts == compute_counts(board.grid)
+        assert board.grid == transform_rows(original_grid, symmetry)
+        if generation == GEN_NO_GUESS:
+            assert is_solvable(board.grid, row, col)
+
+        # The log records (seed, anchor, symmetry) and the replay rebuilds the same board
+        game = LoggedGame(12345, size, size, mines, AI_MANUAL, EASY, 0, "", generation)
+        game.pooled = (board.seed, board.anchor_row, board.anchor_col, board.symmetry)
+        game.moves.append((0, ACTOR_PLAYER, ACTION_REVEAL, row, col))
+        replay = Replay(game)
+        replay.run()
+        assert replay.grid == board.grid
+        assert replay.counts == board.counts
+
+
+def wait_for(condition, seconds=10.0):
+    deadline = time.monotonic() + seconds
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_pool_waits_for_the_configuration_to_settle():
+    pool = BoardPool(settle=0.2)
+    try:
+        # Stepping through mine counts: nothing is built for the passing values
+        for mines in range(10, 20):
+            pool.want(10, 10, mines, GEN_RANDOM)
+        time.sleep(0.05)
+        assert all(pool.ready(10, 10, mines, GEN_RANDOM) == 0 for mines in range(10, 20))
+
+        time.sleep(0.2)
+        pool.want(10, 10, 19, GEN_RANDOM)
+        assert wait_for(lambda: pool.ready(10, 10, 19, GEN_RANDOM) == BoardPool.depth((10, 10)))
+        assert all(pool.ready(10, 10, mines, GEN_RANDOM) == 0 for mines in range(10, 19))
+
+        board = pool.take(10, 10, 19, GEN_RANDOM, 5, 5) or pool.take(10, 10, 19, GEN_RANDOM, 0, 0)
+        if board is not None:
+            assert sum(line.count(MINE) for line in board.grid) == 19
+    finally:
+        pool.close()
@@ -0,0 +1,47 @@
+"""Tests for frame_profiler.py: phase accounting, waits kept out of the frame time, and CSV export notices."""
+
+import csv
+
+import frame_profiler
+from frame_profiler import FrameProfiler, PHASES
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_waits_are_kept_out_of_the_ai_phase_and_the_frame(monkeypatch):
+    clock = FakeTime()
+    monkeypatch.setattr(frame_profiler, "perf_counter", clock)
+    profiler = FrameProfiler(4)
+    profiler.begin_frame()
+    clock.now += 0.016
+    profiler.mark("tick")
+    clock.now += 0.5  # the pause before the AI moves
+    profiler.mark("ai_delay")
+    clock.now += 0.002
+    profiler.mark("ai")
+    clock.now += 0.003
+    profiler.begin_frame()
+    assert round(profiler.samples("ai")[0], 6) == 2.0
+    assert round(profiler.samples("ai_delay")[0], 6) == 500.0
+    assert round(profiler.samples("other")[0], 6) == 3.0
+    assert round(profiler.samples("frame")[0], 6) == 5.0
+
+
+def test_export_is_reported_in_the_overlay(tmp_path):
+    profiler = FrameProfiler(4)
+    for _ in range(3):
+        profiler.begin_frame()
+    path = profiler.export_csv(str(tmp_path / "logs" / "frames.csv"))
+    with open(path, newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["frame_number", "frame_ms"] + [f"{name}_ms" for name in PHASES]
+    assert len(rows) == 3  # two finished frames
+    profiler.notify("Saved " + path)
+    assert profiler.overlay
+    assert profiler._notice == "Saved " + path
@@ -0,0 +1,104 @@
+"""Tests for game_log.py: varints, writing games and reading them back, and recovering from a torn last record."""
+
+import os
+
+import pytest
+
+from game_log import (GameLog, read_games, encode_varint, decode_varint, ACTOR_PLAYER, ACTOR_AI, ACTION_REVEAL,
+                      ACTION_FLAG, RESULT_WIN, RESULT_LOSS, HEADER)
+from settings import AI_MANUAL, AI_AUTOMATIC, EASY, HARD, GEN_NO_GUESS, GEN_RANDOM
+
+
+@pytest.mark.parametrize("n", [0, 1, 127, 128, 300, 16383, 16384, 2 ** 32 - 1, 2 ** 63])
+def test_varint_round_trip(n):
+    out = bytearray()
+    encode_varint(n, out)
+    assert decode_varint(bytes(out) + b"\xff", 0) == (n, len(out))
+
+
+def test_varint_sizes():
+    for n, size in ((127, 1), (128, 2), (16383, 2), (16384, 3)):
+        out = bytearray()
+        encode_varint(n, out)
+        assert len(out) == size
+
+
+def test_truncated_varint_raises():
+    out = bytearray()
+    encode_varint(300, out)
+    with pytest.raises(IndexError):
+        decode_varint(bytes(out[:1]), 0)
+
+
+def play(log, seed, result=RESULT_WIN):
+    log.start_game(seed, 9, 12, 10, AI_MANUAL, EASY, "ada")
+    log.move(ACTOR_PLAYER, ACTION_REVEAL, 4, 5)
+    log.move(ACTOR_AI, ACTION_FLAG, 8, 11)
+    log.end_game(result, 1234)
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "logs" / "games.mslog")
+    log = GameLog(path)
+    play(log, 7)
+    log.start_game(2 ** 32 - 1, 30, 180, 1000, AI_AUTOMATIC, HARD, "", GEN_NO_GUESS)
+    log.pooled_board(99, 15, 90, 3)
+    log.move(ACTOR_PLAYER, ACTION_REVEAL, 29, 179)
+    log.end_game(RESULT_LOSS, 5)
+    log.close()
+
+    first, second = read_games(path)
+    assert (first.seed, first.rows, first.cols, first.mines) == (7, 9, 12, 10)
+    assert (first.mode, first.difficulty, first.username, first.generation) == (AI_MANUAL, EASY, "ada", GEN_RANDOM)
+    assert [move[1:] for move in first.moves] == [(ACTOR_PLAYER, ACTION_REVEAL, 4, 5), (ACTOR_AI, ACTION_FLAG, 8, 11)]
+    assert (first.result, first.elapsed_ms, first.pooled) == (RESULT_WIN, 1234, None)
+    assert (second.seed, second.generation, second.username, second.pooled) == (2 ** 32 - 1, GEN_NO_GUESS, "", (99, 15, 90, 3))
+    assert (second.result, second.elapsed_ms) == (RESULT_LOSS, 5)
+
+
+def test_games_after_a_torn_tail_are_kept(tmp_path):
+    path = str(tmp_path / "games.mslog")
+    log = GameLog(path)
+    play(log, 1)
+    log.close()
+    # A crash in the middle of the last record
+    os.truncate(path, os.path.getsize(path) - 2)
+
+    log = GameLog(path)
+    for seed in (2, 3, 4):
+        play(log, seed)
+    log.close()
+
+    games = list(read_games(path))
+    assert [game.seed for game in games] == [1, 2, 3, 4]
+    # The first game lost its end record, the others are complete
+    assert games[0].result is None
+    assert all(game.result == RESULT_WIN for game in games[1:])
+
+
+def test_reader_stops_at_a_torn_tail(tmp_path):
+    path = str(tmp_path / "games.mslog")
+    log = GameLog(path)
+    play(log, 1)
+    play(log, 2)
+    log.close()
+    os.truncate(path, os.path.getsize(path) - 1)
+    assert [(game.seed, game.result) for game in read_games(path)] == [(1, RESULT_WIN), (2, None)]
+
+
+def test_foreign_file_is_set_aside(tmp_path):
+    path = str(tmp_path / "games.mslog")
+    with open(path, "wb") as f:
+        f.write(b"not a game log")
+    log = GameLog(path)
+    play(log, 5)
+    log.close()
+    assert [game.seed for game in read_games(path)] == [5]
+    assert open(path + ".corrupt", "rb").read() == b"not a game log"
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(HEADER[:-1] + b"\x09")
+    with pytest.raises(ValueError):
+        list(read_games(str(path)))
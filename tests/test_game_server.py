@@ -0,0 +1,90 @@
+"""Tests for game_server.py: the line protocol, spoken over a real socket, and the board limits."""
+
+import asyncio
+
+import game_server
+from game_server import GameSession, serve, max_mines
+
+
+def test_density_is_capped():
+    session = GameSession()
+    assert session.handle("new 10 10 70 1").startswith("err mines must be between 1 and 20")
+    assert session.handle("new 10 10 91").startswith("err")
+    assert session.handle("new 10 10 20 1") == "ok new 10 10 20 1"
+    assert max_mines(10, 10) == 20
+
+
+def test_board_size_is_capped():
+    session = GameSession()
+    assert session.handle(f"new 1 {game_server.MAX_TILES + 1} 5").startswith("err board must have")
+    assert session.handle("new 3 3 1").startswith("err board must have")
+
+
+def test_same_seed_same_game():
+    one, two = GameSession(), GameSession()
+    for session in (one, two):
+        session.handle("new 16 16 40 1234")
+        session.handle("reveal 8 8")
+    assert one.handle("state") == two.handle("state")
+
+
+def test_errors():
+    session = GameSession()
+    assert session.handle("reveal 0 0") == "err start a game with new first"
+    session.handle("new 10 10 10 5")
+    assert session.handle("reveal 0") == "err expected <row> <col>"
+    assert session.handle("reveal a b") == "err expected whole numbers"
+    assert session.handle("reveal 10 0") == "err tile is not on the board"
+    assert session.handle("ai impossible") == "err difficulty must be easy, medium or hard"
+    assert session.handle("jump").startswith("err unknown command")
+
+
+def test_small_boards_run_inline_and_big_ones_do_not():
+    session = GameSession()
+    assert not session.runs_inline("new 10 10 10")
+    session.handle("new 10 10 10 1")
+    assert session.runs_inline("reveal 1 1")
+    session.handle("new 100 100 100 1")
+    assert not session.runs_inline("reveal 1 1")
+
+
+async def talk(commands):
+    """Start a server on a free port, send commands over one connection and return the responses."""
+    started = asyncio.get_running_loop().create_future()
+    task = asyncio.create_task(serve("127.0.0.1", 0, ready=started.set_result))
+    server = await started
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    responses = []
+    for command in commands:
+        writer.write(command.encode("ascii") + b"\n")
+        await writer.drain()
+        responses.append((await reader.readline()).decode("ascii").rstrip("\n"))
+    writer.close()
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    return responses
+
+
+def test_protocol_over_a_socket():
+    responses = asyncio.run(talk(["help", "new 10 10 10 42", "reveal 5 5", "state", "flag 0 0", "flag 0 0",
+                                  "ai hard", "new 100 100 500 7", "reveal 50 50", "quit"]))
+    help_line, new, reveal, state, flag, unflag, ai, big_new, big_reveal, bye = responses
+    assert help_line.startswith("ok commands:")
+    assert new == "ok new 10 10 10 42"
+    status, opened = reveal.split()[1:]
+    assert status in ("playing", "win") and int(opened) >= 1
+    _, _, status, rows, cols, tiles = state.split()
+    assert (rows, cols, len(tiles)) == ("10", "10", 100)
+    assert tiles[55] == "0"  # the first click always lands on a zero
+    assert tiles.count(".") + tiles.count("F") == 100 - int(opened)
+    assert flag == "ok flag 1 1" or flag == "err tile is already revealed"
+    assert unflag in ("ok flag 0 0", "err tile is already revealed")
+    assert ai.startswith("ok ai ")
+    # Big boards go through the worker thread and answer the same way
+    assert big_new == "ok new 100 100 500 7"
+    assert big_reveal.startswith("ok playing ") or big_reveal.startswith("ok win ")
+    assert bye == "ok bye"
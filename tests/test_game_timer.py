@@ -0,0 +1,35 @@
+"""Tests for game_timer.py: elapsed time on a virtual clock, with pauses left out."""
+
+from game_timer import GameTimer, VirtualClock
+
+
+def test_paused_time_is_not_counted():
+    clock = VirtualClock(start_ms=5_000)
+    timer = GameTimer(clock)
+    timer.start()
+    clock.advance(1_234)
+    timer.pause()
+    assert timer.is_paused()
+    clock.advance(10_000)
+    assert timer.get_elapsed_time_ms() == 1_234
+    timer.pause()  # pausing twice keeps the first pause
+    timer.resume()
+    assert not timer.is_paused()
+    clock.advance(766)
+    assert timer.get_elapsed_time_ms() == 2_000
+    assert timer.get_elapsed_time() == "00:02"
+
+
+def test_stop_while_paused_keeps_the_paused_time():
+    clock = VirtualClock()
+    timer = GameTimer(clock)
+    timer.start(elapsed_ms=500)
+    clock.advance(250)
+    timer.pause()
+    clock.advance(5_000)
+    timer.stop()
+    assert not timer.is_paused()
+    clock.advance(5_000)
+    assert timer.get_elapsed_time_ms() == 750
+    timer.resume()  # nothing to resume once stopped
+    assert timer.get_elapsed_time_ms() == 750
@@ -0,0 +1,87 @@
+"""Tests for leaderboard.py: rankings with ties, and reloading from the jsonl and its snapshot."""
+
+import os
+
+from leaderboard import Leaderboard, config_key, compute_score
+from settings import EASY, HARD, AI_MANUAL
+
+KEY = config_key(10, 10, 10, AI_MANUAL, EASY)
+OTHER = config_key(10, 10, 10, AI_MANUAL, HARD)
+
+
+def make_board(tmp_path):
+    return Leaderboard(str(tmp_path / "leaderboard.jsonl"))
+
+
+def test_ties_share_a_rank(tmp_path):
+    board = make_board(tmp_path)
+    try:
+        for user, score in (("ann", 500), ("bob", 700), ("cat", 500), ("dan", 300)):
+            board.record(KEY, user, True, 1000, score)
+        assert board.top(KEY, 3) == [("bob", 700), ("ann", 500), ("cat", 500)]
+        assert [board.rank(KEY, u) for u in ("bob", "ann", "cat", "dan")] == [1, 2, 2, 4]
+        assert board.rank(KEY, "eve") is None
+        assert board.rank(OTHER, "bob") is None
+    finally:
+        board.close()
+
+
+def test_only_a_better_score_moves_a_user(tmp_path):
+    board = make_board(tmp_path)
+    try:
+        board.record(KEY, "ann", True, 1000, 400)
+        version = board.version
+        board.record(KEY, "ann", True, 1000, 300)
+        board.record(KEY, "ann", False, 1000)
+        board.record(KEY, None, True, 1000, 900)  # guests are counted but not ranked
+        assert board.version == version
+        assert board.games_played(KEY) == (4, 3)
+        board.record(KEY, "ann", True, 1000, 800)
+        assert board.version == version + 1
+        assert board.top(KEY, 5) == [("ann", 800)]
+        assert board.best(KEY, "ann") == 800
+    finally:
+        board.close()
+
+
+def test_reload_from_snapshot_and_tail(tmp_path):
+    board = make_board(tmp_path)
+    board.record(KEY, "ann", True, 1000, 500)
+    board.record(KEY, "bob", True, 1000, 500)
+    board.close()
+    assert os.path.exists(board.snapshot_path)
+
+    # Games appended after the snapshot are replayed on top of it
+    board = make_board(tmp_path)
+    board.record(KEY, "cat", True, 1000, 600)
+    board.flush()
+    again = make_board(tmp_path)
+    try:
+        assert again.top(KEY, 5) == [("cat", 600), ("ann", 500), ("bob", 500)]
+        assert again.games_played(KEY) == (3, 3)
+    finally:
+        again.close()
+        board.close()
+
+
+def test_torn_last_line_is_cut_off(tmp_path):
+    board = make_board(tmp_path)
+    board.record(KEY, "ann", True, 1000, 500)
+    board.close()
+    os.remove(board.snapshot_path)
+    with open(board.path, "ab") as f:
+        f.write(b'{"rows":10,"cols"')
+    again = make_board(tmp_path)
+    try:
+        assert again.games_played(KEY) == (1, 1)
+        again.record(KEY, "bob", True, 1000, 600)
+    finally:
+        again.close()
+    with open(board.path, "rb") as f:
+        assert f.read().count(b"\n") == 2
+
+
+def test_score():
+    assert compute_score(10, 0) == 0
+    assert compute_score(10, 1000) == 10_000
+    assert compute_score(10, 999) > compute_score(10, 1000)
@@ -0,0 +1,75 @@
+"""Tests for savegame.py: bit planes and the save file round trip."""
+
+import random
+
+import pytest
+
+from savegame import (SavedGame, GameSaver, snapshot_rows, pack_bits, unpack_bits, encode_game, decode_game,
+                      load_game, HEADER)
+from settings import MINE, MEDIUM, HARD, AI_INTERACTIVE, AI_MANUAL, GEN_NO_GUESS, GEN_RANDOM
+
+
+@pytest.mark.parametrize("count", [0, 1, 7, 8, 9, 100, 1001])
+def test_bits_round_trip(count):
+    rng = random.Random(count)
+    tiles = bytes(rng.randrange(2) for _ in range(count))
+    packed = pack_bits(tiles)
+    assert len(packed) == (count + 7) // 8
+    assert unpack_bits(packed, count) == tiles
+
+
+def test_any_non_zero_tile_is_set():
+    assert snapshot_rows([[0, MINE], [True, False]]) == bytes([0, MINE, 1, 0])
+    assert unpack_bits(pack_bits(bytes([0, MINE, 1, 0])), 4) == bytes([0, 1, 1, 0])
+
+
+def random_game(rows, cols, rng, **settings):
+    planes = [bytes(rng.randrange(2) for _ in range(rows * cols)) for _ in range(3)]
+    defaults = dict(mode=AI_INTERACTIVE, difficulty=MEDIUM, first_click_done=True, player_turn=False,
+                    elapsed_ms=61_234, seed=2 ** 40 + 7, generation=GEN_RANDOM)
+    defaults.update(settings)
+    return SavedGame(rows, cols, sum(planes[0]), mine_tiles=planes[0], revealed_tiles=planes[1],
+                     flagged_tiles=planes[2], **defaults)
+
+
+@pytest.mark.parametrize("rows, cols", [(10, 10), (3, 7), (30, 16)])
+def test_save_round_trip(rows, cols):
+    game = random_game(rows, cols, random.Random(rows * cols), mode=AI_MANUAL, difficulty=HARD,
+                       player_turn=True, generation=GEN_NO_GUESS)
+    data = encode_game(game)
+    assert len(data) == HEADER.size + 3 * ((rows * cols + 7) // 8)
+    loaded = decode_game(data)
+    for field in ("rows", "cols", "mines", "mode", "difficulty", "first_click_done", "player_turn", "elapsed_ms",
+                  "seed", "mine_tiles", "revealed_tiles", "flagged_tiles", "generation"):
+        assert getattr(loaded, field) == getattr(game, field), field
+    assert loaded.grid()[0] == [MINE * b for b in game.mine_tiles[:cols]]
+    assert loaded.revealed()[-1] == [bool(b) for b in game.revealed_tiles[-cols:]]
+
+
+def test_damaged_saves_are_rejected():
+    data = encode_game(random_game(5, 5, random.Random(1)))
+    with pytest.raises(ValueError):
+        decode_game(data[:-1])
+    with pytest.raises(ValueError):
+        decode_game(b"XXXXX" + data[5:])
+    with pytest.raises(ValueError):
+        decode_game(data[:10])
+
+
+def test_saver_writes_the_newest_save_and_deletes(tmp_path):
+    path = str(tmp_path / "saves" / "current.sav")
+    saver = GameSaver(path)
+    try:
+        rng = random.Random(2)
+        games = [random_game(6, 6, rng, elapsed_ms=ms) for ms in (1, 2, 3)]
+        for game in games:
+            saver.save(game)
+        saver.flush()
+        assert saver.exists()
+        assert load_game(path).elapsed_ms == 3
+        saver.delete()
+        saver.flush()
+        assert not saver.exists()
+        assert load_game(path) is None
+    finally:
+        saver.close()
@@ -0,0 +1,17 @@
+"""Tests for simulate.py: seeded games replay exactly and leave the shared random module alone."""
+
+import random
+
+import pytest
+
+from simulate import simulate_game
+
+
+@pytest.mark.parametrize("strategy", ["easy", "hard", "frontier"])
+def test_seeded_games_repeat_without_touching_global_random(strategy):
+    first = [(g.result, g.moves, g.guesses) for g in (simulate_game(seed, 9, 9, 10, strategy) for seed in range(20))]
+    random.seed(12345)
+    state = random.getstate()
+    again = [(g.result, g.moves, g.guesses) for g in (simulate_game(seed, 9, 9, 10, strategy) for seed in range(20))]
+    assert again == first
+    assert random.getstate() == state
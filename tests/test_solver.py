@@ -0,0 +1,166 @@
+"""Tests for solver.py: no-guess board generation and FrontierSolver against brute force, and the medium AI built
+on it."""
+
+import random
+from itertools import combinations
+
+import pytest
+
+from ai import ai_solver
+from board import new_board, place_mines, compute_counts, flood_reveal
+from solver import generate_no_guess, is_solvable, ensure_first_click_no_guess, FrontierSolver, TranspositionTable
+from settings import MINE, MEDIUM
+
+
+def to_grid(is_mine, rows, cols):
+    return [[MINE * m for m in is_mine[r * cols:(r + 1) * cols]] for r in range(rows)]
+
+
+@pytest.mark.parametrize("size, mines", [(10, 10), (16, 40), (30, 180)])
+def test_no_guess_boards_are_solvable(size, mines):
+    rng = random.Random(size)
+    for _ in range(5):
+        first = rng.randrange(size), rng.randrange(size)
+        is_mine = generate_no_guess(size, size, mines, *first, rng)
+        assert sum(is_mine) == mines
+        assert is_solvable(to_grid(is_mine, size, size), *first)
+
+
+def test_too_many_mines():
+    with pytest.raises(ValueError):
+        generate_no_guess(10, 10, 92, 5, 5, random.Random(1))
+
+
+def test_generation_gives_up_after_max_placements():
+    # No repairs allowed: every placement that needs one is thrown away
+    with pytest.raises(RuntimeError):
+        generate_no_guess(30, 30, 180, 15, 15, random.Random(1), max_repairs=0, max_placements=3)
+
+
+def test_first_click_falls_back_to_a_random_board_the_same_way_every_time(monkeypatch):
+    import solver
+
+    def give_up(*args, **kwargs):
+        raise RuntimeError("stuck")
+
+    monkeypatch.setattr(solver, "generate_no_guess", give_up)
+    boards = []
+    for _ in range(2):
+        rng = random.Random(9)
+        grid, _, _, _ = new_board(10, 10)
+        place_mines(grid, 20, rng)
+        counts = ensure_first_click_no_guess(4, 4, grid, compute_counts(grid), 20, rng)
+        assert counts[4][4] == 0
+        boards.append(grid)
+    assert boards[0] == boards[1]
+
+
+def random_position(rng, rows=4, cols=5, mines=5):
+    """A board with a few safe tiles opened and some of its mines flagged."""
+    grid, revealed, flagged, _ = new_board(rows, cols)
+    place_mines(grid, mines, rng)
+    counts = compute_counts(grid)
+    safe = [(r, c) for r in range(rows) for c in range(cols) if grid[r][c] != MINE]
+    for r, c in rng.sample(safe, rng.randint(1, 3)):
+        flood_reveal(r, c, grid, counts, revealed, flagged)
+    for r in range(rows):
+        for c in range(cols):
+            if grid[r][c] == MINE and rng.random() < 0.3:
+                flagged[r][c] = True
+    return grid, counts, revealed, flagged
+
+
+def brute_force(counts, revealed, flagged, mines):
+    """Chance of a mine for every hidden tile, from every layout that fits the numbers (flags are mines)."""
+    rows, cols = len(counts), len(counts[0])
+    hidden = [(r, c) for r in range(rows) for c in range(cols) if not revealed[r][c] and not flagged[r][c]]
+    flags = {(r, c) for r in range(rows) for c in range(cols) if flagged[r][c]}
+    numbers = [(r, c) for r in range(rows) for c in range(cols) if revealed[r][c]]
+    layouts = 0
+    hits = dict.fromkeys(hidden, 0)
+    for placed in combinations(hidden, mines - len(flags)):
+        layout = flags | set(placed)
+        if all(counts[r][c] == sum((r + dr, c + dc) in layout for dr in (-1, 0, 1) for dc in (-1, 0, 1))
+               for r, c in numbers):
+            layouts += 1
+            for tile in placed:
+                hits[tile] += 1
+    return {r * cols + c: hit / layouts for (r, c), hit in hits.items()}
+
+
+def analysis_chances(solver, analysis):
+    chances = dict(analysis.probabilities)
+    for tile in solver.interior_tiles(analysis):
+        chances[tile] = analysis.interior
+    return chances
+
+
+def test_frontier_solver_matches_brute_force():
+    rng = random.Random(5)
+    for _ in range(40):
+        grid, counts, revealed, flagged = random_position(rng)
+        solver = FrontierSolver(4, 5, 5, TranspositionTable())
+        solver.sync(revealed, flagged, counts)
+        analysis = solver.analyze()
+        expected = brute_force(counts, revealed, flagged, 5)
+        assert analysis.consistent
+        assert analysis_chances(solver, analysis) == pytest.approx(expected)
+        assert sorted(analysis.safe) == sorted(t for t, p in expected.items() if p == 0 and t in analysis.probabilities)
+        assert sorted(analysis.mines) == sorted(t for t, p in expected.items() if p == 1)
+
+
+def test_transposition_table_answers_a_repeated_position():
+    rng = random.Random(8)
+    grid, counts, revealed, flagged = random_position(rng)
+    table = TranspositionTable()
+    first = FrontierSolver(4, 5, 5, table)
+    first.sync(revealed, flagged, counts)
+    expected = first.analyze()
+    solved = table.misses
+    again = FrontierSolver(4, 5, 5, table)
+    again.sync(revealed, flagged, counts)
+    assert analysis_chances(again, again.analyze()) == analysis_chances(first, expected)
+    assert table.misses == solved and table.hits > 0
+
+
+def test_frontier_follows_flags_being_lifted():
+    # The 1 in the corner loses its only hidden neighbor to a flag, then gets it back
+    counts = [[1, -1], [1, 1]]
+    revealed = [[True, False], [True, True]]
+    flagged = [[False, False], [False, False]]
+    solver = FrontierSolver(2, 2, 1, TranspositionTable())
+    solver.sync(revealed, flagged, counts)
+    assert solver.frontier == {0, 2, 3}
+    solver.flag(1)
+    assert solver.frontier == set()
+    solver.unflag(1)
+    assert solver.frontier == {0, 2, 3}
+    assert solver.analyze().mines == [1]
+
+
+def test_medium_ai_finds_the_same_deductions_as_a_board_scan():
+    rng = random.Random(3)
+    for _ in range(60):
+        grid, counts, revealed, flagged = random_position(rng, 9, 9, 10)
+        ai = ai_solver(MEDIUM, grid, counts, revealed, flagged, random.Random(1))
+        ai.make_move()
+        ai.follow_board()
+        frontier = sorted(ai.frontier.frontier)
+        assert ai.adj_eq_flags(frontier) == ai.adj_eq_flags()
+        assert ai.hidden_neighbor_eq_num(frontier) == ai.hidden_neighbor_eq_num()
+
+
+def test_medium_ai_still_guesses_at_random():
+    rng = random.Random(4)
+    guesses = 0
+    for _ in range(60):
+        grid, counts, revealed, flagged = random_position(rng, 9, 9, 10)
+        scan = ai_solver(MEDIUM, grid, counts, revealed, flagged, random.Random(2))
+        if scan.adj_eq_flags() != (None, None, None) or scan.hidden_neighbor_eq_num() != (None, None, None):
+            continue
+        ai = ai_solver(MEDIUM, grid, counts, revealed, flagged, random.Random(2))
+        # Step 4 is the same random reveal as before the FrontierSolver, not a probability-based pick
+        assert ai.make_move() == scan.rand_reveal()
+        assert ai.guessed
+        guesses += 1
+    assert guesses
@@ -0,0 +1,122 @@
+"""Tests for user_store.py: the one-time user.json migration into SQLite, the score history and atomic writes."""
+
+import json
+import os
+import sqlite3
+
+import auth
+from user_store import JsonUserStore, SqliteUserStore, atomic_write, DEFAULT_RECORD
+
+
+def write_user_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def test_json_migrates_into_sqlite_once(tmp_path):
+    json_path, db_path = str(tmp_path / "user.json"), str(tmp_path / "users.db")
+    write_user_json(json_path, {
+        "current_user": "alice",
+        "users": {
+            "alice": {"token": "a", "pfp_path": "alice.png", "high_score": 120, "theme": "light"},
+            "bob": {"high_score": 7, "unknown_field": 1},
+            "broken": "not a record",
+        },
+    })
+    store = SqliteUserStore(db_path, json_path)
+    try:
+        assert store.get_current_user() == "alice"
+        assert store.get_user("alice") == {"token": "a", "pfp_path": "alice.png", "high_score": 120, "theme": "light"}
+        # Missing fields get the defaults and unknown ones are dropped
+        assert store.get_user("bob") == dict(DEFAULT_RECORD, high_score=7)
+        assert store.get_user("broken") is None
+        store.update_user("alice", high_score=300)
+    finally:
+        store.close()
+
+    # user.json is left in place, and a later change to it isn't migrated over the database a second time
+    write_user_json(json_path, {"current_user": "bob", "users": {"alice": {"high_score": 1}}})
+    store = SqliteUserStore(db_path, json_path)
+    try:
+        assert store.get_current_user() == "alice"
+        assert store.get_user("alice")["high_score"] == 300
+    finally:
+        store.close()
+
+
+def test_sqlite_keeps_an_indexed_score_history(tmp_path):
+    db_path = str(tmp_path / "users.db")
+    store = SqliteUserStore(db_path)
+    try:
+        for user, score in (("ann", 300), ("bob", 900), ("ann", 700), ("cat", 100)):
+            store.add_score(user, score)
+        assert store.get_top_scores(3) == [("bob", 900), ("ann", 700), ("ann", 300)]
+    finally:
+        store.close()
+    with sqlite3.connect(db_path) as conn:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        by_user = [row[2] for row in conn.execute("PRAGMA index_info(scores_by_user)")]
+    assert tables == {"users", "scores", "meta"}
+    assert by_user == ["username", "score"]
+
+
+def test_every_recorded_score_goes_into_the_history(tmp_path, monkeypatch):
+    monkeypatch.setattr(auth, "USER_DB_PATH", str(tmp_path / "users.db"))
+    monkeypatch.setattr(auth, "USER_FILE_PATH", str(tmp_path / "user.json"))
+    context = auth.AuthContext("sqlite")
+    context.issue_token("ann")
+    assert context.set_high_score(500)
+    assert not context.set_high_score(200)  # not a new high score, but still kept
+    assert context._store.get_top_scores() == [("ann", 500), ("ann", 200)]
+    context._store.close()
+
+
+def test_json_store_ignores_scores(tmp_path):
+    store = JsonUserStore(str(tmp_path / "user.json"))
+    try:
+        store.add_score("ann", 500)
+        assert store.get_user("ann") is None
+    finally:
+        store.close()
+
+
+def test_json_store_round_trip(tmp_path):
+    path = str(tmp_path / "user.json")
+    store = JsonUserStore(path)
+    store.update_user("carol", theme="light")
+    store.set_current_user("carol")
+    store.close()
+    again = JsonUserStore(path)
+    try:
+        assert again.get_current_user() == "carol"
+        assert again.get_user("carol") == dict(DEFAULT_RECORD, theme="light")
+    finally:
+        again.close()
+
+
+def test_atomic_write_keeps_permissions(tmp_path):
+    path = str(tmp_path / "data.json")
+    with open(path, "wb") as f:
+        f.write(b"old")
+    os.chmod(path, 0o640)
+    atomic_write(path, b"new")
+    with open(path, "rb") as f:
+        assert f.read() == b"new"
+    assert os.stat(path).st_mode & 0o777 == 0o640
+    assert os.listdir(tmp_path) == ["data.json"]
+
+
+def test_new_files_get_a_fixed_mode(tmp_path):
+    umask = os.umask(0o077)
+    try:
+        atomic_write(str(tmp_path / "snapshot.json"), b"{}")
+        atomic_write(str(tmp_path / "private.json"), b"{}", new_mode=0o600)
+    finally:
+        os.umask(umask)
+    assert os.stat(tmp_path / "snapshot.json").st_mode & 0o777 == 0o644
+    assert os.stat(tmp_path / "private.json").st_mode & 0o777 == 0o600
+
+    store = JsonUserStore(str(tmp_path / "user.json"))
+    store.update_user("ann", token="secret")
+    store.close()
+    assert os.stat(tmp_path / "user.json").st_mode & 0o777 == 0o600
@@ -0,0 +1,55 @@
+"""Tests for viewport.py: screen/cell conversion, clamping, zoom and culling."""
+
+import pytest
+
+from viewport import Viewport
+
+RECT = (100, 50, 400, 400)  # x, y, width, height
+
+
+def test_small_board_is_centered():
+    view = Viewport(RECT, 5, 5, tile_size=40)  # 200 x 200 pixels in a 400 x 400 viewport
+    assert view.cell_to_screen(0, 0) == (200, 150)
+    assert view.screen_to_cell(200, 150) == (0, 0)
+    assert view.screen_to_cell(399, 349) == (4, 4)
+    # Inside the viewport but off the board, and outside the viewport
+    assert view.screen_to_cell(199, 150) == (None, None)
+    assert view.screen_to_cell(400, 350) == (None, None)
+    assert view.screen_to_cell(0, 0) == (None, None)
+
+
+@pytest.mark.parametrize("offset", [(0, 0), (37, 250), (1600, 1600)])
+def test_screen_to_cell_inverts_cell_to_screen(offset):
+    view = Viewport(RECT, 50, 50, tile_size=40)
+    view.pan(*offset)
+    first_row, last_row, first_col, last_col = view.visible_cells()
+    for row in range(first_row, last_row):
+        for col in range(first_col, last_col):
+            x, y = view.cell_to_screen(row, col)
+            # Every pixel of a tile that is on screen maps back to that tile
+            for dx, dy in ((0, 0), (39, 39), (20, 5)):
+                if view.rect.collidepoint(x + dx, y + dy):
+                    assert view.screen_to_cell(x + dx, y + dy) == (row, col)
+
+
+def test_pan_stops_at_the_board_edges():
+    view = Viewport(RECT, 50, 50, tile_size=40)
+    view.pan(-500, -500)
+    assert (view.offset_x, view.offset_y) == (0, 0)
+    view.pan(10_000, 10_000)
+    assert (view.offset_x, view.offset_y) == (50 * 40 - 400, 50 * 40 - 400)
+    assert view.screen_to_cell(499, 449) == (49, 49)
+    assert view.visible_cells() == (40, 50, 40, 50)
+
+
+def test_zoom_keeps_the_cell_under_the_cursor():
+    view = Viewport(RECT, 50, 50, tile_size=40)
+    view.pan(600, 600)
+    cursor = (310, 260)
+    before = view.screen_to_cell(*cursor)
+    view.zoom_at(2, cursor)
+    assert view.tile_size > 40
+    assert view.screen_to_cell(*cursor) == before
+    view.zoom_at(-50, cursor)
+    assert view.tile_size == 8  # MIN_TILE_SIZE: the whole board fits and is centered again
+    assert view.cell_to_screen(0, 0) == (100, 50)